@@ -0,0 +1,368 @@
+"""Content analysis stage matching language and framework patterns in parallel."""
+
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
+
+from .file_scanner import FileScanner
+from .generated import is_generated_header
+
+if TYPE_CHECKING:
+    from .language_detector import LanguageDetector
+
+logger = logging.getLogger(__name__)
+
+# Below this many files, matching runs in-process: starting workers costs more
+PARALLEL_MIN_FILES = 32
+
+# Shards per worker, so a shard of slow files does not hold up the others
+SHARDS_PER_JOB = 4
+
+# Characters that match an ASCII letter case-insensitively but do not lower
+# to it
+_CASE_FOLDS = str.maketrans({"\u0131": "i", "\u017f": "s"})
+
+
+def required_literal(pattern: str) -> Optional[str]:
+    """
+    Find a literal that every match of a regular expression contains.
+
+    Only the top level of the pattern is read: groups and character classes
+    end a literal run, and a character made optional by a quantifier is
+    dropped from it. Patterns with a top-level alternation or inline flags
+    have no required literal.
+
+    Args:
+        pattern: Regular expression source
+
+    Returns:
+        Longest ASCII literal run, or None if none is certain
+    """
+    runs: List[str] = []
+    run: List[str] = []
+
+    def end_run() -> None:
+        if run:
+            runs.append("".join(run))
+            run.clear()
+
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            escaped = pattern[i + 1 : i + 2]
+            if not escaped or escaped.isalnum():
+                # Character classes, anchors and escapes like \n are skipped
+                end_run()
+            else:
+                run.append(escaped)
+            i += 2
+            continue
+        if char == "|":
+            return None
+        if char in "*?{":
+            # The previous character may not occur at all
+            if run:
+                run.pop()
+            end_run()
+            if char == "{":
+                closing = pattern.find("}", i)
+                i = closing if closing != -1 else i
+        elif char == "+":
+            end_run()
+        elif char == "(":
+            if pattern.startswith("(?", i) and pattern[i + 2 : i + 3].isalpha():
+                return None
+            end_run()
+            i = _skip_group(pattern, i)
+        elif char == "[":
+            end_run()
+            i = _skip_class(pattern, i)
+        elif char in ".^$)]}" or not char.isascii():
+            end_run()
+        else:
+            run.append(char)
+        i += 1
+    end_run()
+
+    if not runs:
+        return None
+    # Of equally long runs the last is kept; it tends to name the library
+    return max(reversed(runs), key=len)
+
+
+def _skip_group(pattern: str, start: int) -> int:
+    """Return the index of the parenthesis closing the group at start."""
+    depth = 0
+    i = start
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            i = _skip_class(pattern, i)
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if not depth:
+                return i
+        i += 1
+    return len(pattern)
+
+
+def _skip_class(pattern: str, start: int) -> int:
+    """Return the index of the bracket closing the character class at start."""
+    i = start + 1
+    if pattern[i : i + 1] == "^":
+        i += 1
+    if pattern[i : i + 1] == "]":
+        i += 1
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            i += 2
+            continue
+        if pattern[i] == "]":
+            return i
+        i += 1
+    return len(pattern)
+
+
+class PatternMatcher:
+    """
+    Finds which of many named sets of regular expressions match a text.
+
+    Each pattern is compiled once, and guarded by a literal every match of
+    it contains. A text is lower-cased once and each distinct literal is
+    looked up in it with a plain substring search, so only patterns whose
+    literal occurs are run as regular expressions. Results are the same as
+    searching every pattern in order.
+    """
+
+    def __init__(self, patterns: Mapping[str, Sequence[str]], flags: int = 0):
+        """
+        Compile a matcher.
+
+        Args:
+            patterns: Regular expressions per key, in priority order
+            flags: Flags for compiling every pattern
+        """
+        self.patterns: Dict[str, Tuple[str, ...]] = {
+            key: tuple(sources) for key, sources in patterns.items()
+        }
+        self._fold = bool(flags & re.IGNORECASE)
+        self._checks: List[
+            Tuple[str, List[Tuple[int, Optional[str], Pattern[str]]]]
+        ] = []
+        literals = set()
+        for key, sources in self.patterns.items():
+            checks = []
+            for index, source in enumerate(sources):
+                literal = required_literal(source)
+                if literal is not None and self._fold:
+                    literal = literal.lower()
+                if literal is not None:
+                    literals.add(literal)
+                checks.append((index, literal, re.compile(source, flags)))
+            self._checks.append((key, checks))
+        self._literals = tuple(sorted(literals))
+
+    def match(self, text: str) -> Tuple[Tuple[str, int], ...]:
+        """
+        Match a text against every key's patterns.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            (key, index of its first matching pattern) for each key with a
+            match, in key order
+        """
+        haystack = text
+        if self._fold:
+            haystack = text.lower()
+            if not haystack.isascii():
+                haystack = haystack.translate(_CASE_FOLDS)
+        present = {literal for literal in self._literals if literal in haystack}
+
+        matches = []
+        for key, checks in self._checks:
+            for index, literal, pattern in checks:
+                if (literal is None or literal in present) and pattern.search(text):
+                    matches.append((key, index))
+                    break
+        return tuple(matches)
+
+
+class ContentRules(NamedTuple):
+    """What the content analysis stage looks for in each file."""
+
+    # Candidate languages per lower-case extension, earlier ones winning ties
+    language_candidates: Mapping[str, Tuple[str, ...]]
+    # Framework file patterns, keyed by framework
+    framework_matcher: Optional[PatternMatcher] = None
+    # Bytes at the start of a file searched for framework patterns
+    framework_scan_bytes: int = 8192
+
+
+class FileMatches(NamedTuple):
+    """Compact result of matching one file."""
+
+    language: Optional[str]  # Detected language, if the file had candidates
+    # (framework key, index of its first matching pattern) per matched framework
+    frameworks: Tuple[Tuple[str, int], ...]
+
+
+class _ContentWorker:
+    """Reads, sniffs and matches files, in-process or in a pool worker."""
+
+    def __init__(
+        self,
+        rules: ContentRules,
+        file_scanner: FileScanner,
+        language_detector: Optional["LanguageDetector"],
+    ):
+        self.rules = rules
+        self.file_scanner = file_scanner
+        self.language_detector = language_detector
+
+    def analyze(self, paths: Sequence[str]) -> List[FileMatches]:
+        """Match paths, returning results in the same order."""
+        languages: Dict[str, Optional[str]] = {}
+        if self.language_detector is not None and self.rules.language_candidates:
+            # Classify files with the same candidates in one batch
+            groups: Dict[Tuple[str, ...], List[str]] = {}
+            for path in paths:
+                candidates = self.rules.language_candidates.get(
+                    Path(path).suffix.lower()
+                )
+                if candidates:
+                    groups.setdefault(candidates, []).append(path)
+            for candidates, group in groups.items():
+                languages.update(
+                    self.language_detector.classify_files(
+                        group, candidates, self.file_scanner
+                    )
+                )
+
+        return [
+            FileMatches(languages.get(path), self._match_frameworks(path))
+            for path in paths
+        ]
+
+    def _match_frameworks(self, path: str) -> Tuple[Tuple[str, int], ...]:
+        """Find the first matching pattern of each framework in a file."""
+        matcher = self.rules.framework_matcher
+        if matcher is None:
+            return ()
+        head = self.file_scanner.content_cache.read(path)
+        if head is None:
+            return ()
+        content = head[: self.rules.framework_scan_bytes].decode(
+            "utf-8", errors="ignore"
+        )
+        if is_generated_header(content):
+            return ()
+        return matcher.match(content)
+
+
+# State of a pool worker process, set up once by _init_worker
+_worker: Optional[_ContentWorker] = None
+
+
+def _init_worker(
+    rules: ContentRules, language_detector: Optional["LanguageDetector"]
+) -> None:
+    global _worker
+    _worker = _ContentWorker(rules, FileScanner(), language_detector)
+
+
+def _analyze_shard(paths: Sequence[str]) -> List[FileMatches]:
+    assert _worker is not None, "worker not initialized"
+    return _worker.analyze(paths)
+
+
+def analyze_contents(
+    file_paths: Iterable[str],
+    rules: ContentRules,
+    language_detector: Optional["LanguageDetector"] = None,
+    file_scanner: Optional[FileScanner] = None,
+    jobs: int = 1,
+) -> Dict[str, FileMatches]:
+    """
+    Match language and framework patterns against many files.
+
+    With jobs above 1, the paths are split into contiguous shards matched by
+    a process pool; each worker reads the files of its shard through its own
+    content cache and returns compact per-file matches. Shards are merged in
+    input order, so the result is the same for any number of jobs.
+
+    Args:
+        file_paths: Paths of the files to match
+        rules: Candidate languages and framework patterns to look for
+        language_detector: Detector classifying files with candidate
+            languages; language matching is skipped without one
+        file_scanner: Scanner whose content cache in-process reads go
+            through; a default scanner is used when omitted
+        jobs: Number of worker processes; 1 matches in-process
+
+    Returns:
+        Dictionary mapping each path to its matches, in input order
+
+    Raises:
+        ValueError: If jobs is less than 1
+    """
+    if jobs < 1:
+        raise ValueError(f"jobs must be at least 1, got {jobs}")
+    paths = list(dict.fromkeys(file_paths))
+
+    if jobs == 1 or len(paths) < PARALLEL_MIN_FILES:
+        return _analyze_in_process(paths, rules, language_detector, file_scanner)
+
+    shard_count = min(len(paths), jobs * SHARDS_PER_JOB)
+    shard_size = -(-len(paths) // shard_count)
+    shards = [paths[i : i + shard_size] for i in range(0, len(paths), shard_size)]
+    logger.debug(
+        f"Matching contents of {len(paths)} files in {len(shards)} shards "
+        f"on {jobs} processes"
+    )
+
+    result: Dict[str, FileMatches] = {}
+    try:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(rules, language_detector),
+        ) as executor:
+            # map() yields shard results in submission order
+            for shard, matches in zip(shards, executor.map(_analyze_shard, shards)):
+                result.update(zip(shard, matches))
+    except (OSError, NotImplementedError, BrokenProcessPool) as e:
+        logger.warning(f"Process pool unavailable, matching in-process: {e}")
+        return _analyze_in_process(paths, rules, language_detector, file_scanner)
+    return result
+
+
+def _analyze_in_process(
+    paths: Sequence[str],
+    rules: ContentRules,
+    language_detector: Optional["LanguageDetector"],
+    file_scanner: Optional[FileScanner],
+) -> Dict[str, FileMatches]:
+    worker = _ContentWorker(rules, file_scanner or FileScanner(), language_detector)
+    return dict(zip(paths, worker.analyze(paths)))
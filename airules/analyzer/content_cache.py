@@ -0,0 +1,143 @@
+"""Bounded cache of file heads shared by the detectors of one analysis."""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ContentCache:
+    """
+    Least-recently-used cache of the first bytes of files.
+
+    Language, framework and generated-file detection all look at the start
+    of the same files; reading through one cache opens each file at most
+    once per analysis as long as the byte budget holds. Entries are raw
+    bytes, so every reader decodes them the way it needs.
+
+    Failed reads are not cached. Call clear() between analyses, since cached
+    heads are not checked against later changes to the files.
+    """
+
+    # Bytes kept per file
+    HEAD_BYTES = 16 * 1024
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, head_bytes: int = HEAD_BYTES):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Total size of the cached heads; the least recently
+                used are evicted beyond it
+            head_bytes: Bytes read and kept from the start of each file
+
+        Raises:
+            ValueError: If head_bytes is less than 1 or max_bytes is less
+                than head_bytes
+        """
+        if head_bytes < 1:
+            raise ValueError(f"head_bytes must be at least 1, got {head_bytes}")
+        if max_bytes < head_bytes:
+            raise ValueError(
+                f"max_bytes must be at least head_bytes ({head_bytes}), got {max_bytes}"
+            )
+        self.max_bytes = max_bytes
+        self.head_bytes = head_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Total bytes currently cached."""
+        return self._size
+
+    def read(self, path: str) -> Optional[bytes]:
+        """
+        Return the first head_bytes of a file, reading it only on a miss.
+
+        Args:
+            path: File path
+
+        Returns:
+            Up to head_bytes from the start of the file, or None if it
+            cannot be read
+        """
+        with self._lock:
+            head = self._entries.get(path)
+            if head is not None:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return head
+            self.misses += 1
+
+        try:
+            with open(path, "rb") as f:
+                head = f.read(self.head_bytes)
+        except OSError:
+            return None
+
+        with self._lock:
+            if path not in self._entries:
+                self._entries[path] = head
+                self._size += len(head)
+                while self._size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size -= len(evicted)
+                    self.evictions += 1
+        return head
+
+    def read_head(self, path: str, size: int) -> Optional[bytes]:
+        """
+        Return the first size bytes of a file, without caching them.
+
+        Serves the bytes from a cached head when there is one; otherwise
+        reads only size bytes and leaves the cache untouched, so a short
+        check such as a shebang does not cost a full head read per file.
+        Only cache hits are counted.
+
+        Args:
+            path: File path
+            size: Bytes wanted, at most head_bytes to be served from the cache
+
+        Returns:
+            Up to size bytes from the start of the file, or None if it cannot
+            be read
+        """
+        if size <= self.head_bytes:
+            with self._lock:
+                head = self._entries.get(path)
+                if head is not None:
+                    self._entries.move_to_end(path)
+                    self.hits += 1
+                    return head[:size]
+
+        try:
+            with open(path, "rb") as f:
+                return f.read(size)
+        except OSError:
+            return None
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def log_stats(self) -> None:
+        """Log the hit and miss counts at debug level."""
+        logger.debug(
+            f"Content cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.evictions} evictions, {self._size} bytes in {len(self)} files"
+        )
@@ -2,12 +2,19 @@
 
 import logging
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Set
 
 from ..exceptions import FileOperationError
-from .file_scanner import FileScanner
+from .file_scanner import NOT_AUTHORED, FileScanner
 from .language_detector import LanguageDetector
-from .models import AnalysisResult, FileStats, LanguageInfo, ProjectStructure
+from .models import (
+    AnalysisResult,
+    FileStats,
+    LanguageInfo,
+    ProjectStructure,
+    SamplingInfo,
+    ScanSummary,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -15,26 +22,63 @@ logger = logging.getLogger(__name__)
 class CodebaseAnalyzer:
     """Main analysis engine for analyzing project codebases."""
 
-    def __init__(self, max_depth: int = 10, max_files: int = 10000):
+    def __init__(
+        self,
+        max_depth: int = 10,
+        max_files: int = 10000,
+        file_scanner: Optional[FileScanner] = None,
+        aggregate_only: bool = False,
+        weight_by: str = "files",
+        jobs: int = 1,
+    ):
         """
         Initialize the codebase analyzer.
 
         Args:
             max_depth: Maximum directory depth to scan
             max_files: Maximum number of files to process
+            file_scanner: Preconfigured scanner to use instead of a default one
+                built from max_depth and max_files
+            aggregate_only: Scan with FileScanner.summarize so memory does not
+                grow with the number of files; analyze() results are the same
+            weight_by: Base language confidence on the share of "files" or,
+                like GitHub linguist, of "bytes"
+            jobs: Worker processes for content analysis; 1 analyzes
+                in-process
+
+        Raises:
+            ValueError: If weight_by is not one of LanguageDetector.WEIGHTS or
+                jobs is less than 1
         """
-        self.file_scanner = FileScanner(max_depth=max_depth, max_files=max_files)
+        if weight_by not in LanguageDetector.WEIGHTS:
+            raise ValueError(
+                f"weight_by must be one of {', '.join(LanguageDetector.WEIGHTS)}, "
+                f"got {weight_by!r}"
+            )
+        if jobs < 1:
+            raise ValueError(f"jobs must be at least 1, got {jobs}")
+        self.file_scanner = file_scanner or FileScanner(
+            max_depth=max_depth, max_files=max_files
+        )
+        self.aggregate_only = aggregate_only
+        self.weight_by = weight_by
+        self.jobs = jobs
         self.language_detector = LanguageDetector()
 
-    def analyze(self, project_path: str) -> AnalysisResult:
+    def analyze(
+        self, project_path: str, time_budget: Optional[float] = None
+    ) -> AnalysisResult:
         """
         Perform complete analysis of a project codebase.
 
         Args:
             project_path: Path to the project root directory
+            time_budget: Seconds to spend scanning; when set, the project is
+                sampled with FileScanner.sample and file counts are estimates
 
         Returns:
-            AnalysisResult containing complete analysis
+            AnalysisResult containing complete analysis, with completeness
+            below 1.0 if the time budget ran out before the scan finished
 
         Raises:
             FileOperationError: If project path is invalid or inaccessible
@@ -52,45 +96,36 @@ class CodebaseAnalyzer:
                     f"Project path is not a directory: {project_path}"
                 )
 
-            # Scan directory structure
-            files_by_extension, structure, file_stats = (
-                self.file_scanner.scan_directory(project_path)
-            )
-
-            # Detect languages
-            languages = self.language_detector.detect_languages(
-                files_by_extension, file_scanner=self.file_scanner
-            )
+            # File heads are cached for one analysis only
+            self.file_scanner.content_cache.clear()
 
-            # Determine primary language
-            primary_language = self.language_detector.get_primary_language(languages)
-
-            # Detect frameworks and libraries
-            framework_hints = self.language_detector.detect_frameworks_and_libraries(
-                files_by_extension, file_scanner=self.file_scanner
-            )
-
-            # Create analysis result
-            result = AnalysisResult(
-                project_path=project_path,
-                languages=languages,
-                primary_language=primary_language,
-                structure=structure,
-                file_stats=file_stats,
-                framework_hints=framework_hints,
-            )
+            # Scan directory structure
+            if time_budget is not None:
+                summary, structure, file_stats, sampling = self.file_scanner.sample(
+                    project_path,
+                    time_budget,
+                    extension_groups=self.language_detector.EXTENSION_MAP,
+                )
+                return self.analyze_summary(
+                    project_path, summary, structure, file_stats, sampling
+                )
+            if self.aggregate_only:
+                summary, structure, file_stats = self.file_scanner.summarize(
+                    project_path
+                )
+                return self.analyze_summary(
+                    project_path, summary, structure, file_stats
+                )
 
-            logger.info(
-                f"Analysis complete. Found {len(languages)} languages, "
-                f"{file_stats.total_files} total files"
+            table, structure, file_stats = self.file_scanner.scan_table(project_path)
+            return self._build_result(
+                project_path,
+                table.files_by_extension(exclude=NOT_AUTHORED),
+                structure,
+                file_stats,
+                extension_bytes=table.extension_sizes(exclude=NOT_AUTHORED),
             )
 
-            # Log warning for empty projects
-            if result.is_empty_project:
-                logger.warning("Project appears to be empty or contains no code files")
-
-            return result
-
         except Exception as e:
             error_msg = f"Analysis failed for {project_path}: {str(e)}"
             logger.error(error_msg)
@@ -106,6 +141,126 @@ class CodebaseAnalyzer:
                 error_messages=[error_msg],
             )
 
+    def analyze_summary(
+        self,
+        project_path: str,
+        summary: ScanSummary,
+        structure: ProjectStructure,
+        file_stats: FileStats,
+        sampling: Optional[SamplingInfo] = None,
+    ) -> AnalysisResult:
+        """
+        Detect languages and frameworks from an aggregate scan.
+
+        Lets callers that keep their own scan state, such as an incremental
+        scan, reuse the detection steps of analyze().
+
+        Args:
+            project_path: Resolved path of the project root
+            summary: Scan summary, as from FileScanner.summarize
+            structure: Project structure of the scan
+            file_stats: File statistics of the scan
+            sampling: Sampling info when the summary holds estimates
+
+        Returns:
+            AnalysisResult for the scanned project
+        """
+        return self._build_result(
+            project_path,
+            summary.extension_samples,
+            structure,
+            file_stats,
+            extension_counts=summary.extension_counts,
+            extension_bytes=summary.extension_bytes,
+            file_names=summary.file_names,
+            directory_names=summary.directory_names,
+            sampling=sampling,
+        )
+
+    def _build_result(
+        self,
+        project_path: str,
+        files_by_extension: Dict[str, List[str]],
+        structure: ProjectStructure,
+        file_stats: FileStats,
+        extension_counts: Optional[Dict[str, int]] = None,
+        extension_bytes: Optional[Dict[str, int]] = None,
+        file_names: Optional[Set[str]] = None,
+        directory_names: Optional[Set[str]] = None,
+        sampling: Optional[SamplingInfo] = None,
+    ) -> AnalysisResult:
+        """Run language and framework detection on scan results."""
+        # Detect languages
+        languages = self.language_detector.detect_languages(
+            files_by_extension,
+            file_scanner=self.file_scanner,
+            extension_counts=extension_counts,
+            extension_bytes=extension_bytes,
+            weight_by=self.weight_by,
+            jobs=self.jobs,
+        )
+
+        if sampling is not None:
+            self._set_confidence_intervals(languages, sampling)
+
+        # Determine primary language
+        primary_language = self.language_detector.get_primary_language(languages)
+
+        # Detect frameworks and libraries
+        framework_hints = self.language_detector.detect_frameworks_and_libraries(
+            files_by_extension,
+            file_scanner=self.file_scanner,
+            file_names=file_names,
+            directory_names=directory_names,
+        )
+
+        # Create analysis result
+        result = AnalysisResult(
+            project_path=project_path,
+            languages=languages,
+            primary_language=primary_language,
+            structure=structure,
+            file_stats=file_stats,
+            framework_hints=framework_hints,
+        )
+        if sampling is not None:
+            result.completeness = sampling.completeness
+            result.sampling = sampling
+        self.file_scanner.content_cache.log_stats()
+
+        logger.info(
+            f"Analysis complete. Found {len(languages)} languages, "
+            f"{file_stats.total_files} total files"
+        )
+
+        # Log warning for empty projects
+        if result.is_empty_project:
+            logger.warning("Project appears to be empty or contains no code files")
+
+        return result
+
+    def _set_confidence_intervals(
+        self, languages: List[LanguageInfo], sampling: SamplingInfo
+    ) -> None:
+        """
+        Attach the sampled 95% interval of each language's share of files.
+
+        Args:
+            languages: Languages detected from the sampled counts
+            sampling: Sampling info with per-language estimates
+        """
+        estimates = sampling.group_estimates
+        total = sum(estimate.value for estimate in estimates.values())
+        if not total:
+            return
+        for language in languages:
+            estimate = estimates.get(language.name)
+            if estimate is not None:
+                language.confidence_interval = (
+                    min(estimate.low / total, 1.0),
+                    min(estimate.high / total, 1.0),
+                )
+
     def detect_languages(self, project_path: str) -> List[LanguageInfo]:
         """
         Detect programming languages in a project.
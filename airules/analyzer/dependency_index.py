@@ -0,0 +1,118 @@
+"""Index from package names to the frameworks they indicate."""
+
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# npm scopes shared by unrelated packages, which say nothing about a framework
+SHARED_SCOPES = frozenset({"@types/"})
+
+# Separators after which a name continues inside a namespace
+_NAMESPACE_SEPARATOR = re.compile(r"[/:]")
+
+_SEPARATOR_RUN = re.compile(r"[-_.]+")
+
+
+def normalize_package_name(name: str) -> str:
+    """
+    Normalize a package name for comparison.
+
+    Names are lower-cased. Plain names, as used by PyPI, npm, crates.io and
+    RubyGems, also have runs of "-", "_" and "." collapsed to "-" as in PEP
+    503, so "scikit_learn" and "Scikit-Learn" compare equal. Namespaced
+    names such as "@angular/core", "org.junit:junit" and Go module paths
+    keep their punctuation.
+
+    Args:
+        name: Package name as written in a package file
+
+    Returns:
+        Normalized name
+    """
+    name = name.strip().lower()
+    if name.startswith("@") or _NAMESPACE_SEPARATOR.search(name):
+        return name
+    return _SEPARATOR_RUN.sub("-", name)
+
+
+def namespace_prefix(name: str) -> Optional[str]:
+    """
+    Find the namespace whose packages all belong to the same project.
+
+    Args:
+        name: Normalized package name
+
+    Returns:
+        "@scope/" for a scoped npm package, "group:" for a Maven artifact,
+        the module path followed by "/" for a Go module, or None for names
+        whose namespace is shared, like "@types/react" or Composer's
+        "symfony/console"
+    """
+    if name.startswith("@"):
+        slash = name.find("/")
+        if slash == -1 or name[: slash + 1] in SHARED_SCOPES:
+            return None
+        return name[: slash + 1]
+    if ":" in name:
+        return name[: name.index(":") + 1]
+    if "/" in name and "." in name.split("/", 1)[0]:
+        # Go module paths start with a domain; their packages and major
+        # versions are subpaths
+        return name + "/"
+    return None
+
+
+class DependencyIndex:
+    """
+    Resolves package names to framework keys with a few dictionary lookups.
+
+    A name matches a framework's dependency when the normalized names are
+    equal, or when the name lies inside the dependency's namespace: any
+    "@angular/" package indicates Angular, "org.junit.jupiter:" artifacts
+    JUnit, and "github.com/gin-gonic/gin/v2" Gin. Prefixes end at a "/" or
+    ":", so each one is looked up by cutting the name at its separators.
+    """
+
+    def __init__(self, dependencies: Mapping[str, Iterable[str]]):
+        """
+        Build the index.
+
+        Args:
+            dependencies: Package names per framework key, in priority order
+        """
+        self.keys: Tuple[str, ...] = tuple(dependencies)
+        self._rank = {key: rank for rank, key in enumerate(self.keys)}
+        self._exact: Dict[str, List[str]] = {}
+        self._prefixes: Dict[str, List[str]] = {}
+        for key, names in dependencies.items():
+            for name in names:
+                normalized = normalize_package_name(name)
+                self._add(self._exact, normalized, key)
+                prefix = namespace_prefix(normalized)
+                if prefix is not None:
+                    self._add(self._prefixes, prefix, key)
+
+    @staticmethod
+    def _add(table: Dict[str, List[str]], name: str, key: str) -> None:
+        keys = table.setdefault(name, [])
+        if key not in keys:
+            keys.append(key)
+
+    def lookup(self, name: str) -> Tuple[str, ...]:
+        """
+        Find the frameworks a package indicates.
+
+        Args:
+            name: Package name as written in a package file
+
+        Returns:
+            Keys of the matching frameworks, in index order
+        """
+        normalized = normalize_package_name(name)
+        keys = self._exact.get(normalized, [])
+        for separator in _NAMESPACE_SEPARATOR.finditer(normalized):
+            more = self._prefixes.get(normalized[: separator.end()])
+            if more:
+                keys = keys + [key for key in more if key not in keys]
+        if len(keys) > 1:
+            return tuple(sorted(keys, key=self._rank.__getitem__))
+        return tuple(keys)
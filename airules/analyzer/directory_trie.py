@@ -0,0 +1,167 @@
+"""Directory trie recorded while scanning, used for structure analysis."""
+
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# (relative path, node, files in the subtree, files with an extension in it)
+_Totals = Tuple[str, "DirectoryNode", int, int]
+
+
+class DirectoryNode:
+    """A directory in the trie."""
+
+    __slots__ = ("name", "parent", "children", "file_count", "named_file_count")
+
+    def __init__(self, name: str, parent: Optional["DirectoryNode"]):
+        self.name = name
+        self.parent = parent
+        self.children: Dict[str, "DirectoryNode"] = {}
+        self.file_count = 0  # Files directly in this directory
+        self.named_file_count = 0  # Of which have an extension
+
+
+class DirectoryTrie:
+    """
+    Trie of the directories below a root, with per-directory file counts.
+
+    Directories are added as the walker reaches them, each in constant time
+    by looking up its already-recorded parent. Derived views visit every
+    directory once instead of walking the parents of every file.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize a trie holding only the root.
+
+        Args:
+            root: Directory the scan started from, or "" for a trie that
+                accepts any absolute path
+        """
+        self.root = root
+        self._prefix = os.path.join(root, "")
+        self._root_node = DirectoryNode(os.path.basename(root), None)
+        self._nodes: Dict[str, DirectoryNode] = {root: self._root_node}
+
+    @classmethod
+    def from_files(cls, file_paths: Iterable[str]) -> "DirectoryTrie":
+        """
+        Build a trie from absolute file paths, counting each file as named.
+
+        Args:
+            file_paths: Absolute file paths
+
+        Returns:
+            DirectoryTrie instance rooted above the filesystem roots
+        """
+        trie = cls("")
+        for file_path in file_paths:
+            trie.add(os.path.dirname(os.fspath(file_path)), 1, 1)
+        return trie
+
+    def add(
+        self, directory: str, file_count: int = 0, named_file_count: int = 0
+    ) -> DirectoryNode:
+        """
+        Record a directory and the files found directly in it.
+
+        Args:
+            directory: Path of the directory, at or below root
+            file_count: Number of files in it
+            named_file_count: Number of those files with an extension
+
+        Returns:
+            The directory's node
+
+        Raises:
+            ValueError: If directory is not below root
+        """
+        node = self._nodes.get(directory)
+        if node is None:
+            parent_path = os.path.dirname(directory)
+            if self.root and (
+                parent_path == directory or not directory.startswith(self._prefix)
+            ):
+                raise ValueError(f"{directory} is not below {self.root}")
+            if parent_path == directory:
+                # Filesystem root, keyed by its path since its name is empty
+                parent, key = self._root_node, directory
+            else:
+                parent = self.add(parent_path)
+                key = os.path.basename(directory)
+            node = parent.children[key] = DirectoryNode(
+                os.path.basename(directory), parent
+            )
+            self._nodes[directory] = node
+        node.file_count += file_count
+        node.named_file_count += named_file_count
+        return node
+
+    def __len__(self) -> int:
+        """Return the number of directories, including the root."""
+        return len(self._nodes)
+
+    def directories(self) -> Set[str]:
+        """
+        Return the directories holding files at any depth.
+
+        Returns:
+            Paths relative to root; the root itself is not included
+        """
+        result: Set[str] = set()
+        for relative, node, total, _ in self._totals():
+            if total and node is not self._root_node:
+                result.add(relative)
+        return result
+
+    def directory_names(self) -> Set[str]:
+        """
+        Return lower-case names of directories holding files with an extension
+        at any depth, together with the names of all of root's ancestors.
+
+        Returns:
+            Set of directory names
+        """
+        names: Set[str] = set()
+        for _, node, _, named_total in self._totals():
+            if named_total:
+                names.add(node.name.lower())
+        if names:
+            parent = os.path.dirname(self.root)
+            while True:
+                names.add(os.path.basename(parent).lower())
+                grandparent = os.path.dirname(parent)
+                if grandparent == parent:
+                    break
+                parent = grandparent
+        return names
+
+    def _totals(self) -> List[_Totals]:
+        """
+        Visit every directory once, computing file totals of each subtree.
+
+        Returns:
+            List of (relative path, node, files below, named files below)
+        """
+        # Pre-order listing; reversing it visits children before parents
+        order: List[Tuple[str, DirectoryNode]] = []
+        stack = [("", self._root_node)]
+        while stack:
+            relative, node = stack.pop()
+            order.append((relative, node))
+            for name, child in node.children.items():
+                stack.append(
+                    (os.path.join(relative, name) if relative else name, child)
+                )
+
+        totals: Dict[int, List[int]] = {}
+        result: List[_Totals] = []
+        for relative, node in reversed(order):
+            counts = totals.pop(id(node), [0, 0])
+            total = counts[0] + node.file_count
+            named_total = counts[1] + node.named_file_count
+            if node.parent is not None:
+                parent_counts = totals.setdefault(id(node.parent), [0, 0])
+                parent_counts[0] += total
+                parent_counts[1] += named_total
+            result.append((relative, node, total, named_total))
+        return result
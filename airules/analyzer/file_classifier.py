@@ -0,0 +1,186 @@
+"""Compiled file name classifier used to categorize scanned files in one pass."""
+
+import fnmatch
+import os
+import re
+from collections import defaultdict
+from typing import DefaultDict, Dict, Iterable, List, Optional, Pattern, Tuple
+
+# Category flags returned by FileClassifier.classify
+IGNORED = 1
+TEST = 2
+CONFIG = 4
+DOC = 8
+CODE = 16
+GENERATED = 32
+# Set by the scanner for files below a vendored directory, never by classify()
+VENDORED = 64
+
+# fnmatch normalizes case on case-insensitive platforms (Windows)
+_FOLD_CASE = os.path.normcase("A") == "a"
+
+_WILDCARDS = re.compile(r"[*?\[]")
+
+# Upper bound on memoized names; repeated names (index.js, __init__.py) dominate
+_CACHE_SIZE = 65536
+
+
+class FileClassifier:
+    """
+    Classify file names against glob pattern sets in a single call.
+
+    Each pattern is compiled once into the cheapest structure that matches it
+    exactly like ``fnmatch.fnmatch``: literal names go into a hash table,
+    ``*literal`` globs into suffix tables (probed at each dot in the name, or
+    by suffix length for endings without a leading dot), and the remaining
+    globs into one combined regular expression with a named group per
+    category.
+    """
+
+    def __init__(
+        self,
+        ignore_patterns: Iterable[str],
+        test_patterns: Iterable[str],
+        test_suffixes: Iterable[str],
+        config_patterns: Iterable[str],
+        doc_patterns: Iterable[str],
+        code_extensions: Iterable[str],
+        generated_patterns: Iterable[str] = (),
+    ):
+        """
+        Compile the pattern sets.
+
+        Args:
+            ignore_patterns: Globs for files that should be skipped
+            test_patterns: Globs for test files, matched case-insensitively
+            test_suffixes: Literal name endings for test files, matched
+                case-insensitively
+            config_patterns: Globs for configuration files
+            doc_patterns: Globs for documentation files
+            code_extensions: Lowercase extensions of code files
+            generated_patterns: Globs for generated files, matched
+                case-insensitively
+        """
+        # Tables for case-sensitive categories, keyed by the file name
+        self._exact: Dict[str, int] = defaultdict(int)
+        self._dotted: Dict[str, int] = defaultdict(int)
+        self._suffixes: DefaultDict[int, Dict[str, int]] = defaultdict(dict)
+        # Tables for case-insensitive categories, keyed by the lowercase name
+        self._exact_folded: Dict[str, int] = defaultdict(int)
+        self._dotted_folded: Dict[str, int] = defaultdict(int)
+        self._suffixes_folded: DefaultDict[int, Dict[str, int]] = defaultdict(dict)
+
+        regex_parts: List[str] = []
+        self._regex_groups: List[Tuple[str, int]] = []
+
+        categories = [
+            (IGNORED, ignore_patterns, False),
+            (TEST, test_patterns, True),
+            (CONFIG, config_patterns, False),
+            (DOC, doc_patterns, False),
+            (GENERATED, generated_patterns, True),
+        ]
+        for flag, patterns, folded in categories:
+            remainder = []
+            for pattern in patterns:
+                if folded or _FOLD_CASE:
+                    pattern = pattern.lower()
+                if not _WILDCARDS.search(pattern):
+                    self._add_exact(pattern, flag, folded)
+                elif pattern.startswith("*") and not _WILDCARDS.search(pattern[1:]):
+                    self._add_suffix(pattern[1:], flag, folded)
+                else:
+                    remainder.append(fnmatch.translate(pattern))
+
+            if remainder:
+                group = f"g{flag}"
+                body = "|".join(sorted(remainder))
+                if folded:
+                    body = f"(?i:{body})"
+                regex_parts.append(f"(?:(?=(?P<{group}>{body})))?")
+                self._regex_groups.append((group, flag))
+
+        for suffix in test_suffixes:
+            self._add_suffix(suffix.lower(), TEST, True)
+
+        self._regex: Optional[Pattern[str]] = (
+            re.compile("".join(regex_parts)) if regex_parts else None
+        )
+        self._suffix_lengths = sorted(self._suffixes, reverse=True)
+        self._suffix_lengths_folded = sorted(self._suffixes_folded, reverse=True)
+        self._code_extensions = frozenset(code_extensions)
+        self._cache: Dict[str, int] = {}
+
+    def _add_exact(self, name: str, flag: int, folded: bool) -> None:
+        """Register a literal file name for a category."""
+        table = self._exact_folded if folded else self._exact
+        table[name] |= flag
+
+    def _add_suffix(self, suffix: str, flag: int, folded: bool) -> None:
+        """Register a literal name ending for a category."""
+        if suffix.startswith("."):
+            dotted = self._dotted_folded if folded else self._dotted
+            dotted[suffix] |= flag
+            return
+
+        tables = self._suffixes_folded if folded else self._suffixes
+        table = tables[len(suffix)]
+        table[suffix] = table.get(suffix, 0) | flag
+
+    def classify(self, file_name: str) -> int:
+        """
+        Return all category flags for a file name.
+
+        Hidden files are flagged as ignored unless they are configuration
+        files, mirroring the scanner's historic behaviour.
+
+        Args:
+            file_name: Base name of the file (no directory part)
+
+        Returns:
+            Bitwise OR of IGNORED, TEST, CONFIG, DOC, CODE and GENERATED
+        """
+        cached = self._cache.get(file_name)
+        if cached is not None:
+            return cached
+
+        lower_name = file_name.lower()
+        name = lower_name if _FOLD_CASE else file_name
+        name_length = len(name)
+        lower_length = len(lower_name)
+
+        flags = self._exact.get(name, 0) | self._exact_folded.get(lower_name, 0)
+
+        # Endings that start with a dot can only match at a dot in the name
+        index = name.find(".")
+        while index != -1:
+            flags |= self._dotted.get(name[index:], 0)
+            index = name.find(".", index + 1)
+        index = lower_name.find(".")
+        while index != -1:
+            flags |= self._dotted_folded.get(lower_name[index:], 0)
+            index = lower_name.find(".", index + 1)
+
+        for length in self._suffix_lengths:
+            if length <= name_length:
+                flags |= self._suffixes[length].get(name[-length:], 0)
+        for length in self._suffix_lengths_folded:
+            if length <= lower_length:
+                flags |= self._suffixes_folded[length].get(lower_name[-length:], 0)
+
+        match = self._regex.match(name) if self._regex is not None else None
+        if match is not None:
+            for group, flag in self._regex_groups:
+                if match.group(group) is not None:
+                    flags |= flag
+
+        if file_name.startswith(".") and not flags & CONFIG:
+            flags |= IGNORED
+
+        index = lower_name.rfind(".")
+        if 0 < index < lower_length - 1 and lower_name[index:] in self._code_extensions:
+            flags |= CODE
+
+        if len(self._cache) < _CACHE_SIZE:
+            self._cache[file_name] = flags
+        return flags
@@ -1,16 +1,168 @@
 """Project structure scanning utilities for recursive directory analysis."""
 
-import fnmatch
-from collections import defaultdict
+import heapq
+import io
+import itertools
+import logging
+import os
+import random
+import stat
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import (
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-from .models import FileStats, ProjectStructure
+from .content_cache import ContentCache
+from .directory_trie import DirectoryTrie
+from .file_classifier import (
+    CODE,
+    CONFIG,
+    DOC,
+    GENERATED,
+    IGNORED,
+    TEST,
+    VENDORED,
+    FileClassifier,
+)
+from .generated import (
+    GENERATED_PATTERNS,
+    HEADER_BYTES,
+    VENDORED_DIRS,
+    is_generated_header,
+    is_vendored_dir,
+)
+from .git_index import GitIndexError, find_repository, read_index
+from .gitignore import GITIGNORE_FILE, GitIgnore, is_ignored, load_parent_rules
+from .models import (
+    FileRecord,
+    FileStats,
+    ProjectStructure,
+    SamplingInfo,
+    ScanSummary,
+)
+from .path_table import PathTable
+from .sampling import StratifiedSample
+from .scan_index import ScanIndex
+from .shebang import HEAD_BYTES as SCRIPT_HEAD_BYTES
+from .shebang import SCRIPT_DIRS, script_extension
+
+logger = logging.getLogger(__name__)
+
+# Read size used when counting lines
+_LINE_COUNT_CHUNK = 1024 * 1024
+
+# Files left out of extension and name views and of content analysis
+NOT_AUTHORED = VENDORED | GENERATED
+
+# File id recorded for symlinks, whose target identity needs a stat
+_SYMLINK_ID = -1
+
+# Traversal ranks; lower ranks are walked first, breadth-first within a rank
+_ROOT_RANK = -1
+_PRIORITY_RANK = 0
+_DEFAULT_RANK = 1
+_DEFERRED_RANK = 2
+
+# Result of a parallel listing task: file names and sizes, then the ignore
+# rules and names of the subdirectories to descend into
+_ParallelListing = Tuple[List[str], List[int], Tuple[GitIgnore, ...], List[str]]
+
+# Directory queued by the parallel walk as (rank, depth, sequence, path,
+# rules, listing); listing holds its future once submitted
+_ParallelEntry = Tuple[
+    int, int, int, str, Tuple[GitIgnore, ...], List["Future[_ParallelListing]"]
+]
+
+
+class DirectoryListing(NamedTuple):
+    """Files and subdirectories found by listing one directory."""
+
+    directory: str
+    depth: int  # Below the scan root
+    records: List[FileRecord]
+    subdirectories: List[str]  # Paths to descend into
+    rules: Tuple[GitIgnore, ...]  # Ignore rules for the subdirectories
+    largest: List[Tuple[int, str]]  # Heap of the largest files as (size, path)
+
+
+class _SummaryBuilder:
+    """Counters and samples of summarize(), accumulated one record at a time."""
+
+    def __init__(self, root: str, samples_per_extension: int):
+        self.summary = ScanSummary()
+        self.stats = FileStats()
+        self.config_files: List[str] = []
+        self.trie = DirectoryTrie(root)
+        self._samples_per_extension = samples_per_extension
+
+    def add(self, record: FileRecord) -> None:
+        """Count a file."""
+        summary = self.summary
+        stats = self.stats
+        path = record.path
+        stats.total_files += 1
+
+        flags = record.flags
+        extension = record.extension
+        named = bool(extension) and not flags & NOT_AUTHORED
+        self.trie.add(record.directory, 1, int(named))
+        if named:
+            extension_counts = summary.extension_counts
+            extension_counts[extension] = extension_counts.get(extension, 0) + 1
+            if record.size > 0:
+                extension_bytes = summary.extension_bytes
+                extension_bytes[extension] = (
+                    extension_bytes.get(extension, 0) + record.size
+                )
+            samples = summary.extension_samples.setdefault(extension, [])
+            if len(samples) < self._samples_per_extension:
+                samples.append(path)
+
+            # Name views cover the same files as files_by_extension
+            summary.file_names.add(record.name.lower())
+
+        if flags & TEST:
+            stats.test_files += 1
+        elif flags & CONFIG:
+            stats.config_files += 1
+            self.config_files.append(path)
+        elif flags & DOC:
+            stats.documentation_files += 1
+        if flags & CODE:
+            stats.code_files += 1
+        elif not flags & (TEST | CONFIG | DOC):
+            stats.other_files += 1
+        if flags & VENDORED:
+            stats.vendored_files += 1
+        if flags & GENERATED:
+            stats.generated_files += 1
 
 
 class FileScanner:
     """Utility class for scanning project directory structure."""
 
+    # Ways of enumerating project files
+    BACKENDS = ("walk", "git")
+
+    # Paths kept per extension by summarize()
+    SAMPLES_PER_EXTENSION = 5
+
     # Common directories to ignore during scanning
     IGNORE_DIRS = {
         ".git",
@@ -41,6 +193,33 @@ class FileScanner:
         ".ruff_cache",  # Python tools
     }
 
+    # Directories walked before others, with everything below them, so a scan
+    # cut short by max_files still sees the authored code and its tests
+    PRIORITY_DIRS = {"src", "lib", "app", "test", "tests", "spec", "__tests__"}
+
+    # Directories the parallel walk lists ahead of the consumer, per worker
+    LISTINGS_PER_WORKER = 2
+
+    # Directories walked after everything else, with everything below them
+    DEFERRED_DIRS = {
+        "vendor",
+        "third_party",
+        "third-party",
+        "examples",
+        "example",
+        "fixtures",
+        "testdata",
+    }
+
+    # Vendored directories and generated file names: counted in FileStats but
+    # left out of the views language and framework detection work from
+    VENDORED_DIRS = VENDORED_DIRS
+    GENERATED_PATTERNS = GENERATED_PATTERNS
+
+    # Directories whose extensionless files are read as scripts even when
+    # they are not executable
+    SCRIPT_DIRS = SCRIPT_DIRS
+
     # Common file patterns to ignore
     IGNORE_PATTERNS = {
         "*.pyc",
@@ -181,17 +360,112 @@ class FileScanner:
         "*.org",
     }
 
-    def __init__(self, max_depth: int = 10, max_files: int = 10000):
+    def __init__(
+        self,
+        max_depth: int = 10,
+        max_files: int = 10000,
+        workers: int = 1,
+        respect_gitignore: bool = True,
+        use_index: bool = False,
+        save_index: bool = True,
+        backend: str = "walk",
+        largest_files_count: int = 5,
+        line_count_max_bytes: int = 8 * 1024 * 1024,
+        follow_symlinks: bool = True,
+        script_read_limit: int = 1000,
+        content_cache: Optional[ContentCache] = None,
+    ):
         """
         Initialize file scanner.
 
         Args:
             max_depth: Maximum directory depth to scan
             max_files: Maximum number of files to process
+            workers: Number of threads listing directories; values above 1
+                enable parallel traversal for slow or network filesystems
+            respect_gitignore: Skip directories ignored by .gitignore files
+            use_index: Reuse directory listings from a persistent index under
+                .rules4/cache in the project, re-reading only directories whose
+                mtime changed since the previous scan
+            save_index: Write the index back after each scan; False only reads
+                an existing index, leaving the project untouched as in dry runs
+            backend: "walk" lists directories on disk; "git" reads the tracked
+                files from the git index instead and falls back to the walk
+                when the project is not in a work tree or the index is unusable
+            largest_files_count: Number of largest files reported in FileStats
+            line_count_max_bytes: Bytes read per file when counting lines of
+                the largest files; longer files get an extrapolated count
+            follow_symlinks: Walk symlinked directories and count symlinked
+                files; either way each physical directory and file is visited
+                once, so link cycles and hard links are not counted twice
+            script_read_limit: Number of extensionless files checked per scan
+                for a shebang or modeline naming their language; 0 disables
+                script detection
+            content_cache: Cache of file heads that content reads go
+                through; share one with other detectors so each file is read
+                once per analysis. A private cache is created when omitted
+
+        Raises:
+            ValueError: If workers or line_count_max_bytes is less than 1,
+                largest_files_count or script_read_limit is negative or backend
+                is unknown
         """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if backend not in self.BACKENDS:
+            raise ValueError(
+                f"backend must be one of {', '.join(self.BACKENDS)}, got {backend!r}"
+            )
+        if largest_files_count < 0:
+            raise ValueError(
+                f"largest_files_count must not be negative, got {largest_files_count}"
+            )
+        if line_count_max_bytes < 1:
+            raise ValueError(
+                f"line_count_max_bytes must be at least 1, got {line_count_max_bytes}"
+            )
+        if script_read_limit < 0:
+            raise ValueError(
+                f"script_read_limit must not be negative, got {script_read_limit}"
+            )
+
         self.max_depth = max_depth
         self.max_files = max_files
+        self.workers = workers
+        self.respect_gitignore = respect_gitignore
+        self.use_index = use_index
+        self.save_index = save_index
+        self.backend = backend
+        self.largest_files_count = largest_files_count
+        self.line_count_max_bytes = line_count_max_bytes
+        self.follow_symlinks = follow_symlinks
+        self.script_read_limit = script_read_limit
+        self.content_cache = ContentCache() if content_cache is None else content_cache
         self._file_count = 0
+        self._script_reads = 0
+        self._index: Optional[ScanIndex] = None
+        # (st_dev, st_ino) of directories listed and inodes of files kept per
+        # device during the current scan; parallel listings share them
+        self._seen_directories: Set[Tuple[int, int]] = set()
+        self._seen_files: Dict[int, Set[int]] = {}
+        # Identities claimed per directory path, recorded between begin_listing
+        # and the next scan so release_directories can give them back
+        self._claims: Optional[Dict[str, List[Tuple[int, int]]]] = None
+        self._duplicate_directories = 0
+        self._duplicate_files = 0
+        # Directories left out of the current scan by the ignore, .gitignore
+        # and depth rules
+        self._pruned: Set[str] = set()
+        self._identity_lock = threading.Lock()
+        self._classifier = FileClassifier(
+            ignore_patterns=self.IGNORE_PATTERNS,
+            test_patterns=self.TEST_PATTERNS,
+            test_suffixes=self.TEST_EXTENSIONS,
+            config_patterns=self.CONFIG_PATTERNS,
+            doc_patterns=self.DOC_PATTERNS,
+            code_extensions=self.CODE_EXTENSIONS,
+            generated_patterns=self.GENERATED_PATTERNS,
+        )
 
     def scan_directory(
         self, project_path: str
@@ -205,149 +479,1155 @@ class FileScanner:
         Returns:
             Tuple of (files_by_extension, project_structure, file_stats)
         """
+        table, structure, stats = self.scan_table(project_path)
+        return table.files_by_extension(exclude=NOT_AUTHORED), structure, stats
+
+    def scan_table(
+        self, project_path: str
+    ) -> Tuple[PathTable, ProjectStructure, FileStats]:
+        """
+        Scan a project into a compact PathTable.
+
+        Structure and statistics are computed from the table's integer
+        columns, so no per-category path lists are built; path views are
+        materialized from the table only when requested.
+
+        Args:
+            project_path: Path to project root directory
+
+        Returns:
+            Tuple of (path_table, project_structure, file_stats)
+        """
+        root = self._resolve_root(project_path)
+
+        table = PathTable(root)
+        trie = DirectoryTrie(root)
+        add = table.add
+        for record in self._iter_records(root, trie):
+            add(*record)
+        table.complete = self._file_count < self.max_files
+        table.pruned_directories = frozenset(self._pruned)
+
+        # Analyze project structure from the directories recorded in the walk
+        structure = self._structure_from_directories(
+            trie.directories(), table.paths(CONFIG, exclude=TEST)
+        )
+
+        # Calculate file statistics
+        stats = FileStats(
+            total_files=len(table),
+            code_files=table.count(CODE),
+            test_files=table.count(TEST),
+            config_files=table.count(CONFIG, exclude=TEST),
+            documentation_files=table.count(DOC, exclude=TEST | CONFIG),
+            other_files=table.count(exclude=TEST | CONFIG | DOC | CODE),
+            vendored_files=table.count(VENDORED),
+            generated_files=table.count(GENERATED),
+            duplicate_files=self._duplicate_files,
+            duplicate_directories=self._duplicate_directories,
+        )
+        stats.largest_files = self._rank_largest(
+            table.largest(self.largest_files_count)
+        )
+
+        return table, structure, stats
+
+    def iter_files(self, project_path: str) -> Iterator[FileRecord]:
+        """
+        Stream the files of a project as they are found.
+
+        Records are produced while the walk is still running, so consumers can
+        start work immediately and nothing is accumulated by the scanner.
+        Files anywhere below a directory containing "test" carry the TEST flag.
+
+        Args:
+            project_path: Path to project root directory
+
+        Returns:
+            Iterator of FileRecord objects, at most max_files of them
+
+        Raises:
+            ValueError: If project_path is not a directory
+        """
+        return self._iter_records(self._resolve_root(project_path))
+
+    def summarize(
+        self, project_path: str
+    ) -> Tuple[ScanSummary, ProjectStructure, FileStats]:
+        """
+        Scan a project keeping only counters and bounded samples.
+
+        Produces the same structure and statistics as scan_directory, but
+        memory grows with the number of directories and distinct names rather
+        than the number of files.
+
+        Args:
+            project_path: Path to project root directory
+
+        Returns:
+            Tuple of (scan_summary, project_structure, file_stats)
+        """
+        root = self._resolve_root(project_path)
+
+        builder = _SummaryBuilder(root, self.SAMPLES_PER_EXTENSION)
+        largest: List[Tuple[int, str]] = []
+        for record in self._iter_records(root):
+            self._offer_largest(largest, record.size, record.path)
+            builder.add(record)
+        return self._finish_summary(builder, largest)
+
+    def begin_listing(self, project_path: str) -> Tuple[str, Tuple[GitIgnore, ...]]:
+        """
+        Start a scan made of individual list_directory_records calls.
+
+        Forgets the directories and files seen by previous scans, so that
+        duplicates are counted against this scan only.
+
+        Args:
+            project_path: Path to project root directory
+
+        Returns:
+            Tuple of (resolved root, ignore rules the root inherits)
+
+        Raises:
+            ValueError: If project_path is not a directory
+        """
+        root = self._resolve_root(project_path)
+        self._reset_identities()
+        self._claims = {}
+        return root, self._root_gitignore_rules(root)
+
+    def release_directories(self, directories: Iterable[str]) -> None:
+        """
+        Forget the identities claimed by listing directories since begin_listing.
+
+        Lets a caller drop directories from its scan state and list them
+        again, possibly under another path, without them being counted as
+        duplicates, while every other directory and file stays claimed.
+
+        Args:
+            directories: Paths passed to list_directory_records
+        """
+        if self._claims is None:
+            return
+        with self._identity_lock:
+            for directory in directories:
+                identities = self._claims.pop(directory, None)
+                if not identities:
+                    continue
+                self._seen_directories.discard(identities[0])
+                for device, inode in identities[1:]:
+                    seen = self._seen_files.get(device)
+                    if seen is not None:
+                        seen.discard(inode)
+
+    def list_directory_records(
+        self,
+        root: str,
+        directory: str,
+        depth: int,
+        rules: Tuple[GitIgnore, ...],
+        relist: bool = False,
+    ) -> DirectoryListing:
+        """
+        List and classify the files of one directory.
+
+        Lets callers keep per-directory scan state, such as a watcher that
+        re-reads only the directories that changed. Files are classified as in
+        iter_files; max_files does not apply.
+
+        Args:
+            root: Root returned by begin_listing
+            directory: Directory at or below root
+            depth: Depth of directory below root
+            rules: Ignore rules directory inherits from its parents
+            relist: Read a directory already listed in this scan again,
+                bypassing the scan index; its files are then not checked for
+                duplicates
+
+        Returns:
+            DirectoryListing of the directory
+        """
+        file_names, file_sizes, dir_names = self._list_directory(
+            directory, claim=not relist
+        )
+        if depth < self.max_depth:
+            rules, dir_names = self._apply_gitignore(
+                directory, file_names, dir_names, rules
+            )
+        else:
+            dir_names = []
+
+        records = list(self._directory_records(root, directory, file_names, file_sizes))
+        largest: List[Tuple[int, str]] = []
+        for record in records:
+            self._offer_largest(largest, record.size, record.path)
+        return DirectoryListing(
+            directory=directory,
+            depth=depth,
+            records=records,
+            subdirectories=[os.path.join(directory, name) for name in dir_names],
+            rules=rules,
+            largest=largest,
+        )
+
+    def summarize_listings(
+        self, root: str, listings: Iterable[DirectoryListing]
+    ) -> Tuple[ScanSummary, ProjectStructure, FileStats]:
+        """
+        Aggregate directory listings as summarize would aggregate a walk.
+
+        Args:
+            root: Root returned by begin_listing
+            listings: Listings of the directories below root, in walk order
+
+        Returns:
+            Tuple of (scan_summary, project_structure, file_stats)
+        """
+        builder = _SummaryBuilder(root, self.SAMPLES_PER_EXTENSION)
+        largest: List[Tuple[int, str]] = []
+        for listing in listings:
+            for record in listing.records:
+                builder.add(record)
+            for size, path in listing.largest:
+                self._offer_largest(largest, size, path)
+        return self._finish_summary(builder, largest)
+
+    def sample(
+        self,
+        project_path: str,
+        time_budget: float,
+        extension_groups: Optional[Mapping[str, str]] = None,
+        seed: int = 0,
+        max_files: Optional[int] = None,
+    ) -> Tuple[ScanSummary, ProjectStructure, FileStats, SamplingInfo]:
+        """
+        Scan as much of a project as a time budget allows and estimate the rest.
+
+        Each step lists a random unlisted directory at a depth picked
+        uniformly among the depths with directories left, so shallow and deep
+        parts of the tree are both represented long before the walk could
+        finish. Counts in the returned summary and statistics are estimates
+        for the whole project; names, samples and structure only cover the
+        directories listed. The scanner's max_files does not apply: the
+        budget decides how much is listed unless max_files is given.
+
+        Args:
+            project_path: Path to project root directory
+            time_budget: Seconds to spend listing directories
+            extension_groups: Mapping of lower-cased extension to a group name,
+                such as a language, whose file counts are also estimated
+            seed: Seed of the random directory order, for reproducible samples
+            max_files: Stop once this many files were listed, even with
+                budget left; None lets the budget alone decide
+
+        Returns:
+            Tuple of (scan_summary, project_structure, file_stats,
+            sampling_info); sampling_info.completeness is 1.0 when every
+            directory was listed, in which case all counts are exact
+
+        Raises:
+            ValueError: If time_budget is not positive or project_path is not
+                a directory
+        """
+        if time_budget <= 0:
+            raise ValueError(f"time_budget must be positive, got {time_budget}")
+        if max_files is not None and max_files < 1:
+            raise ValueError(f"max_files must be at least 1, got {max_files}")
+        start = time.monotonic()
+        deadline = start + time_budget
+        root = self._resolve_root(project_path)
+        rng = random.Random(seed)
+        self._reset_identities()
+
+        summary = ScanSummary()
+        extension_samples = summary.extension_samples
+        config_files: List[str] = []
+        largest: List[Tuple[int, str]] = []
+        trie = DirectoryTrie(root)
+        sample = StratifiedSample()
+        files_sampled = 0
+
+        # Unlisted directories per depth, with their inherited ignore rules and
+        # the sample's number for their parent
+        frontier: Dict[int, List[Tuple[str, Tuple[GitIgnore, ...], Optional[int]]]] = {
+            0: [(root, self._root_gitignore_rules(root), None)]
+        }
+        sample.discover(0)
+
+        while frontier and (max_files is None or files_sampled < max_files):
+            if time.monotonic() >= deadline:
+                break
+
+            depth = rng.choice(sorted(frontier))
+            pending = frontier[depth]
+            index = rng.randrange(len(pending))
+            pending[index], pending[-1] = pending[-1], pending[index]
+            directory, rules, parent = pending.pop()
+            if not pending:
+                del frontier[depth]
+
+            file_names, file_sizes, dir_names = self._list_directory(directory)
+            if depth < self.max_depth:
+                rules, dir_names = self._apply_gitignore(
+                    directory, file_names, dir_names, rules
+                )
+            else:
+                dir_names = []
+
+            # Extension keys start with "."; ("bytes", extension) keys sum
+            # sizes; the rest are FileStats fields
+            counts: Counter[Union[str, Tuple[str, str]]] = Counter()
+            node = None
+            for record in self._directory_records(
+                root, directory, file_names, file_sizes
+            ):
+                path = record.path
+                flags = record.flags
+                size = record.size
+                self._offer_largest(largest, size, path)
+                counts["total_files"] += 1
+                if node is None:
+                    node = trie.add(directory)
+                node.file_count += 1
+
+                extension = record.extension
+                if extension and not flags & NOT_AUTHORED:
+                    node.named_file_count += 1
+                    counts[extension] += 1
+                    if size > 0:
+                        counts[("bytes", extension)] += size
+                    samples = extension_samples.setdefault(extension, [])
+                    if len(samples) < self.SAMPLES_PER_EXTENSION:
+                        samples.append(path)
+                    summary.file_names.add(record.name.lower())
+
+                if flags & TEST:
+                    counts["test_files"] += 1
+                elif flags & CONFIG:
+                    counts["config_files"] += 1
+                    config_files.append(path)
+                elif flags & DOC:
+                    counts["documentation_files"] += 1
+                if flags & CODE:
+                    counts["code_files"] += 1
+                elif not flags & (TEST | CONFIG | DOC):
+                    counts["other_files"] += 1
+                if flags & VENDORED:
+                    counts["vendored_files"] += 1
+                if flags & GENERATED:
+                    counts["generated_files"] += 1
+
+            files_sampled += counts["total_files"]
+            number = sample.observe(depth, counts, len(dir_names), parent)
+            if dir_names:
+                frontier.setdefault(depth + 1, []).extend(
+                    (os.path.join(directory, name), rules, number) for name in dir_names
+                )
+
+        file_estimates = sample.estimate(
+            lambda key: key if isinstance(key, str) and key[0] != "." else None
+        )
+        extension_estimates = sample.estimate(
+            lambda key: key if isinstance(key, str) and key[0] == "." else None
+        )
+        byte_estimates = sample.estimate(
+            lambda key: key[1] if isinstance(key, tuple) else None
+        )
+        groups = extension_groups or {}
+        group_estimates = sample.estimate(
+            lambda key: groups.get(key) if isinstance(key, str) else None
+        )
+
+        summary.extension_counts = {
+            extension: max(1, round(estimate.value))
+            for extension, estimate in extension_estimates.items()
+        }
+        summary.extension_bytes = {
+            extension: round(estimate.value)
+            for extension, estimate in byte_estimates.items()
+        }
+        summary.directory_names = trie.directory_names()
+        structure = self._structure_from_directories(trie.directories(), config_files)
+
+        def estimated(name: str) -> int:
+            estimate = file_estimates.get(name)
+            return round(estimate.value) if estimate is not None else 0
+
+        stats = FileStats(
+            total_files=estimated("total_files"),
+            code_files=estimated("code_files"),
+            test_files=estimated("test_files"),
+            config_files=estimated("config_files"),
+            documentation_files=estimated("documentation_files"),
+            other_files=estimated("other_files"),
+            vendored_files=estimated("vendored_files"),
+            generated_files=estimated("generated_files"),
+            duplicate_files=self._duplicate_files,
+            duplicate_directories=self._duplicate_directories,
+            largest_files=self._rank_largest(largest),
+        )
+
+        sampling = SamplingInfo(
+            completeness=sample.completeness,
+            directories_sampled=sample.directories_sampled,
+            directories_found=sample.directories_found,
+            files_sampled=files_sampled,
+            elapsed=time.monotonic() - start,
+            file_estimates=file_estimates,
+            group_estimates=group_estimates,
+        )
+        if sampling.completeness < 1.0:
+            logger.info(
+                f"Time budget of {time_budget}s ran out after listing "
+                f"{sampling.directories_sampled} of {sampling.directories_found} "
+                f"directories found"
+            )
+        return summary, structure, stats, sampling
+
+    def _finish_summary(
+        self, builder: _SummaryBuilder, largest: List[Tuple[int, str]]
+    ) -> Tuple[ScanSummary, ProjectStructure, FileStats]:
+        """Complete the summary, structure and statistics of a scan."""
+        stats = builder.stats
+        stats.duplicate_files = self._duplicate_files
+        stats.duplicate_directories = self._duplicate_directories
+        stats.largest_files = self._rank_largest(largest)
+        summary = builder.summary
+        summary.directory_names = builder.trie.directory_names()
+        structure = self._structure_from_directories(
+            builder.trie.directories(), builder.config_files
+        )
+        return summary, structure, stats
+
+    def _resolve_root(self, project_path: str) -> str:
+        """Resolve and validate the project root."""
         project_path_obj = Path(project_path).resolve()
         if not project_path_obj.exists() or not project_path_obj.is_dir():
             raise ValueError(f"Invalid project path: {project_path_obj}")
+        return str(project_path_obj)
+
+    def _iter_records(
+        self, root: str, trie: Optional[DirectoryTrie] = None
+    ) -> Iterator[FileRecord]:
+        """
+        Walk root and yield a record for every file that is not ignored.
+
+        Args:
+            root: Resolved project root
+            trie: Trie to record each directory holding files in, once
 
+        Yields:
+            FileRecord objects in walk order
+        """
         # Reset file count for each scan
         self._file_count = 0
+        self._reset_identities()
+        self._index = ScanIndex.load(root) if self.use_index else None
+        complete = False
 
-        files_by_extension: Dict[str, List[str]] = defaultdict(list)
-        all_files: List[Path] = []
-        test_files: List[str] = []
-        config_files: List[str] = []
-        doc_files: List[str] = []
+        # Closing the walker as soon as max_files is reached, or the consumer
+        # stops, also stops any parallel listing
+        try:
+            with closing(self._walk_directory(root)) as walker:
+                for directory, file_names, file_sizes in walker:
+                    node = None
+                    for record in self._directory_records(
+                        root, directory, file_names, file_sizes
+                    ):
+                        if self._file_count >= self.max_files:
+                            break
 
-        # Scan files recursively
-        for file_path in self._walk_directory(project_path_obj, 0):
-            if self._file_count >= self.max_files:
-                break
+                        self._file_count += 1
+                        if trie is not None:
+                            if node is None:
+                                node = trie.add(directory)
+                            node.file_count += 1
+                            if record.extension and not record.flags & NOT_AUTHORED:
+                                node.named_file_count += 1
+                        yield record
+                    if self._file_count >= self.max_files:
+                        # Stop before the walker lists another directory
+                        break
+            complete = self._file_count < self.max_files
+        finally:
+            if self._index is not None and self.save_index:
+                # A truncated walk did not visit every directory, so keep old
+                # entries
+                self._index.save(prune=complete)
+            self._index = None
+
+    def _directory_records(
+        self,
+        root: str,
+        directory: str,
+        file_names: List[str],
+        file_sizes: List[int],
+    ) -> Iterator[FileRecord]:
+        """
+        Classify the files of a directory, skipping ignored ones.
 
-            if self._should_ignore_file(file_path):
+        Args:
+            root: Resolved project root
+            directory: Directory holding the files
+            file_names: Names of the files
+            file_sizes: Sizes of the files parallel to file_names
+
+        Yields:
+            FileRecord objects, root manifests first
+        """
+        classify = self._classifier.classify
+        files: Iterable[Tuple[str, int]] = zip(file_names, file_sizes)
+        if directory == root:
+            # Root manifests first, so even a tiny cap keeps them
+            files = sorted(files, key=lambda file: not classify(file[0]) & CONFIG)
+
+        # Files anywhere below a "test" directory count as tests
+        in_test_dir = "test" in directory.lower()
+        directory_flags = VENDORED if self._is_vendored(root, directory) else 0
+        scripts = (
+            {} if directory_flags else self._script_extensions(directory, file_names)
+        )
+        for file_name, size in files:
+            flags = classify(file_name) | directory_flags
+            if flags & IGNORED:
                 continue
+            if in_test_dir or "test" in file_name.lower():
+                flags |= TEST
+            extension = _get_suffix(file_name).lower()
+            if not extension and file_name in scripts:
+                extension = scripts[file_name]
+                flags |= CODE
+            yield FileRecord(directory, file_name, extension, flags, size)
 
-            all_files.append(file_path)
-            self._file_count += 1
+    def _script_extensions(
+        self, directory: str, file_names: List[str]
+    ) -> Dict[str, str]:
+        """
+        Detect the language of a directory's extensionless scripts.
+
+        Only files that are executable, or lie directly in one of SCRIPT_DIRS,
+        are read, SCRIPT_HEAD_BYTES at most each. At most script_read_limit files
+        are checked per scan, so trees full of extensionless files don't slow
+        the walk down.
+
+        Args:
+            directory: Directory holding the files
+            file_names: Names of the files
+
+        Returns:
+            Dictionary mapping script names to the extension of their language
+        """
+        limit = self.script_read_limit
+        if self._script_reads >= limit:
+            return {}
+
+        classify = self._classifier.classify
+        in_script_dir = os.path.basename(directory).lower() in self.SCRIPT_DIRS
+        scripts: Dict[str, str] = {}
+        for file_name in file_names:
+            if _get_suffix(file_name) or classify(file_name) & (IGNORED | CONFIG | DOC):
+                continue
+            if self._script_reads >= limit:
+                logger.debug(f"Script detection limit of {limit} files reached")
+                break
+            self._script_reads += 1
 
-            # Categorize by extension
-            extension = file_path.suffix.lower()
+            path = os.path.join(directory, file_name)
+            if not in_script_dir and not os.access(path, os.X_OK):
+                continue
+            head = self.content_cache.read_head(path, SCRIPT_HEAD_BYTES)
+            if head is None:
+                continue
+            extension = script_extension(head)
             if extension:
-                files_by_extension[extension].append(str(file_path))
-
-            # Categorize by file type
-            if self._is_test_file(file_path):
-                test_files.append(str(file_path))
-            elif self._is_config_file(file_path):
-                config_files.append(str(file_path))
-            elif self._is_doc_file(file_path):
-                doc_files.append(str(file_path))
-
-        # Analyze project structure
-        structure = self._analyze_structure(
-            project_path_obj, all_files, test_files, config_files
-        )
+                scripts[file_name] = extension
+        return scripts
 
-        # Calculate file statistics
-        stats = self._calculate_stats(all_files, test_files, config_files, doc_files)
+    def _is_vendored(self, root: str, directory: str) -> bool:
+        """Check whether a directory lies at or below a vendored directory."""
+        return is_vendored_dir(directory[len(root) + 1 :], self.VENDORED_DIRS)
+
+    def _walk_directory(
+        self, root: str
+    ) -> Generator[Tuple[str, List[str], List[int]], None, None]:
+        """
+        Walk the tree under root in priority order with a depth limit.
 
-        return dict(files_by_extension), structure, stats
+        Directories are visited breadth-first from a priority queue: the
+        subtrees named in PRIORITY_DIRS come first and those in DEFERRED_DIRS
+        last, so a walk cut short by max_files keeps the most informative
+        files. Uses ``os.scandir`` so entry types come from the directory
+        listing itself rather than a ``stat`` call per entry. Directories
+        ignored by .gitignore rules are pruned before descending.
 
-    def _walk_directory(self, directory: Path, depth: int):
-        """Recursively walk directory with depth limit."""
-        if depth > self.max_depth:
+        Args:
+            root: Path of the directory to start from
+
+        Yields:
+            Tuples of (directory path, names of regular files in it, their
+            sizes in bytes)
+        """
+        if self.backend == "git":
+            batches = self._read_git_index(root)
+            if batches is not None:
+                yield from batches
+                return
+
+        if self.workers > 1:
+            yield from self._walk_directory_parallel(root)
             return
 
+        # Entries are (rank, depth, sequence, path, rules); the sequence keeps
+        # listing order among equals and is never tied, so rules aren't compared
+        sequence = itertools.count()
+        queue = [
+            (_ROOT_RANK, 0, next(sequence), root, self._root_gitignore_rules(root))
+        ]
+        while queue:
+            rank, depth, _, directory, rules = heapq.heappop(queue)
+            file_names, file_sizes, dir_names = self._list_directory(directory)
+            yield directory, file_names, file_sizes
+
+            if depth >= self.max_depth:
+                self._prune_below(directory, dir_names)
+                continue
+
+            rules, dir_names = self._apply_gitignore(
+                directory, file_names, dir_names, rules
+            )
+            for dir_name in dir_names:
+                heapq.heappush(
+                    queue,
+                    (
+                        self._directory_rank(rank, dir_name),
+                        depth + 1,
+                        next(sequence),
+                        os.path.join(directory, dir_name),
+                        rules,
+                    ),
+                )
+
+    def _directory_rank(self, parent_rank: int, name: str) -> int:
+        """
+        Return the traversal rank of a directory.
+
+        Args:
+            parent_rank: Rank of the parent directory
+            name: Name of the directory
+
+        Returns:
+            Rank inherited from the parent or given by the directory's name,
+            deferral taking precedence
+        """
+        lower = name.lower()
+        if parent_rank == _DEFERRED_RANK or lower in self.DEFERRED_DIRS:
+            return _DEFERRED_RANK
+        if parent_rank == _PRIORITY_RANK or lower in self.PRIORITY_DIRS:
+            return _PRIORITY_RANK
+        return _DEFAULT_RANK
+
+    def _read_git_index(
+        self, root: str
+    ) -> Optional[List[Tuple[str, List[str], List[int]]]]:
+        """
+        Enumerate the tracked files under root from the git index.
+
+        The index lists every tracked file in one sequential read, so no
+        directory is opened. Directories are filtered with the same ignore and
+        depth rules as the walk; .gitignore rules are not applied because
+        tracked files are never ignored by git. Untracked files are not
+        reported, and files deleted but not yet staged still are. Sizes are
+        those the index recorded when the files were last staged or
+        refreshed.
+
+        Args:
+            root: Path of the directory being scanned
+
+        Returns:
+            List of (directory path, file names, file sizes) batches grouped by
+            directory, or None if the index cannot be used
+        """
+        repository = find_repository(root)
+        if repository is None:
+            return None
+        work_tree, git_dir = repository
         try:
-            for item in directory.iterdir():
-                if item.is_file():
-                    yield item
-                elif item.is_dir() and not self._should_ignore_dir(item):
-                    yield from self._walk_directory(item, depth + 1)
+            entries = read_index(git_dir)
+        except GitIndexError as e:
+            logger.debug(f"Falling back to directory walk: {e}")
+            return None
+
+        # Index paths are relative to the work tree and slash-separated
+        prefix = root[len(work_tree) + 1 :].replace(os.sep, "/")
+        if prefix:
+            prefix += "/"
+
+        batches: Dict[str, Tuple[List[str], List[int]]] = {}
+        allowed: Dict[str, bool] = {}
+        for entry in entries:
+            path = entry.path
+            if prefix:
+                if not path.startswith(prefix):
+                    continue
+                path = path[len(prefix) :]
+            rel_dir, _, file_name = path.rpartition("/")
+
+            keep = allowed.get(rel_dir)
+            if keep is None:
+                parts = rel_dir.split("/") if rel_dir else []
+                keep = True
+                for depth, part in enumerate(parts):
+                    if depth >= self.max_depth or self._should_ignore_dir(part):
+                        self._pruned.add(os.path.join(root, *parts[: depth + 1]))
+                        keep = False
+                        break
+                allowed[rel_dir] = keep
+                if keep:
+                    batches[rel_dir] = ([], [])
+            if keep:
+                file_names, file_sizes = batches[rel_dir]
+                file_names.append(file_name)
+                file_sizes.append(entry.size)
+
+        # Same order as the walk: by rank, then depth, then index order
+        ranks: Dict[str, int] = {"": _ROOT_RANK}
+        for rel_dir in batches:
+            rank = _ROOT_RANK
+            part_path = ""
+            for part in rel_dir.split("/") if rel_dir else ():
+                part_path = f"{part_path}/{part}" if part_path else part
+                part_rank = ranks.get(part_path)
+                if part_rank is None:
+                    part_rank = ranks[part_path] = self._directory_rank(rank, part)
+                rank = part_rank
+        ordered = sorted(
+            batches,
+            key=lambda rel_dir: (ranks[rel_dir], rel_dir.count("/") if rel_dir else -1),
+        )
+        return [
+            (
+                os.path.join(root, *rel_dir.split("/")) if rel_dir else root,
+                *batches[rel_dir],
+            )
+            for rel_dir in ordered
+        ]
+
+    def _walk_directory_parallel(
+        self, root: str
+    ) -> Generator[Tuple[str, List[str], List[int]], None, None]:
+        """
+        Walk the tree under root, listing directories on a thread pool.
+
+        The consumer replays the listings in the same priority order as the
+        serial walker, which keeps output deterministic and lets the caller
+        apply max_files exactly. A directory's subdirectories are queued
+        when the consumer takes the directory, and only the next
+        LISTINGS_PER_WORKER * workers queued directories are listed ahead of
+        it, so a walk stopped by max_files lists little more than the serial
+        walk would. Closing the generator cancels the listings not yet
+        started. When the same directory or file is reachable under several
+        paths, which path is reported depends on which listing finishes
+        first.
+
+        Args:
+            root: Path of the directory to start from
+
+        Yields:
+            Tuples of (directory path, names of regular files in it, their
+            sizes in bytes)
+        """
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        lookahead = self.LISTINGS_PER_WORKER * self.workers
+
+        def list_one(
+            directory: str, depth: int, rules: Tuple[GitIgnore, ...]
+        ) -> _ParallelListing:
+            file_names, file_sizes, dir_names = self._list_directory(directory)
+            if depth >= self.max_depth:
+                self._prune_below(directory, dir_names)
+                return file_names, file_sizes, rules, []
+            rules, dir_names = self._apply_gitignore(
+                directory, file_names, dir_names, rules
+            )
+            return file_names, file_sizes, rules, dir_names
+
+        # Entries are (rank, depth, sequence, path, rules, listing); queue
+        # holds every directory not yet replayed and waiting those of them
+        # not yet submitted, both ordered like the serial walk
+        sequence = itertools.count()
+        queue: List[_ParallelEntry] = []
+        waiting: List[_ParallelEntry] = []
+        submitted = 0
+        try:
+            entry: _ParallelEntry = (
+                _ROOT_RANK,
+                0,
+                next(sequence),
+                root,
+                self._root_gitignore_rules(root),
+                [],
+            )
+            queue.append(entry)
+            waiting.append(entry)
+            while queue:
+                while waiting and submitted < lookahead:
+                    _, depth, _, directory, rules, listing = heapq.heappop(waiting)
+                    listing.append(executor.submit(list_one, directory, depth, rules))
+                    submitted += 1
+
+                rank, depth, _, directory, _, listing = heapq.heappop(queue)
+                file_names, file_sizes, rules, dir_names = listing[0].result()
+                submitted -= 1
+                yield directory, file_names, file_sizes
+
+                for dir_name in dir_names:
+                    entry = (
+                        self._directory_rank(rank, dir_name),
+                        depth + 1,
+                        next(sequence),
+                        os.path.join(directory, dir_name),
+                        rules,
+                        [],
+                    )
+                    heapq.heappush(queue, entry)
+                    heapq.heappush(waiting, entry)
+        finally:
+            for entry in queue:
+                for future in entry[5]:
+                    future.cancel()
+            executor.shutdown(wait=True)
+
+    def _root_gitignore_rules(self, root: str) -> Tuple[GitIgnore, ...]:
+        """Return ignore rules inherited from the enclosing git work tree."""
+        if not self.respect_gitignore:
+            return ()
+        return load_parent_rules(root)
+
+    def _apply_gitignore(
+        self,
+        directory: str,
+        file_names: List[str],
+        dir_names: List[str],
+        rules: Tuple[GitIgnore, ...],
+    ) -> Tuple[Tuple[GitIgnore, ...], List[str]]:
+        """
+        Extend the rule chain with directory's .gitignore and prune subdirectories.
+
+        Each .gitignore is compiled once, when its directory is listed, and
+        every ignored subdirectory costs a single check instead of a walk.
+
+        Args:
+            directory: Directory that was just listed
+            file_names: Files in the directory
+            dir_names: Candidate subdirectories
+            rules: Rules inherited from parent directories
+
+        Returns:
+            Tuple of (rules for the subdirectories, subdirectories to descend into)
+        """
+        if not self.respect_gitignore:
+            return rules, dir_names
+
+        if GITIGNORE_FILE in file_names:
+            ignore = GitIgnore.from_file(
+                os.path.join(directory, GITIGNORE_FILE), directory
+            )
+            if ignore is not None:
+                rules = rules + (ignore,)
+
+        if rules:
+            kept = []
+            for dir_name in dir_names:
+                path = os.path.join(directory, dir_name)
+                if is_ignored(rules, path, True):
+                    self._pruned.add(path)
+                else:
+                    kept.append(dir_name)
+            dir_names = kept
+        return rules, dir_names
+
+    def _list_directory(
+        self, directory: str, claim: bool = True
+    ) -> Tuple[List[str], List[int], List[str]]:
+        """
+        List a single directory.
+
+        Args:
+            directory: Directory path
+            claim: Skip the directory, and files, already listed in this scan
+
+        Returns:
+            Tuple of (file names, file sizes, names of subdirectories to
+            descend into)
+        """
+        file_names, file_sizes, dir_names = self._read_directory(directory, claim)
+        kept = []
+        for dir_name in dir_names:
+            if self._should_ignore_dir(dir_name):
+                self._pruned.add(os.path.join(directory, dir_name))
+            else:
+                kept.append(dir_name)
+        return file_names, file_sizes, kept
+
+    def _read_directory(
+        self, directory: str, claim: bool = True
+    ) -> Tuple[List[str], List[int], List[str]]:
+        """
+        Read the raw entries of a directory, consulting the scan index if enabled.
+
+        A directory already listed under another path (through a symlink or a
+        link cycle) is skipped, as are files already found under another name.
+        File sizes come from the entries' own stat, which ``os.scandir``
+        caches and which is free where the listing carries it (Windows), or
+        from the scan index.
+
+        Args:
+            directory: Directory path
+            claim: Apply the duplicate checks and use the scan index; False
+                reads the directory again from disk without them
+
+        Returns:
+            Tuple of (file names, file sizes, subdirectory names); sizes are
+            -1 where a file could not be stat'ed
+        """
+        try:
+            # Stat before listing so a concurrent change invalidates the entry
+            if self.follow_symlinks:
+                st = os.stat(directory)
+            else:
+                st = os.lstat(directory)
+                if stat.S_ISLNK(st.st_mode):
+                    return [], [], []
+        except OSError:
+            return [], [], []
+        if claim and not self._claim_directory(directory, st.st_dev, st.st_ino):
+            return [], [], []
+        unique_files = self._unique_files if claim else _all_files
+        file_names: List[str]
+        dir_names: List[str]
+        # Inode numbers from the listing itself; symlink targets are looked up
+        file_ids: List[int]
+        file_sizes: List[int]
+
+        index = self._index if claim else None
+        if index is not None:
+            cached = index.lookup(directory, st.st_mtime_ns)
+            if cached is not None:
+                file_names, dir_names = cached
+                file_ids = index.file_ids(directory)
+                file_sizes = index.file_sizes(directory)
+                return (
+                    *unique_files(
+                        directory, st.st_dev, file_names, file_ids, file_sizes
+                    ),
+                    dir_names,
+                )
+
+        file_names, dir_names, file_ids, file_sizes = [], [], [], []
+        follow_symlinks = self.follow_symlinks
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file():
+                            if not entry.is_symlink():
+                                file_id = entry.inode()
+                                size = entry.stat().st_size
+                            else:
+                                file_id = _SYMLINK_ID
+                                # Symlinked files are dropped unless followed
+                                size = entry.stat().st_size if follow_symlinks else -1
+                            file_names.append(entry.name)
+                            file_ids.append(file_id)
+                            file_sizes.append(size)
+                        elif entry.is_dir():
+                            dir_names.append(entry.name)
+                    except OSError:
+                        # Broken entry (e.g. dangling symlink target)
+                        continue
         except (PermissionError, OSError):
             # Skip directories we can't read
-            pass
+            return (
+                *unique_files(directory, st.st_dev, file_names, file_ids, file_sizes),
+                dir_names,
+            )
 
-    def _should_ignore_dir(self, dir_path: Path) -> bool:
-        """Check if directory should be ignored."""
-        dir_name = dir_path.name
-        return dir_name in self.IGNORE_DIRS or dir_name.startswith(".")
+        if self._index is not None:
+            self._index.store(
+                directory, st.st_mtime_ns, file_names, dir_names, file_ids, file_sizes
+            )
+        return (
+            *unique_files(directory, st.st_dev, file_names, file_ids, file_sizes),
+            dir_names,
+        )
 
-    def _should_ignore_file(self, file_path: Path) -> bool:
-        """Check if file should be ignored."""
-        file_name = file_path.name
+    def _reset_identities(self) -> None:
+        """Forget the directories, files and scripts seen by a previous scan."""
+        self._script_reads = 0
+        self._seen_directories = set()
+        self._seen_files = {}
+        self._claims = None
+        self._duplicate_directories = 0
+        self._duplicate_files = 0
+        self._pruned = set()
 
-        # Check ignore patterns
-        for pattern in self.IGNORE_PATTERNS:
-            if fnmatch.fnmatch(file_name, pattern):
-                return True
+    def _claim_directory(self, directory: str, device: int, inode: int) -> bool:
+        """
+        Record a directory about to be listed.
+
+        Args:
+            directory: Directory path
+            device: st_dev of the directory
+            inode: st_ino of the directory
 
-        # Ignore hidden files (except common config files)
-        if file_name.startswith(".") and not self._is_config_file(file_path):
+        Returns:
+            False if the directory was already listed during this scan
+        """
+        if not inode:
+            # Filesystem without stable inode numbers
             return True
+        key = (device, inode)
+        with self._identity_lock:
+            if key in self._seen_directories:
+                self._duplicate_directories += 1
+                return False
+            self._seen_directories.add(key)
+            if self._claims is not None:
+                self._claims[directory] = [key]
+        return True
 
-        return False
+    def _unique_files(
+        self,
+        directory: str,
+        device: int,
+        file_names: List[str],
+        file_ids: List[int],
+        file_sizes: List[int],
+    ) -> Tuple[List[str], List[int]]:
+        """
+        Drop files already found under another name during this scan.
 
-    def _is_test_file(self, file_path: Path) -> bool:
-        """Check if file is a test file."""
-        file_name = file_path.name.lower()
+        Args:
+            directory: Directory holding the files
+            device: st_dev of the directory, shared by its regular files
+            file_names: Names of the files
+            file_ids: Inode numbers parallel to file_names; _SYMLINK_ID for
+                symlinks, 0 where the filesystem reports none
+            file_sizes: Sizes parallel to file_names
+
+        Returns:
+            Tuple of (names, sizes) of the files seen for the first time, in
+            listing order
+        """
+        if len(file_ids) != len(file_names):
+            file_ids = [0] * len(file_names)
+        if len(file_sizes) != len(file_names):
+            file_sizes = [-1] * len(file_names)
 
-        # Check test-specific extensions
-        for ext in self.TEST_EXTENSIONS:
-            if file_name.endswith(ext):
-                return True
+        keys: List[Tuple[str, int, int, int]] = []
+        for file_name, inode, size in zip(file_names, file_ids, file_sizes):
+            if inode != _SYMLINK_ID:
+                keys.append((file_name, size, device, inode))
+            elif self.follow_symlinks:
+                try:
+                    st = os.stat(os.path.join(directory, file_name))
+                except OSError:
+                    continue
+                keys.append((file_name, st.st_size, st.st_dev, st.st_ino))
 
-        # Check test patterns
-        for pattern in self.TEST_PATTERNS:
-            if fnmatch.fnmatch(file_name, pattern):
-                return True
+        unique: List[str] = []
+        sizes: List[int] = []
+        with self._identity_lock:
+            seen_files = self._seen_files
+            claims = None if self._claims is None else self._claims.get(directory)
+            for file_name, size, file_device, inode in keys:
+                if inode:
+                    seen = seen_files.get(file_device)
+                    if seen is None:
+                        seen = seen_files[file_device] = set()
+                    if inode in seen:
+                        self._duplicate_files += 1
+                        continue
+                    seen.add(inode)
+                    if claims is not None:
+                        claims.append((file_device, inode))
+                unique.append(file_name)
+                sizes.append(size)
+        return unique, sizes
 
-        # Check if in test directory
-        path_parts = [p.lower() for p in file_path.parts]
-        return any("test" in part for part in path_parts)
+    def _prune_below(self, directory: str, dir_names: List[str]) -> None:
+        """Record the subdirectories of a directory at max_depth as pruned."""
+        self._pruned.update(os.path.join(directory, name) for name in dir_names)
 
-    def _is_config_file(self, file_path: Path) -> bool:
-        """Check if file is a configuration file."""
-        file_name = file_path.name
+    def _should_ignore_dir(self, dir_path: Union[str, Path]) -> bool:
+        """Check if directory should be ignored."""
+        dir_name = os.path.basename(os.fspath(dir_path))
+        return dir_name in self.IGNORE_DIRS or dir_name.startswith(".")
 
-        for pattern in self.CONFIG_PATTERNS:
-            if fnmatch.fnmatch(file_name, pattern):
-                return True
-        return False
+    def _should_ignore_file(self, file_path: Union[str, Path]) -> bool:
+        """Check if file should be ignored."""
+        file_name = os.path.basename(os.fspath(file_path))
+        return bool(self._classifier.classify(file_name) & IGNORED)
 
-    def _is_doc_file(self, file_path: Path) -> bool:
-        """Check if file is a documentation file."""
-        file_name = file_path.name
+    def _is_test_file(self, file_path: Union[str, Path]) -> bool:
+        """Check if file is a test file."""
+        path_str = os.fspath(file_path)
+        if self._classifier.classify(os.path.basename(path_str)) & TEST:
+            return True
 
-        for pattern in self.DOC_PATTERNS:
-            if fnmatch.fnmatch(file_name, pattern):
-                return True
-        return False
+        # Check if in test directory ("test" cannot span a path separator, so
+        # a substring check on the whole path matches any component)
+        return "test" in path_str.lower()
 
-    def _is_code_file(self, file_path: Path) -> bool:
+    def _is_config_file(self, file_path: Union[str, Path]) -> bool:
+        """Check if file is a configuration file."""
+        file_name = os.path.basename(os.fspath(file_path))
+        return bool(self._classifier.classify(file_name) & CONFIG)
+
+    def _is_doc_file(self, file_path: Union[str, Path]) -> bool:
+        """Check if file is a documentation file."""
+        file_name = os.path.basename(os.fspath(file_path))
+        return bool(self._classifier.classify(file_name) & DOC)
+
+    def _is_code_file(self, file_path: Union[str, Path]) -> bool:
         """Check if file is a code file."""
-        return file_path.suffix.lower() in self.CODE_EXTENSIONS
+        file_name = os.path.basename(os.fspath(file_path))
+        return bool(self._classifier.classify(file_name) & CODE)
 
     def _analyze_structure(
         self,
-        project_path: Path,
-        all_files: List[Path],
+        project_path: Union[str, Path],
+        all_files: Sequence[Union[str, Path]],
         test_files: List[str],
         config_files: List[str],
     ) -> ProjectStructure:
         """Analyze project directory structure."""
-        structure = ProjectStructure()
-
-        # Find all directories
-        directories = set()
+        # Record each file's directory once; ancestors come from the trie
+        root = os.fspath(project_path)
+        prefix = os.path.join(root, "")
+        trie = DirectoryTrie(root)
         for file_path in all_files:
-            for parent in file_path.parents:
-                if parent != project_path:
-                    try:
-                        rel_path = parent.relative_to(project_path)
-                        directories.add(str(rel_path))
-                    except ValueError:
-                        # parent is not within project_path, skip it
-                        break
+            file_path = os.fspath(file_path)
+            if file_path.startswith(prefix):
+                trie.add(os.path.dirname(file_path), 1)
+
+        return self._structure_from_directories(trie.directories(), config_files)
+
+    def _structure_from_directories(
+        self, directories: Set[str], config_files: List[str]
+    ) -> ProjectStructure:
+        """
+        Build the project structure from directory paths relative to the root.
+
+        Args:
+            directories: Relative paths of directories containing files
+            config_files: Configuration file paths
+
+        Returns:
+            ProjectStructure instance
+        """
+        structure = ProjectStructure()
 
         # Check for common directory patterns
         dir_names = [d.lower() for d in directories]
@@ -371,12 +1651,17 @@ class FileScanner:
 
     def _calculate_stats(
         self,
-        all_files: List[Path],
+        all_files: Sequence[Union[str, Path]],
         test_files: List[str],
         config_files: List[str],
         doc_files: List[str],
     ) -> FileStats:
-        """Calculate file statistics."""
+        """
+        Calculate file statistics from path lists.
+
+        Largest files are left empty: ranking them needs file sizes, which
+        the scans take from their directory listings instead.
+        """
         stats = FileStats()
 
         stats.total_files = len(all_files)
@@ -385,36 +1670,102 @@ class FileScanner:
         stats.documentation_files = len(doc_files)
 
         # Count code files
-        code_files = [f for f in all_files if self._is_code_file(f)]
+        code_files = [os.fspath(f) for f in all_files if self._is_code_file(f)]
         stats.code_files = len(code_files)
 
         # Other files
-        categorized = set(
-            test_files + config_files + doc_files + [str(f) for f in code_files]
-        )
+        categorized = set(test_files + config_files + doc_files + code_files)
         stats.other_files = stats.total_files - len(categorized)
 
-        # Find largest files (by line count for text files, by size for others)
+        return stats
+
+    def _offer_largest(self, heap: List[Tuple[int, str]], size: int, path: str) -> None:
+        """
+        Offer a file to a bounded min-heap of the largest files by size.
+
+        Args:
+            heap: Heap of (size, path) holding at most largest_files_count items
+            size: File size in bytes from the listing; negative if unknown
+            path: File path
+        """
+        limit = self.largest_files_count
+        if not limit or size < 0:
+            return
+        if len(heap) < limit:
+            heapq.heappush(heap, (size, path))
+        elif size > heap[0][0]:
+            heapq.heapreplace(heap, (size, path))
+
+    def _rank_largest(self, heap: List[Tuple[int, str]]) -> List[str]:
+        """
+        Order the largest-file candidates (by line count for text files, by size
+        for others).
+
+        Args:
+            heap: Candidates as (size, path), such as a heap built by
+                _offer_largest
+
+        Returns:
+            Candidate paths, largest first
+        """
         file_sizes = []
-        for file_path in all_files[:100]:  # Limit to avoid performance issues
-            try:
-                if self._is_code_file(file_path) or self._is_doc_file(file_path):
-                    # Count lines for text files
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        line_count = sum(1 for _ in f)
-                    file_sizes.append((line_count, str(file_path)))
-                else:
-                    # Use file size for binary files
-                    size = file_path.stat().st_size
-                    file_sizes.append((size, str(file_path)))
-            except (OSError, UnicodeDecodeError):
-                continue
+        for size, path in heap:
+            if self._is_code_file(path) or self._is_doc_file(path):
+                # Count lines for text files
+                line_count = self._count_lines(path, size)
+                if line_count is None:
+                    continue
+                file_sizes.append((line_count, path))
+            else:
+                # Use file size for binary files
+                file_sizes.append((size, path))
 
-        # Get top 5 largest files
         file_sizes.sort(reverse=True)
-        stats.largest_files = [path for _, path in file_sizes[:5]]
+        return [path for _, path in file_sizes]
 
-        return stats
+    def _count_lines(self, path: str, size: int) -> Optional[int]:
+        """
+        Count lines by counting newline bytes in chunked binary reads.
+
+        At most line_count_max_bytes are read; the count of a longer file is
+        extrapolated from the part that was read. Files small enough to fit
+        in a content cache entry are read through the cache.
+
+        Args:
+            path: File path
+            size: File size in bytes
+
+        Returns:
+            Number of lines, or None if the file can't be read
+        """
+        limit = self.line_count_max_bytes
+        if 0 <= size <= min(self.content_cache.head_bytes, limit):
+            content = self.content_cache.read(path)
+            if content is None:
+                return None
+            return content.count(b"\n") + (content[-1:] not in (b"", b"\n"))
+
+        line_count = 0
+        bytes_read = 0
+        last_byte = b"\n"
+        try:
+            with open(path, "rb") as f:
+                while bytes_read < limit:
+                    chunk = f.read(min(_LINE_COUNT_CHUNK, limit - bytes_read))
+                    if not chunk:
+                        break
+                    line_count += chunk.count(b"\n")
+                    bytes_read += len(chunk)
+                    last_byte = chunk[-1:]
+        except OSError:
+            return None
+
+        if bytes_read >= limit and size > bytes_read:
+            return line_count * size // bytes_read
+        if last_byte != b"\n":
+            # Last line without a trailing newline
+            line_count += 1
+        return line_count
 
     def get_file_content_sample(
         self, file_path: str, max_lines: int = 50
@@ -422,31 +1773,39 @@ class FileScanner:
         """
         Get a sample of file content for analysis.
 
+        Only the head kept by the content cache is read, so a sample of a
+        file with very long lines may have fewer than max_lines lines.
+
         Args:
             file_path: Path to the file
             max_lines: Maximum number of lines to read
 
         Returns:
-            File content sample or None if file can't be read
+            File content sample or None if file can't be read or is generated
         """
-        try:
-            path = Path(file_path)
-            if not path.exists() or not path.is_file():
-                return None
+        path = Path(file_path)
 
-            # Only read text files
-            if not self._is_text_file(path):
-                return None
+        # Only read text files written by hand
+        if not self._is_text_file(path):
+            return None
+        if self._classifier.classify(path.name) & GENERATED:
+            return None
 
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = []
-                for i, line in enumerate(f):
-                    if i >= max_lines:
-                        break
-                    lines.append(line.rstrip())
-                return "\n".join(lines)
-        except (OSError, UnicodeDecodeError):
+        head = self.content_cache.read(os.fspath(file_path))
+        if head is None:
             return None
+        # Generated files are recognized from their header alone
+        if is_generated_header(head[:HEADER_BYTES]):
+            return None
+
+        lines = []
+        for i, line in enumerate(
+            io.StringIO(head.decode("utf-8", errors="ignore"), newline=None)
+        ):
+            if i >= max_lines:
+                break
+            lines.append(line.rstrip())
+        return "\n".join(lines)
 
     def _is_text_file(self, file_path: Path) -> bool:
         """Check if file is likely a text file."""
@@ -525,3 +1884,23 @@ class FileScanner:
             "license",
             "changelog",
         }
+
+
+def _get_suffix(file_name: str) -> str:
+    """Return the final suffix of a file name, matching ``PurePath.suffix``."""
+    name = os.path.basename(file_name)
+    index = name.rfind(".")
+    if 0 < index < len(name) - 1:
+        return name[index:]
+    return ""
+
+
+def _all_files(
+    directory: str,
+    device: int,
+    file_names: List[str],
+    file_ids: List[int],
+    file_sizes: List[int],
+) -> Tuple[List[str], List[int]]:
+    """Keep every file; stands in for FileScanner._unique_files on a re-read."""
+    return file_names, file_sizes
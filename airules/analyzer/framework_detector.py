@@ -1,12 +1,36 @@
 """Framework and technology detection for various languages and ecosystems."""
 
+import itertools
+import logging
+import os
 import re
-from dataclasses import dataclass, field
+import stat
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, cast
-
-from .package_parser import PackageInfo, PackageParser
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
+
+from .content_analysis import ContentRules, PatternMatcher, analyze_contents
+from .content_cache import ContentCache
+from .dependency_index import DependencyIndex
+from .file_scanner import NOT_AUTHORED, FileScanner
+from .package_parser import DependencyInfo, PackageInfo, PackageParser
+from .path_table import PathTable
+
+logger = logging.getLogger(__name__)
 
 
 class FrameworkType(Enum):
@@ -61,9 +85,25 @@ class ProjectTechnology:
     confidence_score: float
 
 
+class _Detection(NamedTuple):
+    """A remembered detection and the fingerprint it is valid for."""
+
+    paths: Tuple[str, ...]  # Directories and package files fingerprinted
+    stamps: Tuple[Optional[int], ...]  # Their mtimes, None if missing
+    frameworks: Tuple[FrameworkInfo, ...]
+    languages: FrozenSet[str]
+
+
 class FrameworkDetector:
     """Main framework detection engine."""
 
+    # Projects whose detections are remembered, least recently used dropped
+    MEMO_SIZE = 32
+
+    # Detections per resolved project root, shared by all detectors
+    _memo: "OrderedDict[str, _Detection]" = OrderedDict()
+    _memo_lock = threading.Lock()
+
     # Framework definitions with detection patterns
     FRAMEWORK_DEFINITIONS = {
         # JavaScript/TypeScript Frameworks
@@ -573,15 +613,119 @@ class FrameworkDetector:
         },
     }
 
-    def __init__(self):
+    # Bytes at the start of a source file searched for file_patterns
+    PATTERN_SCAN_BYTES = 8192
+
+    # Framework keys per dependency name, built once for all detections
+    DEPENDENCY_INDEX = DependencyIndex(
+        {
+            key: cast(List[str], definition["dependencies"])
+            for key, definition in FRAMEWORK_DEFINITIONS.items()
+            if definition.get("dependencies")
+        }
+    )
+
+    # file_patterns of every framework, compiled once for all detections
+    FILE_PATTERN_MATCHER = PatternMatcher(
+        {
+            key: cast(List[str], definition["file_patterns"])
+            for key, definition in FRAMEWORK_DEFINITIONS.items()
+            if definition.get("file_patterns")
+        },
+        flags=re.IGNORECASE,
+    )
+
+    # Extensions of the source files searched for file_patterns
+    SOURCE_EXTENSIONS = (
+        ".js",
+        ".ts",
+        ".jsx",
+        ".tsx",
+        ".py",
+        ".java",
+        ".rs",
+        ".go",
+        ".php",
+        ".rb",
+        ".vue",
+        ".svelte",
+    )
+
+    # Source files searched for file_patterns per detection
+    MAX_PATTERN_FILES = 100
+
+    # Files and directories (ending in "/") whose presence together suggests
+    # a framework
+    STRUCTURE_PATTERNS = {
+        "django": ["manage.py", "apps/", "templates/", "static/"],
+        "rails": ["app/", "config/", "db/", "Gemfile"],
+        "laravel": ["app/", "config/", "database/", "resources/", "artisan"],
+        "spring-boot": ["src/main/java/", "src/main/resources/", "pom.xml"],
+        "react": ["src/", "public/", "package.json"],
+        "angular": ["src/app/", "angular.json"],
+        "vue": ["src/", "public/", "vue.config.js"],
+        "flutter": ["lib/", "android/", "ios/", "pubspec.yaml"],
+        "react-native": ["android/", "ios/", "metro.config.js"],
+    }
+
+    def __init__(self, content_cache: Optional[ContentCache] = None, jobs: int = 1):
+        """
+        Initialize the framework detector.
+
+        Args:
+            content_cache: Cache of file heads to read source files through,
+                such as the one of the FileScanner used for the analysis; a
+                private cache, created when omitted, is cleared per detection
+            jobs: Worker processes matching file patterns; see
+                analyze_contents
+
+        Raises:
+            ValueError: If jobs is less than 1
+        """
+        if jobs < 1:
+            raise ValueError(f"jobs must be at least 1, got {jobs}")
+        self.jobs = jobs
+        self._owns_cache = content_cache is None
+        self.content_cache = ContentCache() if content_cache is None else content_cache
+        self.file_scanner = FileScanner(content_cache=self.content_cache)
         self.package_parser = PackageParser()
         self.detected_frameworks: List[FrameworkInfo] = []
-        self.project_languages = set()
+        self.project_languages: Set[str] = set()
+
+    def detect_frameworks(
+        self, project_path: str, inventory: Optional[PathTable] = None
+    ) -> List[FrameworkInfo]:
+        """
+        Detect all frameworks in a project.
+
+        A project detected before is answered from a memo shared by all
+        detectors while its fingerprint holds; see _recall for what that
+        check costs.
+
+        Args:
+            project_path: Path to project root directory
+            inventory: Files of the project from FileScanner.scan_table, so
+                a caller that already scanned it does not walk it again;
+                the project is scanned once when omitted
+
+        Returns:
+            Detected frameworks sorted by confidence
+        """
+        root = os.path.realpath(project_path)
+        remembered = self._recall(root)
+        if remembered is not None:
+            self.project_languages.update(remembered.languages)
+            # Callers may change the results; the memo keeps its own copies
+            frameworks = [_copy_framework(info) for info in remembered.frameworks]
+            self.detected_frameworks = frameworks
+            return list(frameworks)
 
-    def detect_frameworks(self, project_path: str) -> List[FrameworkInfo]:
-        """Detect all frameworks in a project."""
         project_path_obj = Path(project_path)
         detected_frameworks = []
+        if self._owns_cache:
+            self.content_cache.clear()
+        if inventory is None:
+            inventory = self._scan_inventory(project_path)
 
         # Parse package files
         package_infos = self.package_parser.parse_all_package_files(
@@ -595,11 +739,14 @@ class FrameworkDetector:
             self.project_languages.add(package_info.language)
 
         # Detect frameworks from file patterns
-        file_frameworks = self._detect_from_files(project_path_obj)
+        markers = self._find_markers(inventory)
+        file_frameworks = self._detect_from_files(project_path_obj, inventory, markers)
         detected_frameworks.extend(file_frameworks)
 
         # Detect frameworks from directory structure
-        structure_frameworks = self._detect_from_structure(project_path_obj)
+        structure_frameworks = self._detect_from_structure(
+            project_path_obj, inventory, markers
+        )
         detected_frameworks.extend(structure_frameworks)
 
         # Remove duplicates and sort by confidence
@@ -607,7 +754,82 @@ class FrameworkDetector:
         unique_frameworks.sort(key=lambda x: x.confidence, reverse=True)
 
         self.detected_frameworks = unique_frameworks
-        return unique_frameworks
+        self._remember(root, inventory, package_infos, unique_frameworks)
+        return list(unique_frameworks)
+
+    @classmethod
+    def invalidate(cls, project_path: Optional[str] = None) -> None:
+        """
+        Forget remembered detections.
+
+        Detections are checked against the mtimes of the project's
+        directories and package files, which do not change when a source
+        file is edited in place; call this after such edits.
+
+        Args:
+            project_path: Project whose detection to forget; all are
+                forgotten when omitted
+        """
+        with cls._memo_lock:
+            if project_path is None:
+                cls._memo.clear()
+            else:
+                cls._memo.pop(os.path.realpath(project_path), None)
+
+    def _recall(self, root: str) -> Optional[_Detection]:
+        """
+        Return the remembered detection of a project if it is still valid.
+
+        Validating costs one stat per fingerprinted path: every directory of
+        the inventory plus the package files. That is far less than scanning
+        and reading the project again, but grows with its directory count.
+
+        Args:
+            root: Resolved project root
+
+        Returns:
+            The detection, or None if there is none or the project changed
+        """
+        with self._memo_lock:
+            detection = self._memo.get(root)
+        if detection is None or _stamps(detection.paths) != detection.stamps:
+            return None
+        with self._memo_lock:
+            if root in self._memo:
+                self._memo.move_to_end(root)
+        logger.debug(f"Reusing framework detection of {root}")
+        return detection
+
+    def _remember(
+        self,
+        root: str,
+        inventory: PathTable,
+        package_infos: List[PackageInfo],
+        frameworks: List[FrameworkInfo],
+    ) -> None:
+        """Remember a detection, fingerprinted by the directories scanned for it."""
+        # Entries added or removed anywhere in the scanned tree change the
+        # mtime of a directory, and editing a package file changes its own
+        below_root = os.path.join(root, "")
+        paths = {root}
+        paths.update(
+            directory
+            for directory in inventory.directory_paths()
+            if directory.startswith(below_root)
+        )
+        paths.update(package_info.file_path for package_info in package_infos)
+        ordered = tuple(sorted(paths))
+        detection = _Detection(
+            paths=ordered,
+            stamps=_stamps(ordered),
+            frameworks=tuple(_copy_framework(info) for info in frameworks),
+            languages=frozenset(info.language for info in package_infos),
+        )
+        with self._memo_lock:
+            self._memo[root] = detection
+            self._memo.move_to_end(root)
+            while len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
 
     def get_project_technology(self, project_path: str) -> ProjectTechnology:
         """Get complete technology stack analysis."""
@@ -646,68 +868,157 @@ class FrameworkDetector:
         self, package_info: PackageInfo
     ) -> List[FrameworkInfo]:
         """Detect frameworks from package dependencies."""
-        detected = []
-        all_deps = package_info.dependencies + package_info.dev_dependencies
+        # The first dependency indicating each framework, one lookup per name
+        first_deps: Dict[str, DependencyInfo] = {}
+        for dep in package_info.dependencies + package_info.dev_dependencies:
+            for framework_key in self.DEPENDENCY_INDEX.lookup(dep.name):
+                first_deps.setdefault(framework_key, dep)
 
-        for framework_key, framework_def in self.FRAMEWORK_DEFINITIONS.items():
-            framework_deps = framework_def.get("dependencies", [])
-            if not framework_deps:
+        detected = []
+        for framework_key in self.DEPENDENCY_INDEX.keys:
+            if framework_key not in first_deps:
                 continue
-
-            # Check if any framework dependency is present
-            for dep in all_deps:
-                if any(
-                    fw_dep.lower() in dep.name.lower()
-                    for fw_dep in cast(List[str], framework_deps)
-                ):
-                    framework_info = FrameworkInfo(
-                        name=str(framework_def["name"]),
-                        type=FrameworkType(framework_def["type"]),
-                        language=str(framework_def["language"]),
-                        version=dep.version,
-                        confidence=0.9,
-                        detection_method="dependency",
-                        metadata={
-                            "package_file": package_info.file_path,
-                            "dependency_name": dep.name,
-                            "is_dev_dependency": dep.is_dev,
-                        },
-                    )
-                    detected.append(framework_info)
-                    break
+            dep = first_deps[framework_key]
+            framework_def = self.FRAMEWORK_DEFINITIONS[framework_key]
+            framework_info = FrameworkInfo(
+                name=str(framework_def["name"]),
+                type=FrameworkType(framework_def["type"]),
+                language=str(framework_def["language"]),
+                version=dep.version,
+                confidence=0.9,
+                detection_method="dependency",
+                metadata={
+                    "package_file": package_info.file_path,
+                    "dependency_name": dep.name,
+                    "is_dev_dependency": dep.is_dev,
+                },
+            )
+            detected.append(framework_info)
 
         return detected
 
-    def _detect_from_files(self, project_path: Path) -> List[FrameworkInfo]:
-        """Detect frameworks from file patterns and specific files."""
-        detected = []
+    def _scan_inventory(self, project_path: str) -> PathTable:
+        """Scan a project for detection, or return an empty table if unreadable."""
+        try:
+            inventory, _, _ = self.file_scanner.scan_table(project_path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Cannot scan {project_path} for frameworks: {e}")
+            return PathTable()
+        return inventory
+
+    def _find_markers(self, inventory: PathTable) -> Set[str]:
+        """
+        Find which marker files and directories of the definitions exist.
+
+        Presence is read from the inventory, where a directory counts when it
+        holds scanned files. A marker the inventory lacks is only looked up on
+        disk, with one stat, when the scan stopped at max_files or the marker
+        lies in a directory the scan pruned; a complete scan costs no
+        filesystem calls.
+
+        Args:
+            inventory: Files of the project
+
+        Returns:
+            Markers relative to the project root, files as "name" and
+            directories as "name/"
+        """
+        if not inventory.root:
+            return set()
+        names = {
+            item.rstrip("/")
+            for items in itertools.chain(
+                (
+                    cast(List[str], definition.get("files", []))
+                    for definition in self.FRAMEWORK_DEFINITIONS.values()
+                ),
+                self.STRUCTURE_PATTERNS.values(),
+            )
+            for item in items
+        }
+        paths = {os.path.join(inventory.root, *name.split("/")): name for name in names}
+
+        found = inventory.existing_files(paths)
+        markers = {paths[path] for path in found}
+        directories = inventory.directory_paths()
+        pruned = inventory.pruned_directories
+        for path, name in paths.items():
+            if path in found:
+                continue
+            if path in directories:
+                markers.add(name + "/")
+                continue
+            if inventory.complete and not self._in_pruned(inventory.root, path, pruned):
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            markers.add(name + "/" if stat.S_ISDIR(st.st_mode) else name)
+        return markers
+
+    @staticmethod
+    def _in_pruned(root: str, path: str, pruned: FrozenSet[str]) -> bool:
+        """Check whether path is, or lies below, one of the pruned directories."""
+        if not pruned:
+            return False
+        while path != root and len(path) > len(root):
+            if path in pruned:
+                return True
+            path = os.path.dirname(path)
+        return False
+
+    def _detect_from_files(
+        self,
+        project_path: Path,
+        inventory: Optional[PathTable] = None,
+        markers: Optional[Set[str]] = None,
+    ) -> List[FrameworkInfo]:
+        """
+        Detect frameworks from file patterns and specific files.
 
-        # Get all source files
-        source_files: List[Path] = []
-        for ext in [
-            ".js",
-            ".ts",
-            ".jsx",
-            ".tsx",
-            ".py",
-            ".java",
-            ".rs",
-            ".go",
-            ".php",
-            ".rb",
-            ".vue",
-            ".svelte",
-        ]:
-            source_files.extend(project_path.rglob(f"*{ext}"))
-
-        # Limit to reasonable number of files to scan
-        source_files = source_files[:100]
+        Args:
+            project_path: Path to project root directory
+            inventory: Files of the project; scanned when omitted
+            markers: Markers found by _find_markers; found when omitted
+
+        Returns:
+            Frameworks detected from files
+        """
+        detected = []
+        if inventory is None:
+            inventory = self._scan_inventory(str(project_path))
+
+        # Only authored code says which frameworks the project itself uses;
+        # taking files from each extension in turn keeps every language in
+        # the limited set
+        files_by_extension = inventory.files_by_extension(exclude=NOT_AUTHORED)
+        source_files = [
+            path
+            for paths in itertools.zip_longest(
+                *(files_by_extension.get(ext, []) for ext in self.SOURCE_EXTENSIONS)
+            )
+            for path in paths
+            if path is not None
+        ][: self.MAX_PATTERN_FILES]
+
+        # Match the patterns of every framework in one pass over the files
+        rules = ContentRules(
+            language_candidates={},
+            framework_matcher=self.FILE_PATTERN_MATCHER,
+            framework_scan_bytes=self.PATTERN_SCAN_BYTES,
+        )
+        matches = analyze_contents(
+            source_files, rules, file_scanner=self.file_scanner, jobs=self.jobs
+        )
+        if markers is None:
+            markers = self._find_markers(inventory)
 
         for framework_key, framework_def in self.FRAMEWORK_DEFINITIONS.items():
-            # Check for specific files
+            # Check for specific files, or directories of the same name
             framework_files = framework_def.get("files", [])
             for file_path in cast(List[str], framework_files):
-                if (project_path / file_path).exists():
+                if file_path in markers or file_path.rstrip("/") + "/" in markers:
                     framework_info = FrameworkInfo(
                         name=str(framework_def["name"]),
                         type=FrameworkType(framework_def["type"]),
@@ -720,68 +1031,53 @@ class FrameworkDetector:
                     break
 
             # Check file patterns
-            file_patterns = framework_def.get("file_patterns", [])
-            if file_patterns:
-                for source_file in source_files:
-                    try:
-                        with source_file.open(
-                            "r", encoding="utf-8", errors="ignore"
-                        ) as f:
-                            content = f.read(8192)  # Read first 8KB only
-
-                        for pattern in cast(List[str], file_patterns):
-                            if re.search(pattern, content, re.IGNORECASE):
-                                framework_info = FrameworkInfo(
-                                    name=str(framework_def["name"]),
-                                    type=FrameworkType(framework_def["type"]),
-                                    language=str(framework_def["language"]),
-                                    confidence=0.7,
-                                    detection_method="file_pattern",
-                                    metadata={
-                                        "detected_file": str(source_file),
-                                        "pattern": pattern,
-                                    },
-                                )
-                                detected.append(framework_info)
-                                break
-                    except (OSError, UnicodeDecodeError):
-                        continue
+            file_patterns = self.FILE_PATTERN_MATCHER.patterns.get(framework_key, ())
+            for path, match in matches.items():
+                for key, index in match.frameworks:
+                    if key == framework_key:
+                        framework_info = FrameworkInfo(
+                            name=str(framework_def["name"]),
+                            type=FrameworkType(framework_def["type"]),
+                            language=str(framework_def["language"]),
+                            confidence=0.7,
+                            detection_method="file_pattern",
+                            metadata={
+                                "detected_file": path,
+                                "pattern": file_patterns[index],
+                            },
+                        )
+                        detected.append(framework_info)
 
         return detected
 
-    def _detect_from_structure(self, project_path: Path) -> List[FrameworkInfo]:
-        """Detect frameworks from directory structure."""
-        detected = []
+    def _detect_from_structure(
+        self,
+        project_path: Path,
+        inventory: Optional[PathTable] = None,
+        markers: Optional[Set[str]] = None,
+    ) -> List[FrameworkInfo]:
+        """
+        Detect frameworks from directory structure.
 
-        # Common directory patterns
-        structure_patterns = {
-            "django": ["manage.py", "apps/", "templates/", "static/"],
-            "rails": ["app/", "config/", "db/", "Gemfile"],
-            "laravel": ["app/", "config/", "database/", "resources/", "artisan"],
-            "spring-boot": ["src/main/java/", "src/main/resources/", "pom.xml"],
-            "react": ["src/", "public/", "package.json"],
-            "angular": ["src/app/", "angular.json"],
-            "vue": ["src/", "public/", "vue.config.js"],
-            "flutter": ["lib/", "android/", "ios/", "pubspec.yaml"],
-            "react-native": ["android/", "ios/", "metro.config.js"],
-        }
+        Args:
+            project_path: Path to project root directory
+            inventory: Files of the project; scanned when omitted
+            markers: Markers found by _find_markers; found when omitted
 
-        for framework_key, required_items in structure_patterns.items():
-            matches = 0
+        Returns:
+            Frameworks whose structure patterns at least half match
+        """
+        detected = []
+        if markers is None:
+            if inventory is None:
+                inventory = self._scan_inventory(str(project_path))
+            markers = self._find_markers(inventory)
+
+        for framework_key, required_items in self.STRUCTURE_PATTERNS.items():
+            # Items ending in "/" are directories, the others files
+            matches = sum(1 for item in required_items if item in markers)
             total = len(required_items)
 
-            for item in required_items:
-                item_path = project_path / item
-                # Check if it's a directory (ends with /) or file
-                if item.endswith("/"):
-                    # Remove trailing slash for directory check
-                    dir_path = project_path / item.rstrip("/")
-                    if dir_path.is_dir():
-                        matches += 1
-                else:
-                    if item_path.is_file():
-                        matches += 1
-
             confidence = matches / total
             if confidence >= 0.5:  # At least 50% of structure matches
                 if framework_key in self.FRAMEWORK_DEFINITIONS:
@@ -1021,3 +1317,19 @@ class FrameworkDetector:
             "recommendations": recommendations,
             "compatibility_score": 1.0 - (len(compatibility_issues) * 0.2),
         }
+
+
+def _copy_framework(info: FrameworkInfo) -> FrameworkInfo:
+    """Return a copy of a detection result that shares no mutable state."""
+    return replace(info, metadata=dict(info.metadata))
+
+
+def _stamps(paths: Iterable[str]) -> Tuple[Optional[int], ...]:
+    """Return the mtimes of paths, None for those that cannot be read."""
+    stamps: List[Optional[int]] = []
+    for path in paths:
+        try:
+            stamps.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
@@ -0,0 +1,91 @@
+"""Detection of vendored and generated files, which are not authored code."""
+
+import os
+import re
+from typing import AbstractSet, Union
+
+# Directories holding third-party code checked into a project
+VENDORED_DIRS = frozenset(
+    {
+        "vendor",
+        "vendors",
+        "third_party",
+        "third-party",
+        "thirdparty",
+        "node_modules",
+        "bower_components",
+        "jspm_packages",
+        "pods",
+        "carthage",
+    }
+)
+
+# File names of generated sources, matched case-insensitively by the
+# FileClassifier
+GENERATED_PATTERNS = frozenset(
+    {
+        "*_pb2.py",
+        "*_pb2.pyi",
+        "*_pb2_grpc.py",
+        "*.pb.go",
+        "*.pb.gw.go",
+        "*.pb.cc",
+        "*.pb.h",
+        "*.pb.swift",
+        "*_pb.js",
+        "*_pb.d.ts",
+        "*_grpc_pb.js",
+        "*.g.dart",
+        "*.freezed.dart",
+        "*.designer.cs",
+        "*.generated.*",
+        "*_generated.go",
+        "zz_generated.*",
+    }
+)
+
+# Bytes of a file inspected for generator markers
+HEADER_BYTES = 512
+
+# Markers generators leave in the first lines of their output
+_HEADER_MARKERS = re.compile(
+    rb"Code generated .*DO NOT EDIT"
+    rb"|@generated\b"
+    rb"|<auto-generated"
+    rb"|Generated by the protocol buffer compiler"
+    rb"|This file (?:was|is) (?:automatically|auto-) ?generated"
+    rb"|AUTO-GENERATED FILE"
+)
+
+
+def is_vendored_dir(
+    relative_dir: str, vendored_dirs: AbstractSet[str] = VENDORED_DIRS
+) -> bool:
+    """
+    Check whether a directory lies at or below a vendored directory.
+
+    Args:
+        relative_dir: Path of the directory relative to the project root
+        vendored_dirs: Lower-case names of vendored directories
+
+    Returns:
+        True if the directory or any of its parents is a vendored directory
+    """
+    parts = relative_dir.replace(os.sep, "/").split("/")
+    return any(part.lower() in vendored_dirs for part in parts)
+
+
+def is_generated_header(head: Union[bytes, str]) -> bool:
+    """
+    Check the start of a file for markers left by code generators.
+
+    Args:
+        head: First bytes (or decoded characters) of the file; only the first
+            HEADER_BYTES are inspected
+
+    Returns:
+        True if the file declares itself generated
+    """
+    if isinstance(head, str):
+        head = head[:HEADER_BYTES].encode("utf-8", "ignore")
+    return _HEADER_MARKERS.search(head[:HEADER_BYTES]) is not None
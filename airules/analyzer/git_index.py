@@ -0,0 +1,183 @@
+"""Reader for the git index file, used to enumerate tracked files without a walk."""
+
+import os
+import struct
+from typing import List, NamedTuple, Optional, Tuple
+
+# Fixed-size part of an index entry: ctime, mtime, dev, ino, mode, uid, gid, size
+_ENTRY_HEADER = struct.Struct(">10I")
+
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE_MASK = 0x3000
+_FLAG_NAME_MASK = 0x0FFF
+_EXTENDED_SKIP_WORKTREE = 0x4000
+
+_MODE_TYPE_MASK = 0o170000
+_MODE_REGULAR = 0o100000
+
+# Extensions whose presence means the entry list alone is incomplete
+_UNSUPPORTED_EXTENSIONS = {b"link", b"sdir"}
+
+
+class GitIndexError(Exception):
+    """Raised when an index file cannot be parsed."""
+
+    pass
+
+
+class IndexEntry(NamedTuple):
+    """A tracked regular file recorded in the git index."""
+
+    path: str  # Slash-separated, relative to the work tree root
+    size: int
+    mtime_ns: int
+
+
+def find_repository(start: str) -> Optional[Tuple[str, str]]:
+    """
+    Locate the git work tree containing start.
+
+    Supports ``.git`` directories as well as ``.git`` files pointing
+    elsewhere (linked worktrees and submodules).
+
+    Args:
+        start: Absolute path of a directory inside the work tree
+
+    Returns:
+        Tuple of (work tree root, git directory), or None if start is not
+        inside a work tree
+    """
+    current = start
+    while True:
+        candidate = os.path.join(current, ".git")
+        if os.path.isdir(candidate):
+            return current, candidate
+        if os.path.isfile(candidate):
+            try:
+                with open(candidate, "r", encoding="utf-8") as f:
+                    content = f.read().strip()
+            except OSError:
+                return None
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = content[len("gitdir:") :].strip()
+            return current, os.path.normpath(os.path.join(current, git_dir))
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _hash_size(git_dir: str) -> int:
+    """Return the object id length used by the repository."""
+    try:
+        with open(os.path.join(git_dir, "config"), "r", encoding="utf-8") as f:
+            for line in f:
+                key, _, value = line.partition("=")
+                if key.strip().lower() == "objectformat":
+                    return 32 if value.strip().lower() == "sha256" else 20
+    except OSError:
+        pass
+    return 20
+
+
+def read_index(git_dir: str) -> List[IndexEntry]:
+    """
+    Parse the tracked regular files out of ``<git_dir>/index``.
+
+    Handles index versions 2, 3 and 4. Submodules, symlinks, conflict stages
+    other than the first and skip-worktree entries are left out.
+
+    Args:
+        git_dir: Path of the git directory
+
+    Returns:
+        Entries in index order (sorted by path)
+
+    Raises:
+        GitIndexError: If the index is missing, malformed or uses a layout
+            that needs more than the entry list (split or sparse index)
+    """
+    try:
+        with open(os.path.join(git_dir, "index"), "rb") as f:
+            data = f.read()
+    except OSError as e:
+        raise GitIndexError(f"Cannot read git index: {e}") from e
+
+    if len(data) < 12 or data[:4] != b"DIRC":
+        raise GitIndexError("Not a git index file")
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3, 4):
+        raise GitIndexError(f"Unsupported git index version {version}")
+
+    hash_size = _hash_size(git_dir)
+    entries: List[IndexEntry] = []
+    offset = 12
+    previous_name = b""
+    previous_path = b""
+    try:
+        for _ in range(count):
+            start = offset
+            fields = _ENTRY_HEADER.unpack_from(data, offset)
+            offset += _ENTRY_HEADER.size + hash_size
+            (flags,) = struct.unpack_from(">H", data, offset)
+            offset += 2
+            extended = 0
+            if flags & _FLAG_EXTENDED:
+                if version < 3:
+                    raise GitIndexError("Extended flags in a version 2 index")
+                (extended,) = struct.unpack_from(">H", data, offset)
+                offset += 2
+
+            if version == 4:
+                # Path is stored as a prefix length shared with the previous
+                # entry plus a NUL-terminated suffix, without padding
+                byte = data[offset]
+                offset += 1
+                strip = byte & 0x7F
+                while byte & 0x80:
+                    byte = data[offset]
+                    offset += 1
+                    strip = ((strip + 1) << 7) | (byte & 0x7F)
+                end = data.index(b"\0", offset)
+                keep = len(previous_name) - strip
+                if keep < 0:
+                    raise GitIndexError("Invalid path compression in git index")
+                name = previous_name[:keep] + data[offset:end]
+                offset = end + 1
+            else:
+                name_length = flags & _FLAG_NAME_MASK
+                if name_length == _FLAG_NAME_MASK:
+                    end = data.index(b"\0", offset)
+                else:
+                    end = offset + name_length
+                name = data[offset:end]
+                # Entries are NUL-padded to a multiple of eight bytes
+                offset = start + ((end - start + 8) & ~7)
+            previous_name = name
+
+            mode = fields[6]
+            if (
+                mode & _MODE_TYPE_MASK != _MODE_REGULAR
+                or extended & _EXTENDED_SKIP_WORKTREE
+                or (flags & _FLAG_STAGE_MASK and name == previous_path)
+            ):
+                continue
+            previous_path = name
+
+            mtime_ns = fields[2] * 1_000_000_000 + fields[3]
+            entries.append(IndexEntry(os.fsdecode(name), fields[9], mtime_ns))
+    except (struct.error, IndexError, ValueError) as e:
+        raise GitIndexError(f"Truncated or corrupt git index: {e}") from e
+
+    # Extensions follow the entries; stop before the trailing checksum
+    while offset + 8 <= len(data) - hash_size:
+        signature = data[offset : offset + 4]
+        (size,) = struct.unpack_from(">I", data, offset + 4)
+        if signature in _UNSUPPORTED_EXTENSIONS:
+            raise GitIndexError(
+                f"Unsupported git index extension {signature.decode('ascii')}"
+            )
+        offset += 8 + size
+
+    return entries
@@ -0,0 +1,240 @@
+"""Compiled .gitignore rules used to prune ignored directories while scanning."""
+
+import os
+import re
+from typing import Iterable, List, Optional, Pattern, Sequence, Tuple
+
+GITIGNORE_FILE = ".gitignore"
+
+
+def _translate_glob(pattern: str) -> str:
+    """
+    Translate a gitignore glob into a regular expression body.
+
+    Args:
+        pattern: Glob without the leading ``!`` or trailing ``/``
+
+    Returns:
+        Regular expression matching slash-separated relative paths
+    """
+    anchored = "/" in pattern
+    if pattern.startswith("/"):
+        pattern = pattern[1:]
+
+    parts: List[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char == "*":
+            j = i
+            while j < n and pattern[j] == "*":
+                j += 1
+            if j - i >= 2 and (i == 0 or pattern[i - 1] == "/"):
+                if j == n:
+                    # Trailing "**" matches everything inside
+                    parts.append(".*")
+                    i = j
+                    continue
+                if pattern[j] == "/":
+                    # "**/" matches zero or more directories
+                    parts.append("(?:.*/)?")
+                    i = j + 1
+                    continue
+            parts.append("[^/]*")
+            i = j
+            continue
+        if char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                parts.append(re.escape(char))
+            else:
+                members = pattern[i + 1 : j].replace("[", "\\[")
+                if members[0] in "!^":
+                    members = "^" + members[1:]
+                parts.append(f"[{members}]")
+                i = j
+        elif char == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 1
+        else:
+            parts.append(re.escape(char))
+        i += 1
+
+    body = "".join(parts)
+    # Patterns without a slash match a name at any depth below the base
+    return body if anchored else f"(?:.*/)?{body}"
+
+
+class GitIgnore:
+    """
+    Rules from a single .gitignore file, relative to the directory holding it.
+
+    Consecutive rules with the same polarity and directory-only flag are
+    compiled into one regular expression. Groups are evaluated from last to
+    first, so the last matching rule wins as in git.
+    """
+
+    def __init__(self, base: str, lines: Iterable[str]):
+        """
+        Compile gitignore lines.
+
+        Args:
+            base: Directory the patterns are relative to
+            lines: Raw lines of the .gitignore file
+        """
+        self.base = base
+        self._groups: List[Tuple[Pattern[str], bool, bool]] = []
+
+        current: List[str] = []
+        current_key: Optional[Tuple[bool, bool]] = None
+        for raw_line in lines:
+            rule = self._parse_line(raw_line)
+            if rule is None:
+                continue
+            body, negate, dir_only = rule
+            if (negate, dir_only) != current_key and current:
+                self._add_group(current, current_key)
+                current = []
+            current_key = (negate, dir_only)
+            current.append(body)
+        if current:
+            self._add_group(current, current_key)
+
+    @staticmethod
+    def _parse_line(line: str) -> Optional[Tuple[str, bool, bool]]:
+        """Parse one line into (regex body, negate, directory only)."""
+        line = line.rstrip("\r\n")
+        # Trailing spaces are ignored unless escaped with a backslash
+        while line.endswith(" ") and not line.endswith("\\ "):
+            line = line[:-1]
+        if not line or line.startswith("#"):
+            return None
+
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        if dir_only:
+            line = line[:-1]
+        if not line:
+            return None
+
+        return _translate_glob(line), negate, dir_only
+
+    def _add_group(
+        self, bodies: Sequence[str], key: Optional[Tuple[bool, bool]]
+    ) -> None:
+        """Compile a run of rules sharing polarity into one expression."""
+        negate, dir_only = key or (False, False)
+        regex = re.compile("(?:" + "|".join(bodies) + r")\Z")
+        self._groups.append((regex, negate, dir_only))
+
+    @classmethod
+    def from_file(cls, path: str, base: str) -> Optional["GitIgnore"]:
+        """
+        Load rules from a file.
+
+        Args:
+            path: Path of the ignore file
+            base: Directory the patterns are relative to
+
+        Returns:
+            Compiled rules, or None if the file is unreadable or has no rules
+        """
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                ignore = cls(base, f)
+        except OSError:
+            return None
+        return ignore if ignore._groups else None
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Match a path against these rules.
+
+        Args:
+            path: Path below the base directory
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if ignored, False if re-included by a negation, or None if
+            no rule matches
+        """
+        relative = path[len(self.base) + 1 :]
+        if os.sep != "/":
+            relative = relative.replace(os.sep, "/")
+
+        for regex, negate, dir_only in reversed(self._groups):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relative):
+                return not negate
+        return None
+
+
+def is_ignored(rules: Sequence[GitIgnore], path: str, is_dir: bool) -> bool:
+    """
+    Check a path against a chain of .gitignore rules.
+
+    Args:
+        rules: Rules ordered from the outermost directory to the innermost
+        path: Path to check
+        is_dir: Whether the path is a directory
+
+    Returns:
+        True if the deepest rule set with an opinion ignores the path
+    """
+    for ignore in reversed(rules):
+        result = ignore.match(path, is_dir)
+        if result is not None:
+            return result
+    return False
+
+
+def load_parent_rules(root: str) -> Tuple[GitIgnore, ...]:
+    """
+    Load ignore rules that apply to root from the enclosing git work tree.
+
+    Reads ``.git/info/exclude`` and every .gitignore between the work tree
+    root and root's parent. The .gitignore in root itself is picked up by
+    the walker when it lists root.
+
+    Args:
+        root: Directory about to be scanned
+
+    Returns:
+        Rules ordered from the work tree root downwards
+    """
+    ancestors: List[str] = []
+    current = root
+    while True:
+        if os.path.exists(os.path.join(current, ".git")):
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            # Not inside a git work tree
+            return ()
+        ancestors.append(parent)
+        current = parent
+
+    rules: List[GitIgnore] = []
+    exclude = GitIgnore.from_file(
+        os.path.join(current, ".git", "info", "exclude"), current
+    )
+    if exclude is not None:
+        rules.append(exclude)
+
+    for directory in reversed(ancestors):
+        ignore = GitIgnore.from_file(os.path.join(directory, GITIGNORE_FILE), directory)
+        if ignore is not None:
+            rules.append(ignore)
+    return tuple(rules)
@@ -0,0 +1,209 @@
+"""Incremental scans that re-read only the directories that changed."""
+
+import logging
+import os
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .core import CodebaseAnalyzer
+from .file_scanner import DirectoryListing, FileScanner
+from .gitignore import GITIGNORE_FILE, GitIgnore
+from .models import AnalysisResult, FileStats, ProjectStructure, ScanSummary
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalScan:
+    """
+    A project scan kept as one listing per directory.
+
+    After the initial scan, refresh() re-lists the directories reported as
+    changed, walks directories that appeared below them and drops those that
+    went away; every other directory keeps its listing. The project summary
+    is then rebuilt from the listings without touching the disk.
+
+    Unlike FileScanner.summarize, the scan is not cut short by max_files, and
+    duplicate counts cover every walk since scan(). Directories and files
+    stay claimed across refreshes, so a new link to a tracked directory is
+    recognised as a duplicate; dropped directories give up their claims.
+    """
+
+    def __init__(self, project_path: str, file_scanner: Optional[FileScanner] = None):
+        """
+        Initialize an incremental scan; nothing is read until scan().
+
+        Args:
+            project_path: Path to project root directory
+            file_scanner: Scanner whose settings and classification to use
+        """
+        self.project_path = project_path
+        self.file_scanner = file_scanner or FileScanner()
+        self.root = ""
+        self._root_rules: Tuple[GitIgnore, ...] = ()
+        self._listings: Dict[str, DirectoryListing] = {}
+
+    @property
+    def directories(self) -> List[str]:
+        """Paths of the directories currently tracked, in walk order."""
+        return list(self._listings)
+
+    def scan(self) -> None:
+        """
+        List the whole project, replacing any previous state.
+
+        Raises:
+            ValueError: If project_path is not a directory
+        """
+        self.root, self._root_rules = self.file_scanner.begin_listing(self.project_path)
+        self._listings = {}
+        self._walk(self.root, 0, self._root_rules)
+
+    def refresh(self, directories: Iterable[str]) -> Set[str]:
+        """
+        Bring the listings of changed directories up to date.
+
+        Args:
+            directories: Paths of directories whose entries may have changed;
+                paths that are not tracked are ignored, since a new directory
+                is found when its parent is refreshed
+
+        Returns:
+            Paths of the tracked directories that were re-listed or dropped
+        """
+        refreshed: Set[str] = set()
+        # Parents first, so a dropped subtree is not re-listed needlessly
+        for directory in sorted(set(directories), key=len):
+            old = self._listings.get(directory)
+            if old is None:
+                continue
+            refreshed.add(directory)
+            if not os.path.isdir(directory):
+                self._drop(directory)
+                continue
+
+            new = self.file_scanner.list_directory_records(
+                self.root, directory, old.depth, self._inherited_rules(directory), True
+            )
+            self._listings[directory] = new
+
+            old_names = {record.name for record in old.records}
+            new_names = {record.name for record in new.records}
+            if GITIGNORE_FILE in old_names or GITIGNORE_FILE in new_names:
+                # Ignore rules below may have changed; list the subtree again
+                for subdirectory in old.subdirectories:
+                    self._drop(subdirectory)
+                added = new.subdirectories
+            else:
+                current = set(new.subdirectories)
+                for subdirectory in old.subdirectories:
+                    if subdirectory not in current:
+                        self._drop(subdirectory)
+                previous = set(old.subdirectories)
+                added = [d for d in new.subdirectories if d not in previous]
+            for subdirectory in added:
+                self._walk(subdirectory, old.depth + 1, new.rules)
+        return refreshed
+
+    def summarize(self) -> Tuple[ScanSummary, ProjectStructure, FileStats]:
+        """
+        Aggregate the current listings.
+
+        Returns:
+            Tuple of (scan_summary, project_structure, file_stats), as from
+            FileScanner.summarize
+        """
+        return self.file_scanner.summarize_listings(self.root, self._listings.values())
+
+    def _walk(self, directory: str, depth: int, rules: Tuple[GitIgnore, ...]) -> None:
+        """List directory and everything below it, breadth-first."""
+        queue = deque([(directory, depth, rules)])
+        while queue:
+            directory, depth, rules = queue.popleft()
+            listing = self.file_scanner.list_directory_records(
+                self.root, directory, depth, rules
+            )
+            self._listings[directory] = listing
+            for subdirectory in listing.subdirectories:
+                queue.append((subdirectory, depth + 1, listing.rules))
+
+    def _drop(self, directory: str) -> None:
+        """Forget directory and everything below it, releasing their claims."""
+        prefix = os.path.join(directory, "")
+        dropped = [
+            path
+            for path in self._listings
+            if path == directory or path.startswith(prefix)
+        ]
+        for path in dropped:
+            del self._listings[path]
+        self.file_scanner.release_directories(dropped)
+
+    def _inherited_rules(self, directory: str) -> Tuple[GitIgnore, ...]:
+        """Return the ignore rules a tracked directory inherits."""
+        if directory == self.root:
+            return self._root_rules
+        return self._listings[os.path.dirname(directory)].rules
+
+
+class IncrementalAnalyzer:
+    """
+    Keeps an analysis up to date as files change.
+
+    Rescans only the changed directories and reruns detection on the updated
+    summary, instead of calling CodebaseAnalyzer.analyze from scratch.
+    """
+
+    def __init__(self, analyzer: CodebaseAnalyzer, project_path: str):
+        """
+        Initialize the incremental analyzer.
+
+        Args:
+            analyzer: Analyzer whose scanner and detectors to use
+            project_path: Path to project root directory
+        """
+        self.analyzer = analyzer
+        self.scan = IncrementalScan(project_path, analyzer.file_scanner)
+
+    @property
+    def directories(self) -> List[str]:
+        """Paths of the directories to watch for changes."""
+        return self.scan.directories
+
+    def analyze(self) -> AnalysisResult:
+        """
+        Scan the whole project and analyze it.
+
+        Returns:
+            AnalysisResult for the project
+
+        Raises:
+            ValueError: If the project path is not a directory
+        """
+        self.analyzer.file_scanner.content_cache.clear()
+        self.scan.scan()
+        return self._analyze()
+
+    def update(self, directories: Iterable[str]) -> Optional[AnalysisResult]:
+        """
+        Re-analyze after changes in the given directories.
+
+        Args:
+            directories: Paths of directories whose entries changed
+
+        Returns:
+            Updated AnalysisResult, or None if none of the directories is
+            part of the scan
+        """
+        # Changed files may be cached from the previous analysis
+        self.analyzer.file_scanner.content_cache.clear()
+        refreshed = self.scan.refresh(directories)
+        if not refreshed:
+            return None
+        logger.debug(f"Re-listed {len(refreshed)} changed directories")
+        return self._analyze()
+
+    def _analyze(self) -> AnalysisResult:
+        summary, structure, file_stats = self.scan.summarize()
+        return self.analyzer.analyze_summary(
+            self.scan.root, summary, structure, file_stats
+        )
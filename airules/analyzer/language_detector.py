@@ -5,8 +5,19 @@ from __future__ import annotations
 import re
 from collections import Counter, defaultdict
 from pathlib import Path
-from typing import DefaultDict, Dict, List, Optional
-
+from typing import (
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
+
+from .content_analysis import ContentRules, analyze_contents
+from .directory_trie import DirectoryTrie
 from .models import LanguageInfo
 
 
@@ -160,12 +171,59 @@ class LanguageDetector:
             r"^\s*class\s+\w+\s*{",
             r"std::\w+",
             r"cout\s*<<",
+            r"^\s*namespace\s+\w+",
+            r"^\s*template\s*<",
+            r"^\s*(?:public|private|protected)\s*:",
         ],
         "C": [
             r"#include\s*<[\w\/\.]+\.h>",
             r"^\s*int\s+main\s*\(",
             r"printf\s*\(",
             r"malloc\s*\(",
+            r"^\s*typedef\s+struct\b",
+        ],
+        "Objective-C": [
+            r"^\s*#import\s*[<\"]",
+            r"^\s*@(?:interface|implementation|protocol|property|end)\b",
+            r"\bNS[A-Z]\w+",
+            r"@\"",
+        ],
+        "MATLAB": [
+            r"^\s*function\s+(?:\[[^\]]*\]\s*=\s*|\w+\s*=\s*)?\w+\s*\(",
+            r"^\s*end\s*;?\s*$",
+            r"^\s*%",
+            r"\b(?:disp|fprintf|zeros|ones|plot)\s*\(",
+        ],
+        "Perl": [
+            r"^\s*use\s+(?:strict|warnings)\b",
+            r"^\s*my\s+[\$@%]\w+",
+            r"^\s*sub\s+\w+\s*\{",
+            r"=~\s*[ms]?/",
+            r"^\s*package\s+[\w:]+;",
+        ],
+        "Prolog": [
+            r"^\s*:-\s*\w+",
+            r"^\s*[a-z]\w*(?:\([^)]*\))?\s*:-",
+            r"^\s*[a-z]\w*\([^)]*\)\s*\.\s*$",
+        ],
+        "Verilog": [
+            r"^\s*module\s+\w+\s*[(#;]",
+            r"^\s*endmodule\b",
+            r"^\s*(?:input|output|inout)\s+(?:wire|reg|\[)",
+            r"^\s*always\s*@",
+            r"^\s*assign\s+\w+",
+        ],
+        "V": [
+            r"^\s*module\s+\w+\s*$",
+            r"^\s*(?:pub\s+)?fn\s+(?:\([^)]*\)\s*)?\w+\s*\(",
+            r"^\s*import\s+[\w.]+\s*$",
+            r"\w+\s*:=",
+            r"^\s*(?:pub\s+)?struct\s+\w+\s*\{",
+        ],
+        "Coq": [
+            r"^\s*(?:Theorem|Lemma|Definition|Fixpoint|Inductive)\s+\w+",
+            r"^\s*(?:Proof|Qed)\.",
+            r"^\s*Require\s+(?:Import|Export)\b",
         ],
         "Go": [
             r"^\s*package\s+\w+",
@@ -204,6 +262,22 @@ class LanguageDetector:
         ],
     }
 
+    # Extensions shared by several languages, mapped to the candidates that
+    # content analysis chooses between; the first is EXTENSION_MAP's default
+    AMBIGUOUS_EXTENSIONS = {
+        ".h": ("C", "C++", "Objective-C"),
+        ".m": ("Objective-C", "MATLAB"),
+        ".pl": ("Perl", "Prolog"),
+        ".v": ("V", "Verilog", "Coq"),
+    }
+
+    # Lines of each sample file read for content analysis
+    CONTENT_SAMPLE_LINES = 100
+
+    # What a language's confidence is the share of: its files, or like
+    # GitHub linguist, its bytes
+    WEIGHTS = ("files", "bytes")
+
     # Languages that commonly appear together
     RELATED_LANGUAGES = {
         "JavaScript": ["TypeScript", "HTML", "CSS"],
@@ -225,9 +299,19 @@ class LanguageDetector:
             self._compiled_patterns[lang] = [
                 re.compile(pattern, re.MULTILINE) for pattern in patterns
             ]
+        # Single-pass classifiers keyed by candidate languages
+        self._combined_patterns: Dict[
+            Tuple[str, ...], Tuple[Optional[Pattern[str]], Dict[str, str]]
+        ] = {}
 
     def detect_languages(
-        self, files_by_extension: Dict[str, List[str]], file_scanner=None
+        self,
+        files_by_extension: Dict[str, List[str]],
+        file_scanner=None,
+        extension_counts: Optional[Dict[str, int]] = None,
+        extension_bytes: Optional[Dict[str, int]] = None,
+        weight_by: str = "files",
+        jobs: int = 1,
     ) -> List[LanguageInfo]:
         """
         Detect programming languages from file extensions and content.
@@ -235,27 +319,54 @@ class LanguageDetector:
         Args:
             files_by_extension: Dictionary mapping extensions to file lists
             file_scanner: Optional FileScanner instance for content analysis
+            extension_counts: File counts per extension, for when
+                files_by_extension only holds sample paths (see
+                FileScanner.summarize)
+            extension_bytes: Total file size per extension, which sets each
+                language's byte_count and byte_share
+            weight_by: One of WEIGHTS; "bytes" bases confidence on the byte
+                share, falling back to the file share without extension_bytes
+            jobs: Worker processes for content analysis; see analyze_contents
 
         Returns:
             List of LanguageInfo objects sorted by confidence
+
+        Raises:
+            ValueError: If weight_by is not one of WEIGHTS
         """
+        if weight_by not in self.WEIGHTS:
+            raise ValueError(
+                f"weight_by must be one of {', '.join(self.WEIGHTS)}, got {weight_by!r}"
+            )
         if not files_by_extension:
             return []
 
         # Count files by language based on extensions
         language_counts: DefaultDict[str, int] = defaultdict(int)
+        language_bytes: DefaultDict[str, int] = defaultdict(int)
         language_extensions = defaultdict(set)
         language_files = defaultdict(list)
+        # Files per lower-cased extension, samples or not
+        file_counts: DefaultDict[str, int] = defaultdict(int)
 
         total_files = 0
+        total_bytes = 0
         for ext, files in files_by_extension.items():
             if ext.lower() in self.EXTENSION_MAP:
                 lang = self.EXTENSION_MAP[ext.lower()]
-                file_count = len(files)
+                if extension_counts is not None:
+                    file_count = extension_counts.get(ext, len(files))
+                else:
+                    file_count = len(files)
                 language_counts[lang] += file_count
+                file_counts[ext.lower()] += file_count
                 language_extensions[lang].add(ext)
                 language_files[lang].extend(files[:5])  # Keep sample files
                 total_files += file_count
+                if extension_bytes:
+                    byte_count = extension_bytes.get(ext, 0)
+                    language_bytes[lang] += byte_count
+                    total_bytes += byte_count
 
         if total_files == 0:
             return []
@@ -263,13 +374,33 @@ class LanguageDetector:
         # Perform content-based analysis for ambiguous cases
         if file_scanner:
             self._refine_with_content_analysis(
-                language_counts, language_files, file_scanner
+                language_counts,
+                language_files,
+                file_scanner,
+                extension_counts=file_counts,
+                language_bytes=language_bytes,
+                extension_bytes=extension_bytes,
+                jobs=jobs,
             )
 
         # Create LanguageInfo objects
         languages = []
         for lang, count in language_counts.items():
-            confidence = min(count / total_files, 1.0)
+            if count <= 0:
+                # Every file was reassigned by content analysis
+                continue
+            if not language_extensions[lang]:
+                # Language only found by content analysis
+                language_extensions[lang] = {
+                    Path(file_path).suffix.lower() for file_path in language_files[lang]
+                }
+            file_share = min(count / total_files, 1.0)
+            byte_count = max(language_bytes.get(lang, 0), 0)
+            byte_share = min(byte_count / total_bytes, 1.0) if total_bytes else 0.0
+            if weight_by == "bytes" and total_bytes:
+                confidence = byte_share
+            else:
+                confidence = file_share
 
             # Boost confidence for certain patterns
             if lang in ["Python", "JavaScript", "TypeScript"] and confidence > 0.1:
@@ -291,6 +422,9 @@ class LanguageDetector:
                 extensions=language_extensions[lang],
                 primary_extension=primary_ext,
                 sample_files=language_files[lang][:3],  # Keep top 3 samples
+                byte_count=byte_count,
+                file_share=file_share,
+                byte_share=byte_share,
             )
             languages.append(lang_info)
 
@@ -299,45 +433,128 @@ class LanguageDetector:
 
         return languages
 
+    def classify_files(
+        self,
+        file_paths: Iterable[str],
+        candidate_languages: Sequence[str],
+        file_scanner,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Classify many files among the same candidate languages in one call.
+
+        The candidates' patterns are compiled once into a single alternation,
+        and each file's sample is scanned by it once.
+
+        Args:
+            file_paths: Paths of the files to classify
+            candidate_languages: Possible languages, earlier ones winning ties
+            file_scanner: FileScanner used to read content samples
+
+        Returns:
+            Dictionary mapping each path to its detected language, or None
+            if it could not be read or matched no pattern
+        """
+        pattern, languages = self._combined_pattern(tuple(candidate_languages))
+        result: Dict[str, Optional[str]] = {}
+        for file_path in file_paths:
+            content = file_scanner.get_file_content_sample(
+                file_path, max_lines=self.CONTENT_SAMPLE_LINES
+            )
+            result[file_path] = (
+                self._classify(pattern, languages, content) if content else None
+            )
+        return result
+
     def _refine_with_content_analysis(
         self,
         language_counts: Dict[str, int],
         language_files: Dict[str, List[str]],
         file_scanner,
+        extension_counts: Optional[Dict[str, int]] = None,
+        language_bytes: Optional[Dict[str, int]] = None,
+        extension_bytes: Optional[Dict[str, int]] = None,
+        jobs: int = 1,
     ) -> None:
-        """Refine language detection using content analysis."""
+        """
+        Reassign files with ambiguous extensions using content analysis.
 
-        # Handle ambiguous cases
-        ambiguous_files = []
+        The sample files of each extension in AMBIGUOUS_EXTENSIONS are
+        classified in one batch, and the extension's files are split among
+        the candidate languages in proportion to the samples' results.
 
-        # Check for .m files (MATLAB vs Objective-C)
-        if "MATLAB" in language_counts and "Objective-C" in language_counts:
-            m_files = language_files.get("MATLAB", []) + language_files.get(
-                "Objective-C", []
-            )
-            ambiguous_files.extend([(f, ["MATLAB", "Objective-C"]) for f in m_files])
-
-        # Analyze content for ambiguous files
-        for file_path, candidate_langs in ambiguous_files:
-            content = file_scanner.get_file_content_sample(file_path, max_lines=100)
-            if content:
-                detected_lang = self._detect_language_from_content(
-                    content, candidate_langs
-                )
-                if detected_lang:
-                    # Adjust counts
-                    for lang in candidate_langs:
-                        if lang != detected_lang and lang in language_counts:
-                            language_counts[lang] -= 1
-                            if file_path in language_files.get(lang, []):
-                                language_files[lang].remove(file_path)
-
-                    # Boost the detected language
-                    if detected_lang not in language_counts:
-                        language_counts[detected_lang] = 0
-                        language_files[detected_lang] = []
-                    language_counts[detected_lang] += 1
-                    language_files[detected_lang].append(file_path)
+        Args:
+            language_counts: File counts per language, updated in place
+            language_files: Sample files per language, updated in place
+            file_scanner: FileScanner used to read content samples
+            extension_counts: File counts per extension; each sample file
+                stands for one file when omitted
+            language_bytes: Total size per language, updated in place with
+                each extension's bytes split like its files
+            extension_bytes: Total file size per extension
+            jobs: Worker processes classifying the samples
+        """
+        samples: Dict[str, List[str]] = {}
+        for files in language_files.values():
+            for file_path in files:
+                ext = Path(file_path).suffix.lower()
+                if ext in self.AMBIGUOUS_EXTENSIONS:
+                    ext_samples = samples.setdefault(ext, [])
+                    if file_path not in ext_samples:
+                        ext_samples.append(file_path)
+
+        rules = ContentRules(
+            language_candidates={
+                ext: self.AMBIGUOUS_EXTENSIONS[ext] for ext in samples
+            },
+        )
+        matches = analyze_contents(
+            (path for ext_samples in samples.values() for path in ext_samples),
+            rules,
+            language_detector=self,
+            file_scanner=file_scanner,
+            jobs=jobs,
+        )
+        detected = {path: match.language for path, match in matches.items()}
+
+        for ext, ext_samples in samples.items():
+            candidates = self.AMBIGUOUS_EXTENSIONS[ext]
+            default_lang = self.EXTENSION_MAP.get(ext, candidates[0])
+            tally = Counter(detected[path] or default_lang for path in ext_samples)
+            if tally[default_lang] == len(ext_samples):
+                continue
+
+            total = len(ext_samples)
+            if extension_counts:
+                total = extension_counts.get(ext, total)
+            ext_bytes = 0
+            if language_bytes is not None and extension_bytes:
+                ext_bytes = extension_bytes.get(ext, 0)
+            moved = 0
+            moved_bytes = 0
+            for lang, count in tally.items():
+                if lang == default_lang:
+                    continue
+                share = max(1, round(total * count / len(ext_samples)))
+                share = min(share, total - moved)
+                moved += share
+                language_counts[lang] = language_counts.get(lang, 0) + share
+                if language_bytes is not None and ext_bytes and total:
+                    byte_share = round(ext_bytes * share / total)
+                    moved_bytes += byte_share
+                    language_bytes[lang] = language_bytes.get(lang, 0) + byte_share
+            if default_lang in language_counts:
+                language_counts[default_lang] -= moved
+                if language_bytes is not None and moved_bytes:
+                    language_bytes[default_lang] -= moved_bytes
+
+            for file_path in ext_samples:
+                sample_lang = detected[file_path]
+                if sample_lang is None or sample_lang == default_lang:
+                    continue
+                for files in language_files.values():
+                    if file_path in files:
+                        files.remove(file_path)
+                language_files.setdefault(sample_lang, []).append(file_path)
 
     def _detect_language_from_content(
         self, content: str, candidate_languages: List[str]
@@ -352,28 +569,62 @@ class LanguageDetector:
         Returns:
             Detected language name or None
         """
-        if not content.strip():
-            return None
+        pattern, languages = self._combined_pattern(tuple(candidate_languages))
+        return self._classify(pattern, languages, content)
 
-        scores = {}
-
-        for lang in candidate_languages:
-            if lang in self._compiled_patterns:
-                score = 0
-                patterns = self._compiled_patterns[lang]
+    def _combined_pattern(
+        self, candidate_languages: Tuple[str, ...]
+    ) -> Tuple[Optional[Pattern[str]], Dict[str, str]]:
+        """
+        Compile the candidates' patterns into one alternation.
 
-                for pattern in patterns:
-                    matches = pattern.findall(content)
-                    score += len(matches)
+        Each language becomes a named group, so a single finditer pass
+        attributes every match to its language.
 
-                scores[lang] = score
+        Args:
+            candidate_languages: Possible languages, in priority order
 
-        # Return language with highest score
-        if scores:
-            best_lang = max(scores.items(), key=lambda x: x[1])
-            return best_lang[0] if best_lang[1] > 0 else None
+        Returns:
+            Tuple of (compiled pattern or None if no candidate has patterns,
+            mapping of group name to language)
+        """
+        cached = self._combined_patterns.get(candidate_languages)
+        if cached is not None:
+            return cached
+
+        groups: Dict[str, str] = {}
+        alternatives = []
+        for index, lang in enumerate(candidate_languages):
+            patterns = self.CONTENT_PATTERNS.get(lang)
+            if not patterns or lang in groups.values():
+                continue
+            name = f"lang{index}"
+            groups[name] = lang
+            body = "|".join(f"(?:{pattern})" for pattern in patterns)
+            alternatives.append(f"(?P<{name}>{body})")
+
+        pattern = re.compile("|".join(alternatives), re.MULTILINE) if groups else None
+        cached = self._combined_patterns[candidate_languages] = (pattern, groups)
+        return cached
+
+    def _classify(
+        self,
+        pattern: Optional[Pattern[str]],
+        languages: Dict[str, str],
+        content: str,
+    ) -> Optional[str]:
+        """Score content with a combined pattern and return the best language."""
+        if pattern is None or not content.strip():
+            return None
 
-        return None
+        scores = Counter(match.lastgroup for match in pattern.finditer(content))
+        best_lang = None
+        best_score = 0
+        # Group names are in candidate order, so earlier candidates win ties
+        for name, lang in languages.items():
+            if scores[name] > best_score:
+                best_lang, best_score = lang, scores[name]
+        return best_lang
 
     def get_primary_language(
         self, languages: List[LanguageInfo]
@@ -426,7 +677,11 @@ class LanguageDetector:
         return None
 
     def detect_frameworks_and_libraries(
-        self, files_by_extension: Dict[str, List[str]], file_scanner=None
+        self,
+        files_by_extension: Dict[str, List[str]],
+        file_scanner=None,
+        file_names: Optional[Iterable[str]] = None,
+        directory_names: Optional[Iterable[str]] = None,
     ) -> List[str]:
         """
         Detect frameworks and libraries based on file patterns and content.
@@ -434,6 +689,11 @@ class LanguageDetector:
         Args:
             files_by_extension: Dictionary mapping extensions to file lists
             file_scanner: Optional FileScanner for content analysis
+            file_names: Lower-case names of all files; derived from
+                files_by_extension when omitted
+            directory_names: Lower-case names of all directories holding
+                files and their parents; derived from files_by_extension when
+                omitted
 
         Returns:
             List of detected framework/library names
@@ -442,10 +702,12 @@ class LanguageDetector:
 
         # File-based detection
         all_files = []
-        for file_list in files_by_extension.values():
-            all_files.extend(file_list)
+        if file_names is None or directory_names is None:
+            for file_list in files_by_extension.values():
+                all_files.extend(file_list)
 
-        file_names = [Path(f).name.lower() for f in all_files]
+        if file_names is None:
+            file_names = [Path(f).name.lower() for f in all_files]
 
         # Common framework indicators
         framework_indicators = {
@@ -479,11 +741,11 @@ class LanguageDetector:
                 frameworks.update(framework_indicators[file_name])
 
         # Directory-based detection
-        all_paths = [Path(f) for f in all_files]
-        dir_names = set()
-        for path in all_paths:
-            for parent in path.parents:
-                dir_names.add(parent.name.lower())
+        if directory_names is None:
+            # Each directory is visited once rather than once per file in it
+            dir_names = DirectoryTrie.from_files(all_files).directory_names()
+        else:
+            dir_names = set(directory_names)
 
         directory_indicators = {
             "node_modules": ["Node.js"],
@@ -1,7 +1,8 @@
 """Data models for codebase analysis results."""
 
+import os
 from dataclasses import dataclass, field
-from typing import List, Optional, Set
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 
 
 @dataclass
@@ -14,6 +15,11 @@ class LanguageInfo:
     extensions: Set[str]
     primary_extension: str
     sample_files: List[str]  # Sample file paths for this language
+    # 95% interval of the language's share of files, set by sampled analysis
+    confidence_interval: Optional[Tuple[float, float]] = None
+    byte_count: int = 0  # Total size of the language's files
+    file_share: float = 0.0  # Fraction of source files, 0.0 to 1.0
+    byte_share: float = 0.0  # Fraction of source bytes, 0.0 to 1.0
 
 
 @dataclass
@@ -39,9 +45,72 @@ class FileStats:
     config_files: int = 0
     documentation_files: int = 0
     other_files: int = 0
+    vendored_files: int = 0  # Below vendored directories, also counted above
+    generated_files: int = 0  # Named like generated sources, also counted above
+    # Skipped because already found under another path (links, link cycles)
+    duplicate_files: int = 0
+    duplicate_directories: int = 0
     largest_files: List[str] = field(default_factory=list)  # Paths to largest files
 
 
+class FileRecord(NamedTuple):
+    """A scanned file with its category flags (see file_classifier)."""
+
+    directory: str
+    name: str
+    # Lower-cased final suffix; for extensionless scripts, the extension of
+    # the language named by their shebang or modeline; empty if neither
+    extension: str
+    flags: int
+    # Bytes, as reported by the listing that found the file; -1 if unknown
+    size: int = -1
+
+    @property
+    def path(self) -> str:
+        """Full path of the file."""
+        return os.path.join(self.directory, self.name)
+
+
+@dataclass
+class ScanSummary:
+    """Aggregate view of a scan that keeps counters instead of path lists."""
+
+    extension_counts: Dict[str, int] = field(default_factory=dict)
+    extension_bytes: Dict[str, int] = field(default_factory=dict)  # Summed sizes
+    extension_samples: Dict[str, List[str]] = field(
+        default_factory=dict
+    )  # First few paths per extension
+    # Distinct lower-case names of files with an extension, and of their
+    # parent directories at any level
+    file_names: Set[str] = field(default_factory=set)
+    directory_names: Set[str] = field(default_factory=set)
+
+
+class Estimate(NamedTuple):
+    """A total estimated from a sample, with its 95% confidence interval."""
+
+    value: float
+    low: float
+    high: float
+
+
+@dataclass
+class SamplingInfo:
+    """How a time-budgeted analysis covered the project."""
+
+    completeness: float  # Directories listed / estimated directories, 0.0 to 1.0
+    directories_sampled: int = 0
+    directories_found: int = 0
+    files_sampled: int = 0
+    elapsed: float = 0.0  # Seconds spent scanning
+    file_estimates: Dict[str, Estimate] = field(
+        default_factory=dict
+    )  # Keyed by FileStats field name, e.g. "code_files"
+    group_estimates: Dict[str, Estimate] = field(
+        default_factory=dict
+    )  # File counts per extension group, e.g. per language
+
+
 @dataclass
 class AnalysisResult:
     """Complete result of codebase analysis."""
@@ -55,6 +124,8 @@ class AnalysisResult:
     error_messages: List[str] = field(
         default_factory=list
     )  # Any errors encountered during analysis
+    completeness: float = 1.0  # Below 1.0 when a time budget ran out
+    sampling: Optional[SamplingInfo] = None  # Set by time-budgeted analysis
 
     @property
     def is_empty_project(self) -> bool:
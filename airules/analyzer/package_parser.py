@@ -192,8 +192,9 @@ class PackageParser:
         for name, dep_info in data.get("packages", {}).items():
             if name == "":  # Root package
                 continue
-            # Remove leading node_modules/ if present
-            clean_name = name.replace("node_modules/", "")
+            # Keep the package name of nested installs like
+            # node_modules/a/node_modules/b
+            clean_name = name.rsplit("node_modules/", 1)[-1]
             version = dep_info.get("version")
             is_dev = dep_info.get("dev", False)
 
@@ -0,0 +1,346 @@
+"""Column-oriented storage for the files found by a scan."""
+
+import heapq
+import os
+import sys
+from array import array
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple
+
+# Names are packed with the same codec os.fsencode uses, so any name round-trips
+_ENCODING = sys.getfilesystemencoding()
+_ERRORS = sys.getfilesystemencodeerrors()
+
+
+class PathTable:
+    """
+    Compact table of scanned files.
+
+    Directory paths and extensions are interned once and referenced by
+    integer ids. Each file costs a directory id, an extension id, a flags
+    byte, its size and its UTF-8 name packed into a shared buffer, instead of
+    a full path string per file. Path lists are only built when a view is requested.
+
+    A table filled by a scan also records whether the scan was cut short by
+    max_files and which directories it left out, so callers can tell when a
+    path missing from the table may still exist.
+    """
+
+    __slots__ = (
+        "root",
+        "complete",
+        "pruned_directories",
+        "directories",
+        "extensions",
+        "_directory_ids",
+        "_extension_ids",
+        "_directory_column",
+        "_extension_column",
+        "_flags_column",
+        "_size_column",
+        "_names",
+        "_name_ends",
+    )
+
+    def __init__(self, root: str = "") -> None:
+        """
+        Initialize an empty table.
+
+        Args:
+            root: Directory the files were scanned from, if any
+        """
+        self.root = root
+        # Whether every file outside pruned_directories is in the table
+        self.complete = True
+        # Directories the scan did not descend into, with everything below
+        self.pruned_directories: FrozenSet[str] = frozenset()
+        self.directories: List[str] = []
+        self.extensions: List[str] = [""]  # Id 0 means no extension
+        self._directory_ids: Dict[str, int] = {}
+        self._extension_ids: Dict[str, int] = {"": 0}
+        # Narrow columns are widened if a value ever overflows them
+        self._directory_column = array("I")
+        self._extension_column = array("H")
+        self._flags_column = array("B")
+        self._size_column = array("i")
+        self._names = bytearray()
+        self._name_ends = array("I")
+
+    def __len__(self) -> int:
+        """Return the number of files."""
+        return len(self._flags_column)
+
+    def add(
+        self, directory: str, name: str, extension: str, flags: int, size: int = 0
+    ) -> None:
+        """
+        Append a file.
+
+        Args:
+            directory: Directory holding the file
+            name: File name
+            extension: Lower-cased extension, empty if none
+            flags: Category flags from the file classifier
+            size: Size of the file in bytes, negative if unknown
+        """
+        directory_id = self._directory_ids.get(directory)
+        if directory_id is None:
+            directory_id = self._directory_ids[directory] = len(self.directories)
+            self.directories.append(directory)
+        extension_id = self._extension_ids.get(extension)
+        if extension_id is None:
+            extension_id = self._extension_ids[extension] = len(self.extensions)
+            self.extensions.append(extension)
+
+        self._directory_column.append(directory_id)
+        try:
+            self._extension_column.append(extension_id)
+        except OverflowError:
+            self._extension_column = array("I", self._extension_column)
+            self._extension_column.append(extension_id)
+        self._flags_column.append(flags)
+        try:
+            self._size_column.append(size)
+        except OverflowError:
+            # Files of 2 GiB and over
+            self._size_column = array("q", self._size_column)
+            self._size_column.append(size)
+        self._names += name.encode(_ENCODING, _ERRORS)
+        try:
+            self._name_ends.append(len(self._names))
+        except OverflowError:
+            self._name_ends = array("Q", self._name_ends)
+            self._name_ends.append(len(self._names))
+
+    def name(self, index: int) -> str:
+        """Return the name of the file at index."""
+        start = self._name_ends[index - 1] if index else 0
+        return self._names[start : self._name_ends[index]].decode(_ENCODING, _ERRORS)
+
+    def path(self, index: int) -> str:
+        """Return the full path of the file at index."""
+        directory = self.directories[self._directory_column[index]]
+        return os.path.join(directory, self.name(index))
+
+    def flags(self, index: int) -> int:
+        """Return the category flags of the file at index."""
+        return self._flags_column[index]
+
+    def extension(self, index: int) -> str:
+        """Return the extension of the file at index."""
+        return self.extensions[self._extension_column[index]]
+
+    def size(self, index: int) -> int:
+        """Return the size in bytes of the file at index."""
+        return self._size_column[index]
+
+    def iter_paths(self, include: int = 0, exclude: int = 0) -> Iterator[str]:
+        """
+        Iterate over file paths in scan order, optionally filtered by flags.
+
+        Args:
+            include: Keep only files with any of these flags (0 keeps all)
+            exclude: Drop files with any of these flags
+
+        Yields:
+            Full file paths
+        """
+        directories = self.directories
+        names = self._names
+        join = os.path.join
+        start = 0
+        for directory_id, end, flags in zip(
+            self._directory_column, self._name_ends, self._flags_column
+        ):
+            if (not include or flags & include) and not flags & exclude:
+                name = names[start:end].decode(_ENCODING, _ERRORS)
+                yield join(directories[directory_id], name)
+            start = end
+
+    def paths(self, include: int = 0, exclude: int = 0) -> List[str]:
+        """
+        Materialize file paths, optionally filtered by flags.
+
+        Args:
+            include: Keep only files with any of these flags (0 keeps all)
+            exclude: Drop files with any of these flags
+
+        Returns:
+            List of full file paths in scan order
+        """
+        return list(self.iter_paths(include, exclude))
+
+    def count(self, include: int = 0, exclude: int = 0) -> int:
+        """
+        Count files by flags without materializing paths.
+
+        Args:
+            include: Count only files with any of these flags (0 counts all)
+            exclude: Skip files with any of these flags
+
+        Returns:
+            Number of matching files
+        """
+        return sum(
+            n
+            for flags, n in Counter(self._flags_column).items()
+            if (not include or flags & include) and not flags & exclude
+        )
+
+    def extension_counts(self, exclude: int = 0) -> Dict[str, int]:
+        """
+        Count files per extension, without the empty one.
+
+        Args:
+            exclude: Skip files with any of these flags
+
+        Returns:
+            Dictionary mapping each non-empty extension to its file count
+        """
+        extensions = self.extensions
+        counts: Counter[int] = Counter(
+            extension_id
+            for extension_id, flags in zip(self._extension_column, self._flags_column)
+            if not flags & exclude
+        )
+        return {
+            extensions[extension_id]: n
+            for extension_id, n in counts.items()
+            if extension_id
+        }
+
+    def extension_sizes(self, exclude: int = 0) -> Dict[str, int]:
+        """
+        Total file sizes per extension, without the empty one.
+
+        A single pass over the extension, flags and size columns sums into a
+        list indexed by extension id, so no per-file objects are created.
+
+        Args:
+            exclude: Skip files with any of these flags
+
+        Returns:
+            Dictionary mapping each non-empty extension with a positive total
+            to its total bytes; unknown sizes count as zero
+        """
+        totals = [0] * len(self.extensions)
+        for extension_id, flags, size in zip(
+            self._extension_column, self._flags_column, self._size_column
+        ):
+            if size > 0 and not flags & exclude:
+                totals[extension_id] += size
+
+        return {
+            extension: totals[extension_id]
+            for extension_id, extension in enumerate(self.extensions)
+            if extension_id and totals[extension_id]
+        }
+
+    def largest(self, count: int) -> List[Tuple[int, str]]:
+        """
+        Return the largest files by size.
+
+        Paths are only built for files that enter the bounded heap, and ties
+        are settled as FileScanner does when it offers files during a walk.
+
+        Args:
+            count: Number of files to return
+
+        Returns:
+            Min-heap of up to count (size, path) items; files of unknown size
+            are left out
+        """
+        heap: List[Tuple[int, str]] = []
+        if count <= 0:
+            return heap
+        for index, size in enumerate(self._size_column):
+            if size < 0:
+                continue
+            if len(heap) < count:
+                heapq.heappush(heap, (size, self.path(index)))
+            elif size > heap[0][0]:
+                heapq.heapreplace(heap, (size, self.path(index)))
+        return heap
+
+    def existing_files(self, paths: Iterable[str]) -> Set[str]:
+        """
+        Find which of the given files are in the table.
+
+        Only the names of files in the directories of the given paths are
+        decoded, so checking a handful of paths stays cheap on large tables.
+
+        Args:
+            paths: Full file paths
+
+        Returns:
+            The given paths that are in the table
+        """
+        wanted: Dict[int, Set[str]] = {}
+        for path in paths:
+            directory, name = os.path.split(path)
+            directory_id = self._directory_ids.get(directory)
+            if directory_id is not None:
+                wanted.setdefault(directory_id, set()).add(name)
+
+        found: Set[str] = set()
+        if not wanted:
+            return found
+        # Rows of a directory are located by searching the packed directory
+        # column, so only matching rows are visited in Python
+        column = self._directory_column
+        packed = column.tobytes()
+        width = column.itemsize
+        for directory_id, wanted_names in wanted.items():
+            needle = array(column.typecode, [directory_id]).tobytes()
+            position = packed.find(needle)
+            while position != -1:
+                offset = position % width
+                if offset:
+                    # The bytes straddle two rows; resume at the next row
+                    position = packed.find(needle, position - offset + width)
+                    continue
+                name = self.name(position // width)
+                if name in wanted_names:
+                    found.add(os.path.join(self.directories[directory_id], name))
+                position = packed.find(needle, position + width)
+        return found
+
+    def directory_paths(self) -> Set[str]:
+        """
+        Return the directories holding files at any depth.
+
+        Returns:
+            Full paths of the directories of all files and their ancestors
+        """
+        result: Set[str] = set()
+        for directory in self.directories:
+            while directory not in result:
+                result.add(directory)
+                parent = os.path.dirname(directory)
+                if parent == directory:
+                    break
+                directory = parent
+        return result
+
+    def files_by_extension(self, exclude: int = 0) -> Dict[str, List[str]]:
+        """
+        Materialize the legacy mapping of extension to file paths.
+
+        Args:
+            exclude: Skip files with any of these flags
+
+        Returns:
+            Dictionary mapping each non-empty extension to paths in scan order
+        """
+        result: Dict[str, List[str]] = {}
+        extensions = self.extensions
+        for extension_id, flags, path in zip(
+            self._extension_column, self._flags_column, self.iter_paths()
+        ):
+            if extension_id and not flags & exclude:
+                extension = extensions[extension_id]
+                paths = result.get(extension)
+                if paths is None:
+                    paths = result[extension] = []
+                paths.append(path)
+        return result
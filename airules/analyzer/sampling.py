@@ -0,0 +1,221 @@
+"""Stratified estimates from a partial, time-budgeted scan."""
+
+import math
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from .models import Estimate
+
+# Two-sided 95% normal quantile
+_Z_95 = 1.96
+
+
+class _Stratum:
+    """Directories found and sampled at one depth."""
+
+    __slots__ = ("found", "observations", "parents")
+
+    def __init__(self) -> None:
+        self.found = 0
+        self.observations: List[Mapping[Any, int]] = []
+        # Observation number of each listed directory's parent one depth up
+        self.parents: List[Optional[int]] = []
+
+
+class StratifiedSample:
+    """
+    Per-directory observations grouped into strata by directory depth.
+
+    Every listed directory is one sampled cluster of files. A directory is
+    only found once its parent is listed, so the sample is multi-stage: the
+    directories found at one depth are the subdirectories of those listed at
+    the depth above. Each listed directory is weighted by the inverse of the
+    fraction listed at its own depth and at every depth above, and the
+    variance of every stage is carried into the confidence intervals. Both
+    shrink to exact counts once every directory is listed.
+
+    The estimates assume the depth to list next is chosen independently of
+    what was observed, such as uniformly at random among the depths with
+    directories left; steering the budget by the observations so far biases
+    the scaled-up strata.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a sample with no strata."""
+        self._strata: Dict[int, _Stratum] = {}
+
+    def discover(self, depth: int, count: int = 1) -> None:
+        """
+        Record directories the scan starts from, such as the root.
+
+        Args:
+            depth: Depth below the scan root
+            count: Number of directories found
+        """
+        self._stratum(depth).found += count
+
+    def observe(
+        self,
+        depth: int,
+        counts: Mapping[Any, int],
+        subdirectories: int = 0,
+        parent: Optional[int] = None,
+    ) -> int:
+        """
+        Record a listed directory.
+
+        Args:
+            depth: Depth below the scan root
+            counts: Counts of the directory's files per key
+            subdirectories: Subdirectories found in it, to be sampled at
+                depth + 1
+            parent: Number observe() returned for the directory's parent;
+                None for directories passed to discover()
+
+        Returns:
+            Number identifying this directory as the parent of its
+            subdirectories
+        """
+        stratum = self._stratum(depth)
+        stratum.observations.append(counts)
+        stratum.parents.append(parent)
+        if subdirectories:
+            self._stratum(depth + 1).found += subdirectories
+        return len(stratum.observations) - 1
+
+    @property
+    def directories_found(self) -> int:
+        """Number of directories found so far."""
+        return sum(stratum.found for stratum in self._strata.values())
+
+    @property
+    def directories_sampled(self) -> int:
+        """Number of directories listed so far."""
+        return sum(len(stratum.observations) for stratum in self._strata.values())
+
+    @property
+    def completeness(self) -> float:
+        """Fraction of the project's estimated directories that were listed."""
+        estimated = sum(self._stratum_sizes().values())
+        if not estimated:
+            return 1.0
+        return min(self.directories_sampled / estimated, 1.0)
+
+    def estimate(
+        self, group: Optional[Callable[[Any], Optional[str]]] = None
+    ) -> Dict[str, Estimate]:
+        """
+        Estimate project-wide totals with 95% confidence intervals.
+
+        Works up from the deepest listed stratum: a listed directory stands
+        for its own files plus the estimated subtree totals of its listed
+        subdirectories, scaled by the fraction listed at their depth. Each
+        stage contributes the spread of these subtree totals to the variance,
+        weighted by the fraction of the tree above it that was listed, as in
+        the usual multi-stage cluster estimator. Directories below the
+        deepest listed depth are not extrapolated.
+
+        Args:
+            group: Maps an observation key to the name it is totalled under,
+                or None to leave it out; keys are used as-is by default
+
+        Returns:
+            Dictionary mapping each group to its estimate; bounds never fall
+            below the count actually observed
+        """
+        sizes = self._stratum_sizes()
+        # Estimated subtree totals of each group, per listed directory at the
+        # depth below, and that depth's scale-up from listed to found
+        below: Dict[str, List[float]] = {}
+        below_parents: List[Optional[int]] = []
+        below_scale = 0.0
+        variances: Dict[str, float] = {}
+        observed: Dict[str, int] = {}
+
+        for depth in sorted(sizes, reverse=True):
+            stratum = self._strata[depth]
+            sampled = len(stratum.observations)
+            if not sampled:
+                continue
+
+            # Subtree totals of each group in this stratum, starting from the
+            # directories' own files
+            subtrees: Dict[str, List[float]] = {}
+            for index, counts in enumerate(stratum.observations):
+                for key, count in counts.items():
+                    name = group(key) if group is not None else str(key)
+                    if name is None:
+                        continue
+                    column = subtrees.get(name)
+                    if column is None:
+                        column = subtrees[name] = [0.0] * sampled
+                    column[index] += count
+            for name, column in subtrees.items():
+                observed[name] = observed.get(name, 0) + round(sum(column))
+            for name, child_totals in below.items():
+                column = subtrees.get(name)
+                if column is None:
+                    column = subtrees[name] = [0.0] * sampled
+                for parent, total in zip(below_parents, child_totals):
+                    if parent is not None:
+                        column[parent] += below_scale * total
+
+            if sampled < stratum.found:
+                # Stage variance, weighted by the inverse fraction listed above
+                fraction = sampled / stratum.found
+                weight = sizes[depth] * stratum.found * (1 - fraction) / sampled
+                for name, column in subtrees.items():
+                    mean = sum(column) / sampled
+                    if sampled > 1:
+                        spread = sum((z - mean) ** 2 for z in column) / (sampled - 1)
+                    else:
+                        # No spread yet; assume totals vary as much as the mean
+                        spread = mean * mean
+                    variances[name] = variances.get(name, 0.0) + weight * spread
+
+            below = subtrees
+            below_parents = stratum.parents
+            below_scale = stratum.found / sampled
+
+        result: Dict[str, Estimate] = {}
+        for name, child_totals in below.items():
+            total = below_scale * sum(child_totals)
+            margin = _Z_95 * math.sqrt(variances.get(name, 0.0))
+            floor = observed[name]
+            result[name] = Estimate(
+                value=max(total, floor),
+                low=max(total - margin, floor),
+                high=max(total + margin, floor),
+            )
+        return result
+
+    def _stratum_sizes(self) -> Dict[int, float]:
+        """
+        Estimate the number of directories at each depth.
+
+        The directories found at a depth are the subdirectories of those
+        listed at the depth above, so they are scaled by the inverse of the
+        fraction of directories listed at every depth above.
+
+        Returns:
+            Dictionary mapping each depth with directories found to its
+            estimated size, for the depths reachable from depth 0
+        """
+        sizes: Dict[int, float] = {}
+        scale = 1.0
+        depth = 0
+        stratum = self._strata.get(0)
+        while stratum is not None and stratum.found:
+            size = sizes[depth] = scale * stratum.found
+            sampled = len(stratum.observations)
+            if not sampled:
+                break
+            scale = size / sampled
+            depth += 1
+            stratum = self._strata.get(depth)
+        return sizes
+
+    def _stratum(self, depth: int) -> _Stratum:
+        stratum = self._strata.get(depth)
+        if stratum is None:
+            stratum = self._strata[depth] = _Stratum()
+        return stratum
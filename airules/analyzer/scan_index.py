@@ -0,0 +1,205 @@
+"""Persistent directory listing index for incremental project scans."""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR = os.path.join(".rules4", "cache")
+INDEX_FILE = "scan-index.json"
+INDEX_VERSION = 3
+
+# Listings of directories modified this close to the scan start are not
+# stored: a change within the same timestamp tick would go unnoticed.
+RACY_WINDOW_NS = 2_000_000_000
+
+_Listing = Tuple[List[str], List[str]]
+
+
+class ScanIndex:
+    """
+    On-disk cache of directory listings keyed by directory mtime.
+
+    A directory's mtime changes whenever an entry is added, removed or
+    renamed, so a listing recorded with the current ``st_mtime_ns`` can be
+    reused instead of reading the directory again. File sizes are stored as
+    they were when the directory was listed; a file rewritten in place keeps
+    its recorded size until an entry of its directory changes.
+    """
+
+    def __init__(self, root: str, path: Optional[str] = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            root: Project root the index belongs to
+            path: Index file location (defaults to .rules4/cache under root)
+        """
+        self.root = root
+        self.path = path or os.path.join(root, INDEX_DIR, INDEX_FILE)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[
+            str, Tuple[int, List[str], List[str], List[int], List[int]]
+        ] = {}
+        self._visited: Set[str] = set()
+        self._started_ns = time.time_ns()
+
+    @classmethod
+    def load(cls, root: str, path: Optional[str] = None) -> "ScanIndex":
+        """
+        Load the index for a project, starting empty if it is missing or invalid.
+
+        Args:
+            root: Project root the index belongs to
+            path: Index file location (defaults to .rules4/cache under root)
+
+        Returns:
+            ScanIndex instance
+        """
+        index = cls(root, path)
+        try:
+            with open(index.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != INDEX_VERSION
+            or data.get("root") != root
+        ):
+            return index
+
+        try:
+            for key, entry in data["directories"].items():
+                mtime_ns, file_names, dir_names, file_ids, file_sizes = entry
+                if not len(file_ids) == len(file_sizes) == len(file_names):
+                    raise ValueError(f"file columns do not match names of {key!r}")
+                index._entries[key] = (
+                    int(mtime_ns),
+                    file_names,
+                    dir_names,
+                    file_ids,
+                    file_sizes,
+                )
+        except (KeyError, TypeError, ValueError):
+            index._entries.clear()
+        return index
+
+    def _key(self, directory: str) -> str:
+        """Return the index key of a directory (its path relative to root)."""
+        return directory[len(self.root) + 1 :]
+
+    def lookup(self, directory: str, mtime_ns: int) -> Optional[_Listing]:
+        """
+        Return the cached listing of a directory if it is still current.
+
+        Args:
+            directory: Directory path
+            mtime_ns: Current ``st_mtime_ns`` of the directory
+
+        Returns:
+            Tuple of (file names, directory names) or None on a miss
+        """
+        key = self._key(directory)
+        self._visited.add(key)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == mtime_ns:
+            self.hits += 1
+            return entry[1], entry[2]
+        self.misses += 1
+        return None
+
+    def file_ids(self, directory: str) -> List[int]:
+        """
+        Return the file ids stored with a directory's listing.
+
+        Args:
+            directory: Directory path, after a successful lookup()
+
+        Returns:
+            Ids parallel to the listed file names, empty if none are stored
+        """
+        entry = self._entries.get(self._key(directory))
+        return entry[3] if entry is not None else []
+
+    def file_sizes(self, directory: str) -> List[int]:
+        """
+        Return the file sizes stored with a directory's listing.
+
+        Args:
+            directory: Directory path, after a successful lookup()
+
+        Returns:
+            Sizes in bytes parallel to the listed file names, negative where
+            unknown; empty if none are stored
+        """
+        entry = self._entries.get(self._key(directory))
+        return entry[4] if entry is not None else []
+
+    def store(
+        self,
+        directory: str,
+        mtime_ns: int,
+        file_names: List[str],
+        dir_names: List[str],
+        file_ids: Optional[List[int]] = None,
+        file_sizes: Optional[List[int]] = None,
+    ) -> None:
+        """
+        Record a fresh listing of a directory.
+
+        Args:
+            directory: Directory path
+            mtime_ns: ``st_mtime_ns`` taken before the directory was read
+            file_names: Names of regular files
+            dir_names: Names of subdirectories
+            file_ids: Ids of the files used to recognize hard links, such as
+                inode numbers; 0 (unknown) for all files if omitted
+            file_sizes: Sizes of the files in bytes; -1 (unknown) for all
+                files if omitted
+        """
+        key = self._key(directory)
+        self._visited.add(key)
+        if mtime_ns >= self._started_ns - RACY_WINDOW_NS:
+            self._entries.pop(key, None)
+            return
+        if file_ids is None:
+            file_ids = [0] * len(file_names)
+        if file_sizes is None:
+            file_sizes = [-1] * len(file_names)
+        self._entries[key] = (mtime_ns, file_names, dir_names, file_ids, file_sizes)
+
+    def save(self, prune: bool = True) -> None:
+        """
+        Write the index to disk atomically.
+
+        Args:
+            prune: Drop directories not visited since the index was loaded;
+                pass False after a partial scan
+        """
+        entries = self._entries
+        if prune:
+            entries = {k: v for k, v in entries.items() if k in self._visited}
+
+        data = {
+            "version": INDEX_VERSION,
+            "root": self.root,
+            "directories": entries,
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug(f"Could not write scan index {self.path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,149 @@
+"""Language detection for extensionless scripts from shebangs and modelines."""
+
+import os
+import re
+from typing import List, Optional
+
+# Directories whose extensionless files are scripts even when not executable
+SCRIPT_DIRS = frozenset({"bin", "sbin", "script", "scripts", "libexec"})
+
+# Bytes of a file inspected for a shebang or modeline
+HEAD_BYTES = 256
+
+# Interpreter names, without version suffixes, mapped to the extension whose
+# language they run
+INTERPRETERS = {
+    "python": ".py",
+    "pypy": ".py",
+    "node": ".js",
+    "nodejs": ".js",
+    "deno": ".ts",
+    "bun": ".js",
+    "ts-node": ".ts",
+    "tsx": ".ts",
+    "sh": ".sh",
+    "dash": ".sh",
+    "ash": ".sh",
+    "ksh": ".sh",
+    "bash": ".bash",
+    "zsh": ".zsh",
+    "fish": ".fish",
+    "ruby": ".rb",
+    "perl": ".pl",
+    "php": ".php",
+    "lua": ".lua",
+    "luajit": ".lua",
+    "rscript": ".r",
+    "julia": ".jl",
+    "pwsh": ".ps1",
+    "tclsh": ".tcl",
+    "elixir": ".exs",
+    "swift": ".swift",
+    "groovy": ".groovy",
+    "scala": ".scala",
+    "kotlin": ".kts",
+}
+
+# Modeline file types (vim "ft" or emacs "mode") mapped to extensions
+MODELINE_TYPES = {
+    "python": ".py",
+    "javascript": ".js",
+    "js": ".js",
+    "typescript": ".ts",
+    "sh": ".sh",
+    "shell-script": ".sh",
+    "bash": ".bash",
+    "zsh": ".zsh",
+    "fish": ".fish",
+    "ruby": ".rb",
+    "perl": ".pl",
+    "cperl": ".pl",
+    "php": ".php",
+    "lua": ".lua",
+    "r": ".r",
+    "julia": ".jl",
+    "tcl": ".tcl",
+    "ps1": ".ps1",
+}
+
+_VERSION_SUFFIX = re.compile(r"[\d.]+$")
+_VIM_MODELINE = re.compile(
+    rb"(?:^|\s)(?:vim?|ex):.*?\b(?:ft|filetype|syntax)=([\w+-]+)", re.MULTILINE
+)
+_EMACS_MODELINE = re.compile(rb"-\*-(.*?)-\*-")
+_EMACS_MODE = re.compile(r"(?:^|;)\s*mode\s*:\s*([\w+-]+)", re.IGNORECASE)
+
+
+def interpreter_extension(interpreter: str) -> Optional[str]:
+    """
+    Map an interpreter path or name to the extension of its language.
+
+    Args:
+        interpreter: Interpreter such as "/usr/bin/python3.11"
+
+    Returns:
+        Extension such as ".py", or None if the interpreter is unknown
+    """
+    name = os.path.basename(interpreter).lower()
+    if name.endswith(".exe"):
+        name = name[:-4]
+    return INTERPRETERS.get(name) or INTERPRETERS.get(_VERSION_SUFFIX.sub("", name))
+
+
+def script_extension(head: bytes) -> Optional[str]:
+    """
+    Detect the language of a script from the start of its content.
+
+    Reads the shebang first, including "/usr/bin/env" with options, "-S"
+    and variable assignments, then falls back to vim and emacs modelines.
+
+    Args:
+        head: First bytes of the file; only HEAD_BYTES are inspected
+
+    Returns:
+        Extension of the detected language, or None
+    """
+    head = head[:HEAD_BYTES]
+    if head.startswith(b"#!"):
+        line = head[2:].split(b"\n", 1)[0].decode("utf-8", "ignore")
+        extension = _shebang_extension(line.split())
+        if extension:
+            return extension
+
+    match = _EMACS_MODELINE.search(head)
+    if match:
+        text = match.group(1).decode("utf-8", "ignore")
+        mode = _EMACS_MODE.search(text)
+        name = mode.group(1) if mode else text.strip()
+        extension = MODELINE_TYPES.get(name.lower())
+        if extension:
+            return extension
+
+    match = _VIM_MODELINE.search(head)
+    if match:
+        return MODELINE_TYPES.get(match.group(1).decode("ascii", "ignore").lower())
+    return None
+
+
+def _shebang_extension(words: List[str]) -> Optional[str]:
+    """Map the words of a shebang line, after "#!", to an extension."""
+    if not words:
+        return None
+    if os.path.basename(words[0]) != "env":
+        return interpreter_extension(words[0])
+
+    # env [-S] [-i] [-u NAME] [NAME=VALUE]... interpreter [args]
+    words = words[1:]
+    while words:
+        word = words.pop(0)
+        if word in ("-u", "--unset", "-C", "--chdir"):
+            if words:
+                words.pop(0)
+        elif word.startswith("-S") and len(word) > 2:
+            # "-Spython3 -u" splits into the interpreter and its arguments
+            words.insert(0, word[2:])
+        elif word.startswith("-") or "=" in word:
+            continue
+        else:
+            return interpreter_extension(word)
+    return None
@@ -32,6 +32,25 @@ generate_handler = GenerateCommandHandler(console_manager, file_manager)
 auto_handler = AutoCommandHandler(console_manager, file_manager)
 
 
+def parse_time_budget(value: Optional[str]) -> Optional[float]:
+    """Parse a duration such as "2s", "500ms" or "1.5" (seconds)."""
+    if value is None:
+        return None
+    text = value.strip().lower()
+    scale = 1.0
+    if text.endswith("ms"):
+        text, scale = text[:-2], 0.001
+    elif text.endswith("s"):
+        text = text[:-1]
+    try:
+        seconds = float(text) * scale
+    except ValueError:
+        raise typer.BadParameter(f"invalid duration: {value!r}")
+    if not seconds > 0:
+        raise typer.BadParameter(f"duration must be positive: {value!r}")
+    return seconds
+
+
 def version_callback(value: bool) -> None:
     """Handle version flag."""
     if value:
@@ -255,6 +274,28 @@ def auto(
         False, "-y", "--yes", help="Overwrite files without prompting."
     ),
     project_path: str = typer.Option(".", help="Target project directory."),
+    time_budget: Optional[str] = typer.Option(
+        None,
+        "--time-budget",
+        help="Sample the project for at most this long (e.g. 2s, 500ms) and estimate the rest.",
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        help="Keep running and regenerate rules for tags whose detection changes.",
+    ),
+    weight_by: str = typer.Option(
+        "files",
+        "--weight-by",
+        help="Rank languages by their share of 'files' or of 'bytes'.",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "-j",
+        "--jobs",
+        min=1,
+        help="Processes matching file contents against language patterns.",
+    ),
 ) -> None:
     """Auto-detect project characteristics and generate tailored rules.
 
@@ -274,6 +315,10 @@ def auto(
     [dim]$[/dim] rules4 auto cursor  # Auto-detect for Cursor only
     [dim]$[/dim] rules4 auto --research --lang python  # Override language
     [dim]$[/dim] rules4 auto --tags "testing,security"  # Override tags
+    [dim]$[/dim] rules4 auto --time-budget 2s  # Sample huge repositories
+    [dim]$[/dim] rules4 auto --watch  # Regenerate as the project changes
+    [dim]$[/dim] rules4 auto --weight-by bytes  # Rank languages by code size
+    [dim]$[/dim] rules4 auto --jobs 4  # Analyze file contents on 4 cores
 
     [yellow]Must be run inside a virtual environment for safety.[/yellow]
     """
@@ -287,6 +332,10 @@ def auto(
         dry_run=dry_run,
         yes=yes,
         project_path=project_path,
+        time_budget=parse_time_budget(time_budget),
+        watch=watch,
+        weight_by=weight_by,
+        jobs=jobs,
     )
 
 
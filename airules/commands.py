@@ -1,16 +1,18 @@
 """Command handlers for the CLI."""
 
-from typing import Optional, Protocol
+from typing import Callable, List, Optional, Protocol, Tuple
 
 import typer
 
-from .analyzer import CodebaseAnalyzer
+from .analyzer import AnalysisResult, CodebaseAnalyzer, FileScanner, LanguageDetector
+from .analyzer.incremental import IncrementalAnalyzer
 from .config import create_default_config, get_config, get_config_path
 from .file_operations import FileManager
 from .models import format_models_list
 from .services import GenerationPipelineService
 from .ui import ConsoleManager
 from .venv_check import require_virtualenv
+from .watcher import Watcher, create_watcher, wait_for_changes
 
 
 class CommandHandlerProtocol(Protocol):
@@ -172,10 +174,17 @@ class GenerateCommandHandler:
 class AutoCommandHandler:
     """Handler for the auto command that auto-detects project characteristics."""
 
+    # Seconds without further changes that end a burst in watch mode
+    WATCH_DEBOUNCE = 0.5
+
     def __init__(self, console: ConsoleManager, file_manager: FileManager):
         self.console = console
         self.pipeline_service = GenerationPipelineService(console, file_manager)
-        self.analyzer = CodebaseAnalyzer()
+        # Repeat runs reuse directory listings cached under .rules4/cache
+        self.analyzer = CodebaseAnalyzer(
+            file_scanner=FileScanner(use_index=True), aggregate_only=True
+        )
+        self.watcher_factory: Callable[[], Watcher] = create_watcher
 
     def execute(
         self,
@@ -188,86 +197,217 @@ class AutoCommandHandler:
         dry_run: bool,
         yes: bool,
         project_path: str,
+        time_budget: Optional[float] = None,
+        watch: bool = False,
+        weight_by: str = "files",
+        jobs: int = 1,
     ) -> None:
-        """Execute auto command with project analysis."""
+        """
+        Execute auto command with project analysis.
+
+        With watch, keeps running after the first generation: changed
+        directories are rescanned as they change, and rules are regenerated
+        only for the tags whose detection changed, until interrupted.
+        weight_by ranks languages by their share of "files" or "bytes", and
+        jobs sets the processes used for content analysis.
+        """
         try:
             require_virtualenv()
+            if weight_by not in LanguageDetector.WEIGHTS:
+                raise ValueError(
+                    f"--weight-by must be one of "
+                    f"{', '.join(LanguageDetector.WEIGHTS)}, got {weight_by!r}"
+                )
+            if jobs < 1:
+                raise ValueError(f"--jobs must be at least 1, got {jobs}")
+            if watch and time_budget is not None:
+                # Watch mode keeps a full listing of every directory to rescan
+                raise ValueError("--time-budget cannot be combined with --watch")
+            self.analyzer.weight_by = weight_by
+            self.analyzer.jobs = jobs
+            # A dry run reads cached listings but leaves the project untouched
+            self.analyzer.file_scanner.save_index = not dry_run
 
             # Auto-detect project characteristics
             self.console.print_info("Analyzing project structure...")
-            analysis_result = self.analyzer.analyze(project_path)
+            if watch:
+                incremental = IncrementalAnalyzer(self.analyzer, project_path)
+                analysis_result = incremental.analyze()
+            else:
+                analysis_result = self.analyzer.analyze(project_path, time_budget)
+            if analysis_result.completeness < 1.0:
+                self.console.print_warning(
+                    f"Time budget ran out: estimates are based on "
+                    f"about {analysis_result.completeness:.0%} of the directories"
+                )
 
-            # Extract detected language and tags
-            detected_lang = (
-                analysis_result.primary_language.name
-                if analysis_result.primary_language
-                else None
+            final_lang, final_tags = self._resolve_settings(analysis_result, lang, tags)
+            self._generate(
+                tool,
+                primary,
+                review,
+                research,
+                final_lang,
+                final_tags,
+                dry_run,
+                yes,
+                project_path,
             )
-            detected_tags = self.analyzer.get_recommended_tags(analysis_result)
 
-            # Show analysis results
-            summary_parts = []
-            if detected_lang:
-                summary_parts.append(f"Detected language: {detected_lang}")
-            else:
-                summary_parts.append("Language: Unable to detect")
+        except Exception as e:
+            self.console.print_error(f"✗ {e}")
+            raise typer.Exit(code=1)
 
-            if detected_tags:
-                summary_parts.append(f"Detected tags: {', '.join(detected_tags)}")
-            else:
-                summary_parts.append("Tags: None detected")
+        if watch:
+            self._watch(
+                incremental,
+                tool,
+                primary,
+                review,
+                research,
+                lang,
+                tags,
+                dry_run,
+                yes,
+                project_path,
+                final_lang,
+                final_tags,
+            )
 
-            analysis_summary = " | ".join(summary_parts)
-            self.console.print_info(f"Analysis: {analysis_summary}")
+    def _resolve_settings(
+        self, analysis_result: AnalysisResult, lang: Optional[str], tags: Optional[str]
+    ) -> Tuple[str, str]:
+        """
+        Report the detection results and merge them with user overrides.
+
+        Returns:
+            Tuple of (language, comma-separated tags) to generate with
+        """
+        # Extract detected language and tags
+        detected_lang = (
+            analysis_result.primary_language.name
+            if analysis_result.primary_language
+            else None
+        )
+        detected_tags = self.analyzer.get_recommended_tags(analysis_result)
 
-            # Merge detected characteristics with user overrides
-            final_lang = lang or detected_lang
-            final_tags = tags or ",".join(detected_tags) if detected_tags else None
+        # Show analysis results
+        summary_parts = []
+        if detected_lang:
+            summary_parts.append(f"Detected language: {detected_lang}")
+        else:
+            summary_parts.append("Language: Unable to detect")
 
-            if not final_lang:
-                raise Exception(
-                    "Unable to detect project language. Please specify with --lang option."
-                )
+        if detected_tags:
+            summary_parts.append(f"Detected tags: {', '.join(detected_tags)}")
+        else:
+            summary_parts.append("Tags: None detected")
 
-            if not final_tags:
-                final_tags = "general"
-                self.console.print_warning("No specific tags detected, using 'general'")
+        analysis_summary = " | ".join(summary_parts)
+        self.console.print_info(f"Analysis: {analysis_summary}")
 
-            # Show what will be generated
-            self.console.print_info(
-                f"Generating with: language={final_lang}, tags={final_tags}"
+        # Merge detected characteristics with user overrides
+        final_lang = lang or detected_lang
+        final_tags = tags or ",".join(detected_tags) if detected_tags else None
+
+        if not final_lang:
+            raise Exception(
+                "Unable to detect project language. Please specify with --lang option."
             )
 
-            # Determine tools to process
-            if tool:
-                # Single tool specified
-                self._process_single_tool(
-                    tool,
-                    primary,
-                    review,
-                    research,
-                    final_lang,
-                    final_tags,
-                    dry_run,
-                    yes,
-                    project_path,
-                )
-            else:
-                # Process all configured tools
-                self._process_all_tools(
-                    primary,
-                    review,
-                    research,
-                    final_lang,
-                    final_tags,
-                    dry_run,
-                    yes,
-                    project_path,
-                )
+        if not final_tags:
+            final_tags = "general"
+            self.console.print_warning("No specific tags detected, using 'general'")
 
-        except Exception as e:
-            self.console.print_error(f"✗ {e}")
-            raise typer.Exit(code=1)
+        return final_lang, final_tags
+
+    def _generate(
+        self,
+        tool: Optional[str],
+        primary: str,
+        review: Optional[str],
+        research: bool,
+        lang: str,
+        tags: str,
+        dry_run: bool,
+        yes: bool,
+        project_path: str,
+    ) -> None:
+        """Generate rules for one tool, or all configured tools."""
+        # Show what will be generated
+        self.console.print_info(f"Generating with: language={lang}, tags={tags}")
+
+        # Determine tools to process
+        if tool:
+            # Single tool specified
+            self._process_single_tool(
+                tool, primary, review, research, lang, tags, dry_run, yes, project_path
+            )
+        else:
+            # Process all configured tools
+            self._process_all_tools(
+                primary, review, research, lang, tags, dry_run, yes, project_path
+            )
+
+    def _watch(
+        self,
+        incremental: IncrementalAnalyzer,
+        tool: Optional[str],
+        primary: str,
+        review: Optional[str],
+        research: bool,
+        lang: Optional[str],
+        tags: Optional[str],
+        dry_run: bool,
+        yes: bool,
+        project_path: str,
+        current_lang: str,
+        current_tags: str,
+    ) -> None:
+        """Regenerate rules for changed detections until interrupted."""
+        watcher = self.watcher_factory()
+        try:
+            watcher.watch(incremental.directories)
+            self.console.print_info("Watching for changes (press Ctrl+C to stop)...")
+            while True:
+                changed = wait_for_changes(watcher, self.WATCH_DEBOUNCE)
+                try:
+                    analysis_result = incremental.update(changed)
+                    watcher.watch(incremental.directories)
+                    if analysis_result is None:
+                        continue
+
+                    new_lang, new_tags = self._resolve_settings(
+                        analysis_result, lang, tags
+                    )
+                    affected = _changed_tags(
+                        current_lang, current_tags, new_lang, new_tags
+                    )
+                    current_lang, current_tags = new_lang, new_tags
+                    if not affected:
+                        continue
+
+                    self.console.print_info(
+                        f"Detection changed, regenerating: {', '.join(affected)}"
+                    )
+                    self._generate(
+                        tool,
+                        primary,
+                        review,
+                        research,
+                        new_lang,
+                        ",".join(affected),
+                        dry_run,
+                        yes,
+                        project_path,
+                    )
+                except Exception as e:
+                    # Keep watching; the next change may fix the problem
+                    self.console.print_error(f"✗ {e}")
+        except KeyboardInterrupt:
+            self.console.print_info("Stopped watching.")
+        finally:
+            watcher.close()
 
     def _process_single_tool(
         self,
@@ -356,3 +496,19 @@ class AutoCommandHandler:
                 lang=lang,
                 tags=tags,
             )
+
+
+def _changed_tags(
+    old_lang: str, old_tags: str, new_lang: str, new_tags: str
+) -> List[str]:
+    """
+    Return the tags whose rules need regenerating after a detection change.
+
+    Every tag is affected when the language changed; otherwise only tags that
+    were not detected before. Rules of tags no longer detected are kept.
+    """
+    tags = [tag for tag in new_tags.split(",") if tag]
+    if new_lang != old_lang:
+        return tags
+    previous = set(old_tags.split(","))
+    return [tag for tag in tags if tag not in previous]
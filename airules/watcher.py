@@ -0,0 +1,292 @@
+"""Directory change watching for ``rules4 auto --watch``."""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, Optional, Protocol, Set
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# Events that change what a scan of the directory would find; a file written
+# in place is reported once, when it is closed
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+# struct inotify_event without its trailing name
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class Watcher(Protocol):
+    """Reports directories whose entries changed."""
+
+    def watch(self, directories: Iterable[str]) -> None:
+        """Watch exactly the given directories from now on."""
+        ...
+
+    def read_changes(self, timeout: Optional[float]) -> Set[str]:
+        """Wait up to timeout seconds and return the directories that changed."""
+        ...
+
+    def close(self) -> None:
+        """Release the watcher's resources."""
+        ...
+
+
+class InotifyWatcher:
+    """
+    Watcher built on Linux inotify, through a small ctypes binding.
+
+    Each watched directory gets its own watch descriptor; events name the
+    directory the change happened in, so nothing has to be rescanned to find
+    out what changed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an inotify instance.
+
+        Raises:
+            OSError: If inotify is unavailable on this platform
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        try:
+            self._init = libc.inotify_init1
+            self._add_watch = libc.inotify_add_watch
+            self._rm_watch = libc.inotify_rm_watch
+        except AttributeError:
+            raise OSError(errno.ENOSYS, "libc does not provide inotify")
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        fd = self._init(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, f"inotify_init1 failed: {os.strerror(code)}")
+        self._fd = fd
+        self._paths: Dict[int, str] = {}
+        self._descriptors: Dict[str, int] = {}
+
+    def watch(self, directories: Iterable[str]) -> None:
+        """
+        Watch exactly the given directories from now on.
+
+        Directories that cannot be watched, for example because the inotify
+        watch limit is reached, are logged and skipped.
+
+        Args:
+            directories: Directory paths
+        """
+        wanted = set(directories)
+        for path in list(self._descriptors):
+            if path not in wanted:
+                descriptor = self._descriptors.pop(path)
+                self._paths.pop(descriptor, None)
+                self._rm_watch(self._fd, descriptor)
+        for path in wanted:
+            if path in self._descriptors:
+                continue
+            descriptor = self._add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+            if descriptor < 0:
+                code = ctypes.get_errno()
+                logger.warning(f"Cannot watch {path}: {os.strerror(code)}")
+                continue
+            self._descriptors[path] = descriptor
+            self._paths[descriptor] = path
+
+    def read_changes(self, timeout: Optional[float]) -> Set[str]:
+        """
+        Wait for events and return the directories they happened in.
+
+        Args:
+            timeout: Seconds to wait for the first event; None waits forever
+
+        Returns:
+            Paths of changed directories, empty if the timeout passed; all
+            watched directories if the kernel's event queue overflowed
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return set()
+
+        changed: Set[str] = set()
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            descriptor, mask, _, name_length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size + name_length
+            if mask & IN_Q_OVERFLOW:
+                changed.update(self._descriptors)
+                continue
+            path = self._paths.get(descriptor)
+            if path is None:
+                continue
+            if mask & IN_IGNORED:
+                # Watch removed by the kernel, e.g. the directory was deleted
+                del self._paths[descriptor]
+                self._descriptors.pop(path, None)
+            changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        """Close the inotify instance, removing all watches."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._paths.clear()
+        self._descriptors.clear()
+
+
+class PollingWatcher:
+    """
+    Portable watcher comparing directory modification times.
+
+    Adding, removing or renaming an entry updates its directory's mtime, which
+    also covers editors that save by writing a new file and renaming it over
+    the old one. Files modified in place are not noticed.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        """
+        Initialize the polling watcher.
+
+        Args:
+            interval: Seconds between polls
+
+        Raises:
+            ValueError: If interval is not positive
+        """
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        self.interval = interval
+        self._mtimes: Dict[str, Optional[int]] = {}
+
+    def watch(self, directories: Iterable[str]) -> None:
+        """
+        Watch exactly the given directories from now on.
+
+        Args:
+            directories: Directory paths
+        """
+        mtimes = {}
+        for path in directories:
+            mtimes[path] = self._mtimes[path] if path in self._mtimes else _mtime(path)
+        self._mtimes = mtimes
+
+    def read_changes(self, timeout: Optional[float]) -> Set[str]:
+        """
+        Poll until a directory changes or the timeout passes.
+
+        Args:
+            timeout: Seconds to wait; None waits forever
+
+        Returns:
+            Paths of changed directories, empty if the timeout passed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, mtime in self._mtimes.items():
+                current = _mtime(path)
+                if current != mtime:
+                    self._mtimes[path] = current
+                    changed.add(path)
+            if changed:
+                return changed
+
+            if deadline is None:
+                time.sleep(self.interval)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        """Stop tracking directories."""
+        self._mtimes = {}
+
+
+def create_watcher(poll_interval: float = 1.0) -> Watcher:
+    """
+    Create the most efficient watcher available.
+
+    Args:
+        poll_interval: Seconds between polls if inotify is unavailable
+
+    Returns:
+        InotifyWatcher on Linux, PollingWatcher elsewhere
+    """
+    try:
+        return InotifyWatcher()
+    except OSError as e:
+        logger.debug(f"Falling back to polling for changes: {e}")
+        return PollingWatcher(poll_interval)
+
+
+def wait_for_changes(
+    watcher: Watcher, debounce: float, timeout: Optional[float] = None
+) -> Set[str]:
+    """
+    Wait for a burst of changes to finish.
+
+    After the first change, keeps collecting until no new change arrives for
+    debounce seconds, so a checkout or a build touching many files produces
+    one update instead of many.
+
+    Args:
+        watcher: Watcher to read from
+        debounce: Seconds of quiet that end a burst
+        timeout: Seconds to wait for the first change; None waits forever
+
+    Returns:
+        Paths of all directories changed during the burst, empty if the
+        timeout passed without a change
+    """
+    changed = watcher.read_changes(timeout)
+    while changed:
+        more = watcher.read_changes(debounce)
+        if not more:
+            break
+        changed |= more
+    return changed
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
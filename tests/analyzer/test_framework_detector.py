@@ -1,6 +1,8 @@
 """Tests for framework detection functionality."""
 
 import json
+import os
+import shutil
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -8,6 +10,8 @@ from unittest.mock import Mock, patch
 import pytest
 import toml
 
+from airules.analyzer.content_cache import ContentCache
+from airules.analyzer.file_scanner import FileScanner
 from airules.analyzer.framework_detector import (
     FrameworkDetector,
     FrameworkInfo,
@@ -100,6 +104,18 @@ class TestFrameworkDetector:
         assert django_fw.type == FrameworkType.WEB_FRAMEWORK
         assert django_fw.language == "python"
 
+    def test_dependencies_match_exact_names_and_namespaces(self):
+        """Test that dependencies are not matched by substring."""
+        package_info = self.create_package_info(
+            "javascript",
+            ["preact-render-to-string", "eslint-plugin-react", "@angular/router"],
+        )
+
+        frameworks = self.detector._detect_from_dependencies(package_info)
+
+        assert [f.name for f in frameworks] == ["Angular"]
+        assert frameworks[0].metadata["dependency_name"] == "@angular/router"
+
     def test_detect_multiple_frameworks(self):
         """Test detecting multiple frameworks from different languages."""
         js_package = self.create_package_info("javascript", ["react", "express"])
@@ -149,6 +165,206 @@ export default App;
             "file_presence" in detection_methods or "file_pattern" in detection_methods
         )
 
+    def test_vendored_and_generated_sources_are_not_read(self):
+        """Test that file patterns only count authored source files."""
+        react = "import React from 'react';\n"
+        self.create_temp_file("vendor/ui/App.jsx", react)
+        self.create_temp_file("src/schema_pb.js", react)
+        self.create_temp_file("src/bundle.js", "/** @generated */\n" + react)
+        self.create_temp_file("src/main.js", "console.log('hi');\n")
+
+        frameworks = self.detector._detect_from_files(self.temp_dir)
+
+        assert [f for f in frameworks if f.name == "React"] == []
+
+    def test_source_files_are_read_once(self):
+        """Test that file patterns of all frameworks share one read per file."""
+        self.create_temp_file("src/App.jsx", "import React from 'react';\n")
+        self.create_temp_file("src/main.py", "print('hi')\n")
+        cache = ContentCache()
+        detector = FrameworkDetector(content_cache=cache)
+
+        frameworks = detector._detect_from_files(self.temp_dir)
+
+        assert "React" in [f.name for f in frameworks]
+        assert cache.misses == 2
+        assert len(cache) == 2
+
+    def test_invalid_jobs(self):
+        """Test that fewer than one job is rejected."""
+        with pytest.raises(ValueError, match="jobs"):
+            FrameworkDetector(jobs=0)
+
+    def test_ignored_directories_are_not_searched(self):
+        """Test that file patterns skip what the scanner ignores."""
+        react = "import React from 'react';\n"
+        self.create_temp_file("node_modules/react/index.js", react)
+        self.create_temp_file(".venv/lib/app.py", "from flask import Flask\n")
+        self.create_temp_file("dist/bundle.js", react)
+        self.create_temp_file("src/main.js", "console.log('hi');\n")
+
+        frameworks = self.detector._detect_from_files(self.temp_dir)
+
+        assert {f.name for f in frameworks} & {"React", "Flask"} == set()
+
+    def test_uses_given_inventory(self):
+        """Test that a precomputed inventory replaces walking the project."""
+        self.create_temp_file("src/App.jsx", "import React from 'react';\n")
+        inventory, _, _ = FileScanner().scan_table(str(self.temp_dir))
+
+        with patch.object(Path, "rglob", side_effect=AssertionError("walked")):
+            with patch.object(
+                self.detector.file_scanner, "scan_table", side_effect=AssertionError
+            ):
+                frameworks = self.detector.detect_frameworks(
+                    str(self.temp_dir), inventory=inventory
+                )
+
+        assert "React" in [f.name for f in frameworks]
+
+    def test_markers_read_from_inventory(self):
+        """Test that marker files and structure come from the inventory."""
+        self.create_temp_file("angular.json", "{}")
+        self.create_temp_file("src/app/app.component.ts", "export class App {}\n")
+        inventory, _, _ = FileScanner().scan_table(str(self.temp_dir))
+        # Removing the files shows that no check goes to the filesystem
+        shutil.rmtree(self.temp_dir / "src")
+        (self.temp_dir / "angular.json").unlink()
+
+        files = self.detector._detect_from_files(self.temp_dir, inventory)
+        structure = self.detector._detect_from_structure(self.temp_dir, inventory)
+
+        presence = [f for f in files if f.detection_method == "file_presence"]
+        assert [(f.name, f.metadata["detected_file"]) for f in presence] == [
+            ("Angular", "src/app/app.component.ts")
+        ]
+        assert [f.name for f in structure] == ["Angular"]
+        assert structure[0].metadata["structure_match_ratio"] == 1.0
+
+    def test_markers_beyond_truncated_inventory(self):
+        """Test that markers the capped inventory never reached still count."""
+        for i in range(20):
+            self.create_temp_file(f"app/models/model_{i}.rb", "class Model; end\n")
+        self.create_temp_file("config/application.rb", "module Blog; end\n")
+        self.create_temp_file("db/schema.rb", "")
+        inventory, _, _ = FileScanner(max_files=10).scan_table(str(self.temp_dir))
+        assert not inventory.existing_files(
+            [str(self.temp_dir / "config" / "application.rb")]
+        )
+
+        files = self.detector._detect_from_files(self.temp_dir, inventory)
+        structure = self.detector._detect_from_structure(self.temp_dir, inventory)
+
+        presence = [f for f in files if f.detection_method == "file_presence"]
+        assert [(f.name, f.metadata["detected_file"]) for f in presence] == [
+            ("Ruby on Rails", "config/application.rb")
+        ]
+        assert "Ruby on Rails" in [f.name for f in structure]
+
+    def test_markers_in_ignored_directory(self):
+        """Test that markers below a directory the scan pruned still count."""
+        self.create_temp_file(".gitignore", "config/\n")
+        self.create_temp_file("config/application.rb", "module Blog; end\n")
+        inventory, _, _ = FileScanner().scan_table(str(self.temp_dir))
+        assert inventory.complete
+        assert str(self.temp_dir / "config") in inventory.pruned_directories
+
+        assert "config/application.rb" in self.detector._find_markers(inventory)
+
+    def test_complete_inventory_answers_markers_alone(self):
+        """Test that a complete scan's markers need no filesystem calls."""
+        self.create_temp_file("angular.json", "{}")
+        self.create_temp_file("src/app/app.component.ts", "export class App {}\n")
+        inventory, _, _ = FileScanner().scan_table(str(self.temp_dir))
+
+        with patch("os.stat", side_effect=AssertionError("stat")):
+            markers = self.detector._find_markers(inventory)
+        with patch.object(
+            self.detector, "_find_markers", wraps=self.detector._find_markers
+        ) as find_markers:
+            self.detector.detect_frameworks(str(self.temp_dir), inventory=inventory)
+
+        assert {"angular.json", "src/", "src/app/"} <= markers
+        assert "config/application.rb" not in markers
+        assert find_markers.call_count == 1
+
+    def test_remembered_results_are_not_shared(self):
+        """Test that changing a returned result leaves later detections intact."""
+        self.create_temp_file(
+            "package.json", json.dumps({"dependencies": {"react": "18"}})
+        )
+        first = self.detector.detect_frameworks(str(self.temp_dir))
+        react = next(f for f in first if f.name == "React")
+        react.confidence = 0.0
+        react.metadata["edited"] = True
+
+        again = FrameworkDetector().detect_frameworks(str(self.temp_dir))
+        react = next(f for f in again if f.name == "React")
+        react.metadata["edited"] = True
+        last = FrameworkDetector().detect_frameworks(str(self.temp_dir))
+
+        react = next(f for f in last if f.name == "React")
+        assert react.confidence == 0.9
+        assert "edited" not in react.metadata
+
+    def test_repeated_detection_is_remembered(self):
+        """Test that detecting an unchanged project again reuses the result."""
+        self.create_temp_file(
+            "package.json", json.dumps({"dependencies": {"react": "18"}})
+        )
+        frameworks = self.detector.detect_frameworks(str(self.temp_dir))
+
+        other = FrameworkDetector()
+        with patch.object(
+            other.package_parser, "parse_all_package_files", side_effect=AssertionError
+        ):
+            with patch.object(other, "_scan_inventory", side_effect=AssertionError):
+                again = other.detect_frameworks(str(self.temp_dir))
+                suggestions = other.get_framework_suggestions(str(self.temp_dir))
+
+        assert [f.name for f in again] == [f.name for f in frameworks]
+        assert "React" in [f.name for f in again]
+        assert "javascript" in other.project_languages
+        assert suggestions
+
+    def test_remembered_detection_follows_changes(self):
+        """Test that changed package files and directories are detected again."""
+        package_json = self.create_temp_file(
+            "package.json", json.dumps({"dependencies": {"react": "18"}})
+        )
+        self.detector.detect_frameworks(str(self.temp_dir))
+
+        Path(package_json).write_text(json.dumps({"dependencies": {"vue": "3"}}))
+        # Step the mtime past the resolution of coarse filesystem timestamps
+        stat = os.stat(package_json)
+        os.utime(package_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        names = [f.name for f in self.detector.detect_frameworks(str(self.temp_dir))]
+
+        assert "Vue.js" in names
+        assert "React" not in names
+
+    def test_invalidate(self):
+        """Test that an invalidated project is detected again."""
+        self.detector.detect_frameworks(str(self.temp_dir))
+
+        FrameworkDetector.invalidate(str(self.temp_dir))
+        with patch.object(
+            self.detector.package_parser, "parse_all_package_files", return_value=[]
+        ) as parse:
+            self.detector.detect_frameworks(str(self.temp_dir))
+
+        parse.assert_called_once()
+
+    def test_file_limit_keeps_every_extension(self):
+        """Test that the searched files are shared among extensions."""
+        for i in range(FrameworkDetector.MAX_PATTERN_FILES + 20):
+            self.create_temp_file(f"src/component{i}.js", "console.log(1);\n")
+        self.create_temp_file("server/app.py", "from flask import Flask\n")
+
+        frameworks = self.detector._detect_from_files(self.temp_dir)
+
+        assert "Flask" in [f.name for f in frameworks]
+
     def test_detect_vue_from_files(self):
         """Test detecting Vue.js from .vue files."""
         self.create_temp_file(
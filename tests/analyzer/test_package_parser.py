@@ -78,6 +78,24 @@ class TestPackageParser:
         assert package_info.metadata["name"] == "test-project"
         assert package_info.metadata["engines"]["node"] == ">=14.0.0"
 
+    def test_parse_npm_lock_nested_packages(self):
+        """Test that nested installs keep their own package name."""
+        lock_content = {
+            "name": "test-project",
+            "lockfileVersion": 3,
+            "packages": {
+                "": {"name": "test-project"},
+                "node_modules/@scope/tool": {"version": "1.0.0"},
+                "node_modules/@scope/tool/node_modules/react": {"version": "17.0.2"},
+            },
+        }
+
+        file_path = self.create_temp_file("package-lock.json", json.dumps(lock_content))
+        package_info = self.parser.parse_package_file(file_path)
+
+        names = [dep.name for dep in package_info.dependencies]
+        assert names == ["@scope/tool", "react"]
+
     def test_parse_requirements_txt(self):
         """Test parsing Python requirements.txt file."""
         requirements_content = """
@@ -16,6 +16,16 @@ def mock_venv_check(monkeypatch):
     monkeypatch.setattr("airules.venv_check.in_virtualenv", lambda: True)
 
 
+@pytest.fixture(autouse=True)
+def forget_framework_detections():
+    """Keep framework detections remembered by one test from another."""
+    from airules.analyzer.framework_detector import FrameworkDetector
+
+    FrameworkDetector.invalidate()
+    yield
+    FrameworkDetector.invalidate()
+
+
 @pytest.fixture
 def runner():
     """Provide a CLI runner for testing."""
@@ -172,6 +172,114 @@ class TestCodebaseAnalyzer:
             assert result.is_multilingual
             assert result.primary_language is not None
 
+    def test_analyze_aggregate_only_matches_full_scan(self):
+        """Test that the bounded-memory scan gives the same analysis."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / "src").mkdir()
+            (tmp_path / "tests").mkdir()
+            for i in range(8):
+                (tmp_path / "src" / f"module_{i}.py").write_text("pass")
+            (tmp_path / "src" / "app.ts").write_text("const x: number = 1;")
+            (tmp_path / "tests" / "test_module.py").write_text("def test(): pass")
+            (tmp_path / "package.json").write_text("{}")
+            (tmp_path / "Dockerfile").write_text("FROM python")
+
+            full = CodebaseAnalyzer().analyze(tmp_dir)
+            aggregate = CodebaseAnalyzer(aggregate_only=True).analyze(tmp_dir)
+
+            assert aggregate.error_messages == []
+            assert aggregate.languages == full.languages
+            assert aggregate.file_stats == full.file_stats
+            assert aggregate.framework_hints == full.framework_hints
+            assert aggregate.structure.has_tests_dir == full.structure.has_tests_dir
+
+    def test_analyze_splits_ambiguous_headers_like_aggregate_scan(self):
+        """Test that content analysis reassigns every header in both scans."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            for i in range(100):
+                (tmp_path / f"h{i}.h").write_text(
+                    "namespace app {\ntemplate <typename T> class Box {};\n}\n"
+                )
+
+            full = CodebaseAnalyzer().analyze(tmp_dir)
+            aggregate = CodebaseAnalyzer(aggregate_only=True).analyze(tmp_dir)
+
+            counts = {lang.name: lang.file_count for lang in full.languages}
+            assert counts == {"C++": 100}
+            assert full.languages == aggregate.languages
+
+    def test_analyze_weighted_by_bytes(self):
+        """Test that byte weighting lets a few large files outrank many small."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            for i in range(6):
+                (tmp_path / f"helper_{i}.py").write_text("pass\n")
+            (tmp_path / "engine.go").write_text("package main\n" * 500)
+
+            by_files = CodebaseAnalyzer().analyze(tmp_dir)
+            by_bytes = CodebaseAnalyzer(weight_by="bytes").analyze(tmp_dir)
+
+            assert by_files.primary_language.name == "Python"
+            assert by_bytes.primary_language.name == "Go"
+            go = next(lang for lang in by_bytes.languages if lang.name == "Go")
+            assert go.byte_count == len("package main\n") * 500
+            assert go.file_share == pytest.approx(1 / 7)
+            assert go.byte_share == pytest.approx(
+                go.byte_count / (go.byte_count + 6 * len("pass\n"))
+            )
+
+    def test_analyze_reads_each_file_once(self):
+        """Test that content is cached for one analysis and dropped after."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            for i in range(3):
+                (tmp_path / f"h{i}.h").write_text("namespace app {}\n")
+            (tmp_path / "main.c").write_text("int main(void) { return 0; }\n")
+
+            analyzer = CodebaseAnalyzer()
+            analyzer.analyze(tmp_dir)
+            cache = analyzer.file_scanner.content_cache
+            first_misses = cache.misses
+            assert cache.hits > 0
+            analyzer.analyze(tmp_dir)
+
+            assert 0 < first_misses <= 4
+            assert cache.misses == first_misses
+
+    def test_init_invalid_weight(self):
+        """Test that an unknown weighting is rejected."""
+        with pytest.raises(ValueError, match="weight_by"):
+            CodebaseAnalyzer(weight_by="lines")
+
+    def test_init_invalid_jobs(self):
+        """Test that fewer than one job is rejected."""
+        with pytest.raises(ValueError, match="jobs"):
+            CodebaseAnalyzer(jobs=0)
+
+    def test_analyze_with_time_budget(self):
+        """Test that a sampled analysis reports completeness and intervals."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / "src").mkdir()
+            for i in range(4):
+                (tmp_path / "src" / f"module_{i}.py").write_text("pass")
+            (tmp_path / "src" / "app.ts").write_text("const x: number = 1;")
+
+            full = CodebaseAnalyzer().analyze(tmp_dir)
+            sampled = CodebaseAnalyzer().analyze(tmp_dir, time_budget=60.0)
+
+            assert sampled.error_messages == []
+            assert sampled.completeness == 1.0
+            assert sampled.sampling.directories_sampled == 2
+            assert sampled.file_stats == full.file_stats
+            assert [lang.name for lang in sampled.languages] == [
+                lang.name for lang in full.languages
+            ]
+            python = sampled.languages[0]
+            assert python.confidence_interval == (0.8, 0.8)
+
     def test_detect_languages_nonexistent_path(self):
         """Test detect_languages with non-existent path."""
         with pytest.raises(FileOperationError):
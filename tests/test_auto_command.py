@@ -8,7 +8,7 @@ import pytest
 from typer.testing import CliRunner
 
 from airules.analyzer import CodebaseAnalyzer
-from airules.cli import app
+from airules.cli import app, auto_handler
 
 runner = CliRunner()
 
@@ -188,6 +188,20 @@ class TestAutoCommand:
             assert "Detected language: Python" in result.stdout
             assert "testing" in result.stdout.lower()
 
+    def test_auto_command_dry_run_writes_nothing(
+        self, python_project_structure, mock_api_clients
+    ):
+        """Test that a dry run does not persist the scan index."""
+        with runner.isolated_filesystem(temp_dir=python_project_structure.parent):
+            import os
+
+            os.chdir(str(python_project_structure))
+
+            result = runner.invoke(app, ["auto", "--dry-run"], catch_exceptions=False)
+
+            assert result.exit_code == 0
+            assert not (python_project_structure / ".rules4").exists()
+
     def test_auto_command_specific_tool(
         self, python_project_structure, mock_api_clients
     ):
@@ -230,6 +244,191 @@ class TestAutoCommand:
             assert "language=go" in result.stdout
             assert "tags=performance,security" in result.stdout
 
+    def test_auto_command_with_time_budget(
+        self, python_project_structure, mock_api_clients
+    ):
+        """Test auto command with a sampling time budget."""
+        with runner.isolated_filesystem(temp_dir=python_project_structure.parent):
+            import os
+
+            os.chdir(str(python_project_structure))
+
+            result = runner.invoke(
+                app,
+                ["auto", "--time-budget", "2s", "--dry-run"],
+                catch_exceptions=False,
+            )
+
+            assert result.exit_code == 0
+            assert "Detected language: Python" in result.stdout
+
+    def test_auto_command_invalid_time_budget(self, python_project_structure):
+        """Test auto command rejects an unparseable time budget."""
+        result = runner.invoke(app, ["auto", "--time-budget", "soon"])
+
+        assert result.exit_code != 0
+        assert "invalid duration" in result.output
+
+    def test_auto_command_weight_by_bytes(
+        self, python_project_structure, mock_api_clients
+    ):
+        """Test auto command ranking languages by bytes."""
+        (python_project_structure / "server.go").write_text("package main\n" * 200)
+        with runner.isolated_filesystem(temp_dir=python_project_structure.parent):
+            import os
+
+            os.chdir(str(python_project_structure))
+
+            try:
+                result = runner.invoke(
+                    app,
+                    ["auto", "--weight-by", "bytes", "--dry-run"],
+                    catch_exceptions=False,
+                )
+            finally:
+                auto_handler.analyzer.weight_by = "files"
+
+            assert result.exit_code == 0
+            assert "Detected language: Go" in result.stdout
+
+    def test_auto_command_invalid_weight_by(self, python_project_structure):
+        """Test auto command rejects an unknown weighting."""
+        result = runner.invoke(
+            app,
+            [
+                "auto",
+                "--weight-by",
+                "lines",
+                "--project-path",
+                str(python_project_structure),
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert "--weight-by must be one of" in result.output
+
+    def test_auto_command_with_jobs(self, python_project_structure, mock_api_clients):
+        """Test auto command with several content analysis processes."""
+        with runner.isolated_filesystem(temp_dir=python_project_structure.parent):
+            import os
+
+            os.chdir(str(python_project_structure))
+
+            try:
+                result = runner.invoke(
+                    app, ["auto", "--jobs", "2", "--dry-run"], catch_exceptions=False
+                )
+            finally:
+                auto_handler.analyzer.jobs = 1
+
+            assert result.exit_code == 0
+            assert "Detected language: Python" in result.stdout
+
+    def test_auto_command_invalid_jobs(self, python_project_structure):
+        """Test auto command rejects fewer than one job."""
+        result = runner.invoke(app, ["auto", "--jobs", "0"])
+
+        assert result.exit_code != 0
+
+    def test_auto_command_rejects_time_budget_with_watch(
+        self, python_project_structure
+    ):
+        """Test auto command refuses to sample a project it keeps watching."""
+        result = runner.invoke(app, ["auto", "--watch", "--time-budget", "2s"])
+
+        assert result.exit_code != 0
+        assert "--time-budget cannot be combined with --watch" in result.output
+
+    def test_auto_command_watch_regenerates_changed_tags(
+        self, python_project_structure, mock_api_clients
+    ):
+        """Test that watch mode regenerates only newly detected tags."""
+        project = python_project_structure
+
+        class FakeWatcher:
+            """Adds a docs directory on the first wait, then stops."""
+
+            def __init__(self):
+                self.reads = 0
+
+            def watch(self, directories):
+                pass
+
+            def read_changes(self, timeout):
+                self.reads += 1
+                if self.reads == 1:
+                    (project / "docs").mkdir()
+                    (project / "docs" / "guide.md").write_text("# Guide")
+                    return {str(project.resolve())}
+                if timeout is not None:
+                    return set()
+                raise KeyboardInterrupt
+
+            def close(self):
+                pass
+
+        with runner.isolated_filesystem(temp_dir=project.parent):
+            import os
+
+            os.chdir(str(project))
+
+            with patch.object(
+                auto_handler, "watcher_factory", FakeWatcher
+            ), patch.object(auto_handler.pipeline_service, "run_pipeline") as run:
+                result = runner.invoke(
+                    app,
+                    ["auto", "cursor", "--watch", "--dry-run"],
+                    catch_exceptions=False,
+                )
+
+            assert result.exit_code == 0
+            assert "Stopped watching" in result.stdout
+            assert run.call_count == 2
+            assert "documentation" not in run.call_args_list[0].kwargs["tags"]
+            assert run.call_args_list[1].kwargs["tags"] == "documentation"
+            assert run.call_args_list[1].kwargs["lang"] == "Python"
+
+    def test_auto_command_watch_keeps_user_tags(
+        self, python_project_structure, mock_api_clients
+    ):
+        """Test that watch mode leaves overridden tags alone."""
+        project = python_project_structure
+
+        class FakeWatcher:
+            """Adds a docs directory, then stops."""
+
+            def watch(self, directories):
+                pass
+
+            def read_changes(self, timeout):
+                if timeout is None and (project / "docs").exists():
+                    raise KeyboardInterrupt
+                if not (project / "docs").exists():
+                    (project / "docs").mkdir()
+                    (project / "docs" / "guide.md").write_text("# Guide")
+                    return {str(project.resolve())}
+                return set()
+
+            def close(self):
+                pass
+
+        with runner.isolated_filesystem(temp_dir=project.parent):
+            import os
+
+            os.chdir(str(project))
+
+            with patch.object(
+                auto_handler, "watcher_factory", FakeWatcher
+            ), patch.object(auto_handler.pipeline_service, "run_pipeline") as run:
+                result = runner.invoke(
+                    app,
+                    ["auto", "cursor", "--watch", "--tags", "security", "--dry-run"],
+                    catch_exceptions=False,
+                )
+
+            assert result.exit_code == 0
+            assert run.call_count == 1
+
     def test_auto_command_with_research(
         self, python_project_structure, mock_api_clients
     ):
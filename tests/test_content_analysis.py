@@ -0,0 +1,162 @@
+"""Tests for the parallel content analysis stage."""
+
+import re
+
+import pytest
+
+from airules.analyzer.content_analysis import (
+    PARALLEL_MIN_FILES,
+    ContentRules,
+    FileMatches,
+    PatternMatcher,
+    analyze_contents,
+    required_literal,
+)
+from airules.analyzer.file_scanner import FileScanner
+from airules.analyzer.language_detector import LanguageDetector
+
+RULES = ContentRules(
+    language_candidates={".h": ("C", "C++", "Objective-C")},
+    framework_matcher=PatternMatcher(
+        {
+            "react": (r"import.*React", r'from ["\']react["\']'),
+            "vue": (r"<template>",),
+        },
+        flags=re.IGNORECASE,
+    ),
+)
+
+CPP_HEADER = "namespace app {\ntemplate <typename T> class Box {};\n}\n"
+C_HEADER = "typedef struct point { int x; } point;\n"
+REACT = "import React from 'react';\n"
+
+
+def _write(tmp_path, files):
+    paths = []
+    for name, content in files.items():
+        path = tmp_path / name
+        path.write_text(content)
+        paths.append(str(path))
+    return paths
+
+
+class TestAnalyzeContents:
+    """Test cases for analyze_contents."""
+
+    def test_matches_languages_and_frameworks(self, tmp_path):
+        """Test per-file languages and first matching framework patterns."""
+        paths = _write(
+            tmp_path,
+            {
+                "box.h": CPP_HEADER,
+                "point.h": C_HEADER,
+                "App.jsx": "export { useState } from 'react';\n<template>\n",
+                "bundle.js": "/** @generated */\n" + REACT,
+            },
+        )
+
+        result = analyze_contents(paths, RULES, language_detector=LanguageDetector())
+
+        assert list(result) == paths
+        assert result[paths[0]] == FileMatches("C++", ())
+        assert result[paths[1]] == FileMatches("C", ())
+        assert result[paths[2]] == FileMatches(None, (("react", 1), ("vue", 0)))
+        assert result[paths[3]] == FileMatches(None, ())
+
+    def test_reads_through_scanner_cache(self, tmp_path):
+        """Test that in-process matching reads each file once."""
+        paths = _write(tmp_path, {"box.h": CPP_HEADER, "App.jsx": REACT})
+        scanner = FileScanner()
+
+        analyze_contents(paths, RULES, LanguageDetector(), scanner)
+        analyze_contents(paths, RULES, LanguageDetector(), scanner)
+
+        assert scanner.content_cache.misses == 2
+
+    def test_process_pool_matches_in_process(self, tmp_path):
+        """Test that sharding across processes merges deterministically."""
+        files = {}
+        for i in range(PARALLEL_MIN_FILES + 8):
+            files[f"h{i}.h"] = CPP_HEADER if i % 3 else C_HEADER
+            files[f"c{i}.jsx"] = REACT if i % 2 else "<template>\n"
+        paths = _write(tmp_path, files)
+        detector = LanguageDetector()
+
+        serial = analyze_contents(paths, RULES, detector, jobs=1)
+        parallel = analyze_contents(paths, RULES, detector, jobs=3)
+
+        assert list(parallel.items()) == list(serial.items())
+        assert serial[paths[0]].language == "C"
+        assert serial[paths[2]].language == "C++"
+
+    def test_invalid_jobs(self):
+        """Test that fewer than one job is rejected."""
+        with pytest.raises(ValueError, match="jobs"):
+            analyze_contents([], RULES, jobs=0)
+
+
+class TestRequiredLiteral:
+    """Test cases for required_literal."""
+
+    @pytest.mark.parametrize(
+        "pattern, literal",
+        [
+            (r"import.*React", "import"),
+            (r'from ["\']react["\']', "react"),
+            (r"\.jsx?$", ".js"),
+            (r"@app\.(get|post|put|delete)", "@app."),
+            (r'require\(["\']express["\']\)', "require("),
+            (r"from django\.db import models", "from django.db import models"),
+            (r"colou?r", "colo"),
+            (r"ab+c", "ab"),
+            (r"\d+px", "px"),
+        ],
+    )
+    def test_literal(self, pattern, literal):
+        """Test the literal every match of a pattern contains."""
+        assert required_literal(pattern) == literal
+
+    @pytest.mark.parametrize("pattern", [r"foo|bar", r"(?i)foo", r".*", r"[ab]+"])
+    def test_no_literal(self, pattern):
+        """Test patterns without a certain literal."""
+        assert required_literal(pattern) is None
+
+
+class TestPatternMatcher:
+    """Test cases for PatternMatcher."""
+
+    TEXTS = [
+        "from django.db import models\n",
+        "import { Injectable } from '@nestjs/common';\n@Injectable()\n",
+        "import React from 'react';\nexport default () => <App />;\n",
+        "@APP.POST('/items')\nasync def create(): ...\n",
+        "const express = require('express');\n",
+        "nothing to see here\n",
+        "frOm ımport ſomething; from fıask import Flask\n",
+    ]
+
+    def test_matches_like_searching_each_pattern(self):
+        """Test that results equal searching every pattern in order."""
+        from airules.analyzer.framework_detector import FrameworkDetector
+
+        matcher = FrameworkDetector.FILE_PATTERN_MATCHER
+        for text in self.TEXTS:
+            expected = []
+            for key, patterns in matcher.patterns.items():
+                for index, pattern in enumerate(patterns):
+                    if re.search(pattern, text, re.IGNORECASE):
+                        expected.append((key, index))
+                        break
+            assert matcher.match(text) == tuple(expected), text
+
+    def test_overlapping_frameworks(self):
+        """Test that one line can match several frameworks."""
+        matcher = PatternMatcher(
+            {"django": ("from django",), "django-orm": (r"from django\.db",)}
+        )
+
+        assert matcher.match("from django.db import models") == (
+            ("django", 0),
+            ("django-orm", 0),
+        )
+        assert matcher.match("from Django.db") == ()
@@ -0,0 +1,91 @@
+"""Tests for the shared content cache."""
+
+import pytest
+
+from airules.analyzer.content_cache import ContentCache
+
+
+class TestContentCache:
+    """Test cases for ContentCache."""
+
+    def test_reads_head_once(self, tmp_path):
+        """Test that a file is opened once and later reads are hits."""
+        path = tmp_path / "app.py"
+        path.write_bytes(b"x" * 100)
+        cache = ContentCache(max_bytes=1024, head_bytes=64)
+
+        assert cache.read(str(path)) == b"x" * 64
+        path.write_bytes(b"changed")
+        assert cache.read(str(path)) == b"x" * 64
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.size == 64
+        assert len(cache) == 1
+
+    def test_read_head_leaves_cache_untouched(self, tmp_path):
+        """Test that short reads are served from cached heads but not cached."""
+        cached = tmp_path / "cached.py"
+        cached.write_bytes(b"c" * 100)
+        other = tmp_path / "other"
+        other.write_bytes(b"o" * 100)
+        cache = ContentCache(max_bytes=1024, head_bytes=64)
+        cache.read(str(cached))
+
+        assert cache.read_head(str(cached), 8) == b"c" * 8
+        assert cache.read_head(str(other), 8) == b"o" * 8
+        assert cache.read_head(str(tmp_path / "missing"), 8) is None
+        assert (cache.hits, cache.misses, len(cache), cache.size) == (1, 1, 1, 64)
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that the byte budget evicts the least recently used heads."""
+        cache = ContentCache(max_bytes=20, head_bytes=10)
+        paths = []
+        for name in "abc":
+            path = tmp_path / name
+            path.write_bytes(name.encode() * 10)
+            paths.append(str(path))
+
+        cache.read(paths[0])
+        cache.read(paths[1])
+        cache.read(paths[0])
+        cache.read(paths[2])
+
+        assert cache.evictions == 1
+        assert cache.size == 20
+        cache.read(paths[0])
+        assert cache.hits == 2
+        cache.read(paths[1])
+        assert cache.misses == 4
+
+    def test_failed_reads_are_not_cached(self, tmp_path):
+        """Test that unreadable files return None and are retried."""
+        cache = ContentCache()
+        missing = str(tmp_path / "missing.py")
+
+        assert cache.read(missing) is None
+        assert cache.read(str(tmp_path)) is None
+        (tmp_path / "missing.py").write_bytes(b"pass\n")
+        assert cache.read(missing) == b"pass\n"
+        assert (cache.hits, cache.misses, len(cache)) == (0, 3, 1)
+
+    def test_clear(self, tmp_path):
+        """Test that clearing drops entries and resets the counters."""
+        path = tmp_path / "app.py"
+        path.write_bytes(b"old")
+        cache = ContentCache()
+        cache.read(str(path))
+        cache.read(str(path))
+
+        cache.clear()
+        path.write_bytes(b"new")
+
+        assert (cache.hits, cache.misses, cache.size, len(cache)) == (0, 0, 0, 0)
+        assert cache.read(str(path)) == b"new"
+
+    @pytest.mark.parametrize(
+        "max_bytes, head_bytes", [(1024, 0), (100, 200)], ids=["head", "budget"]
+    )
+    def test_invalid_sizes(self, max_bytes, head_bytes):
+        """Test that unusable sizes are rejected."""
+        with pytest.raises(ValueError):
+            ContentCache(max_bytes=max_bytes, head_bytes=head_bytes)
@@ -0,0 +1,90 @@
+"""Tests for the dependency index."""
+
+import pytest
+
+from airules.analyzer.dependency_index import (
+    DependencyIndex,
+    namespace_prefix,
+    normalize_package_name,
+)
+
+INDEX = DependencyIndex(
+    {
+        "react": ["react", "@types/react"],
+        "angular": ["@angular/core"],
+        "spring-boot": ["org.springframework.boot:spring-boot-starter"],
+        "gin": ["github.com/gin-gonic/gin"],
+        "symfony": ["symfony/framework-bundle"],
+        "django": ["django", "Django"],
+        "django-orm": ["django"],
+        "scikit-learn": ["scikit-learn"],
+    }
+)
+
+
+class TestNormalizePackageName:
+    """Test cases for normalize_package_name."""
+
+    @pytest.mark.parametrize(
+        "name, normalized",
+        [
+            ("Django", "django"),
+            ("scikit_learn", "scikit-learn"),
+            ("zope.interface", "zope-interface"),
+            ("@Angular/core", "@angular/core"),
+            ("org.junit.jupiter:junit-jupiter", "org.junit.jupiter:junit-jupiter"),
+            ("gorm.io/gorm", "gorm.io/gorm"),
+        ],
+    )
+    def test_normalize(self, name, normalized):
+        """Test that only plain names have their punctuation collapsed."""
+        assert normalize_package_name(name) == normalized
+
+
+class TestNamespacePrefix:
+    """Test cases for namespace_prefix."""
+
+    @pytest.mark.parametrize(
+        "name, prefix",
+        [
+            ("@angular/core", "@angular/"),
+            ("@types/react", None),
+            ("junit:junit", "junit:"),
+            ("github.com/gin-gonic/gin", "github.com/gin-gonic/gin/"),
+            ("symfony/framework-bundle", None),
+            ("react", None),
+        ],
+    )
+    def test_prefix(self, name, prefix):
+        """Test which names open a namespace."""
+        assert namespace_prefix(name) == prefix
+
+
+class TestDependencyIndex:
+    """Test cases for DependencyIndex."""
+
+    @pytest.mark.parametrize(
+        "name, keys",
+        [
+            ("react", ("react",)),
+            ("React", ("react",)),
+            ("@types/react", ("react",)),
+            ("preact-render-to-string", ()),
+            ("eslint-plugin-react", ()),
+            ("@types/node", ()),
+            ("@angular/router", ("angular",)),
+            (
+                "org.springframework.boot:spring-boot-starter-web",
+                ("spring-boot",),
+            ),
+            ("github.com/gin-gonic/gin/v2", ("gin",)),
+            ("github.com/gin-gonic/gin-contrib", ()),
+            ("symfony/console", ()),
+            ("Django", ("django", "django-orm")),
+            ("djangorestframework", ()),
+            ("scikit_learn", ("scikit-learn",)),
+        ],
+    )
+    def test_lookup(self, name, keys):
+        """Test exact and namespace matches without substring hits."""
+        assert INDEX.lookup(name) == keys
@@ -0,0 +1,88 @@
+"""Tests for the directory trie used in structure analysis."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from airules.analyzer.directory_trie import DirectoryTrie
+
+ROOT = os.path.join(os.sep, "home", "dev", "project")
+
+
+def _path(*parts):
+    return os.path.join(ROOT, *parts)
+
+
+def _legacy_directory_names(file_paths):
+    """Reference implementation walking every file's parents."""
+    names = set()
+    for path in map(Path, file_paths):
+        for parent in path.parents:
+            names.add(parent.name.lower())
+    return names
+
+
+class TestDirectoryTrie:
+    """Test cases for DirectoryTrie."""
+
+    def test_directories_with_files_below(self):
+        """Test that only directories holding files at some depth are listed."""
+        trie = DirectoryTrie(ROOT)
+        trie.add(ROOT, 2, 2)
+        trie.add(_path("src", "pkg", "core"), 1, 1)
+        trie.add(_path("empty"))
+        trie.add(_path("tests"), 1, 0)
+
+        assert trie.directories() == {
+            "src",
+            os.path.join("src", "pkg"),
+            os.path.join("src", "pkg", "core"),
+            "tests",
+        }
+        assert len(trie) == 6
+
+    def test_add_accumulates_counts(self):
+        """Test that adding a directory twice sums its counts."""
+        trie = DirectoryTrie(ROOT)
+        node = trie.add(_path("src"), 1, 1)
+
+        assert trie.add(_path("src"), 2, 0) is node
+        assert (node.file_count, node.named_file_count) == (3, 1)
+
+    def test_directory_names_match_parents_loop(self):
+        """Test that names match walking each file's parents."""
+        files = [
+            _path("setup.py"),
+            _path("src", "Build", "main.py"),
+            _path("node_modules", "dep", "index.js"),
+        ]
+        trie = DirectoryTrie(ROOT)
+        for file_path in files:
+            trie.add(os.path.dirname(file_path), 1, 1)
+        trie.add(_path("docs"), 1, 0)
+
+        assert trie.directory_names() == _legacy_directory_names(files)
+        assert "docs" not in trie.directory_names()
+
+    def test_from_files(self):
+        """Test building a trie from absolute and relative paths."""
+        files = [_path("src", "app.py"), os.path.join("lib", "util.py"), "main.py"]
+
+        trie = DirectoryTrie.from_files(files)
+
+        assert trie.directory_names() == _legacy_directory_names(files)
+
+    def test_empty_trie(self):
+        """Test that an empty trie has no directories or names."""
+        trie = DirectoryTrie(ROOT)
+
+        assert trie.directories() == set()
+        assert trie.directory_names() == set()
+
+    def test_rejects_directories_outside_root(self):
+        """Test that directories outside the root are rejected."""
+        trie = DirectoryTrie(ROOT)
+
+        with pytest.raises(ValueError):
+            trie.add(os.path.join(os.sep, "elsewhere"))
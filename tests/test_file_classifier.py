@@ -0,0 +1,114 @@
+"""Tests for the compiled file name classifier."""
+
+import fnmatch
+
+import pytest
+
+from airules.analyzer.file_classifier import (
+    CODE,
+    CONFIG,
+    DOC,
+    IGNORED,
+    TEST,
+    FileClassifier,
+)
+from airules.analyzer.file_scanner import FileScanner
+
+SAMPLE_NAMES = [
+    "main.py",
+    "test_main.py",
+    "main_test.py",
+    "server_test.go",
+    "Button.test.tsx",
+    "api.spec.ts",
+    "TEST_UPPER.PY",
+    "package.json",
+    "webpack.config.js",
+    "vite.config.ts",
+    ".eslintrc.json",
+    ".gitignore",
+    ".hidden",
+    "Dockerfile",
+    "docker-compose.yml",
+    "settings.ini",
+    "README.md",
+    "README",
+    "LICENSE",
+    "LICENSE-MIT",
+    "CHANGELOG.rst",
+    "notes.txt",
+    "requirements.txt",
+    "app.min.js",
+    "vendor.bundle.js",
+    "module.pyc",
+    "debug.log",
+    "libfoo.so",
+    "image.png",
+    "Makefile",
+    "foo.",
+    "archive.tar.gz",
+]
+
+
+def _legacy_flags(scanner, name):
+    """Classify a name with the original per-pattern fnmatch loops."""
+    flags = 0
+    if any(fnmatch.fnmatch(name, p) for p in scanner.IGNORE_PATTERNS):
+        flags |= IGNORED
+    lower_name = name.lower()
+    if any(lower_name.endswith(ext) for ext in scanner.TEST_EXTENSIONS) or any(
+        fnmatch.fnmatch(lower_name, p) for p in scanner.TEST_PATTERNS
+    ):
+        flags |= TEST
+    if any(fnmatch.fnmatch(name, p) for p in scanner.CONFIG_PATTERNS):
+        flags |= CONFIG
+    if any(fnmatch.fnmatch(name, p) for p in scanner.DOC_PATTERNS):
+        flags |= DOC
+    if name.startswith(".") and not flags & CONFIG:
+        flags |= IGNORED
+    index = name.rfind(".")
+    if 0 < index < len(name) - 1 and name[index:].lower() in scanner.CODE_EXTENSIONS:
+        flags |= CODE
+    return flags
+
+
+class TestFileClassifier:
+    """Test cases for FileClassifier."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.scanner = FileScanner()
+        self.classifier = self.scanner._classifier
+
+    @pytest.mark.parametrize("name", SAMPLE_NAMES)
+    def test_matches_fnmatch_semantics(self, name):
+        """Test that compiled tables agree with the fnmatch loops."""
+        assert self.classifier.classify(name) == _legacy_flags(self.scanner, name)
+
+    def test_returns_multiple_categories(self):
+        """Test that one call reports every matching category."""
+        flags = self.classifier.classify("requirements.txt")
+        assert flags & CONFIG
+        assert flags & DOC
+
+        flags = self.classifier.classify("test_main.py")
+        assert flags & TEST
+        assert flags & CODE
+
+    def test_hidden_files_ignored_unless_config(self):
+        """Test hidden file handling."""
+        assert self.classifier.classify(".hidden") & IGNORED
+        assert not self.classifier.classify(".gitignore") & IGNORED
+        assert not self.classifier.classify(".eslintrc.js") & IGNORED
+
+    def test_test_patterns_case_insensitive(self):
+        """Test that test patterns match regardless of case."""
+        assert self.classifier.classify("Test_Main.py") & TEST
+        assert self.classifier.classify("Widget.Spec.JS") & TEST
+        assert not self.classifier.classify("changelog.x") & DOC
+
+    def test_empty_pattern_sets(self):
+        """Test classifier with no patterns at all."""
+        classifier = FileClassifier([], [], [], [], [], [])
+        assert classifier.classify("main.py") == 0
+        assert classifier.classify(".hidden") == IGNORED
@@ -2,12 +2,14 @@
 
 import os
 import tempfile
+import time
 from pathlib import Path
 from unittest.mock import mock_open, patch
 
 import pytest
 
-from airules.analyzer.file_scanner import FileScanner
+from airules.analyzer.file_classifier import CODE, CONFIG, GENERATED, TEST, VENDORED
+from airules.analyzer.file_scanner import NOT_AUTHORED, FileScanner
 from airules.analyzer.models import FileStats, ProjectStructure
 
 
@@ -30,6 +32,11 @@ class TestFileScanner:
         assert scanner.max_depth == 5
         assert scanner.max_files == 1000
 
+    def test_init_invalid_workers(self):
+        """Test scanner rejects a worker count below one."""
+        with pytest.raises(ValueError, match="workers"):
+            FileScanner(workers=0)
+
     def test_scan_directory_nonexistent(self):
         """Test scanning non-existent directory."""
         with pytest.raises(ValueError, match="Invalid project path"):
@@ -215,6 +222,557 @@ class TestFileScanner:
             py_files = files_by_ext.get(".py", [])
             assert len(py_files) <= 5
 
+    def test_scan_directory_parallel_matches_serial(self):
+        """Test that parallel traversal returns the same ordered results."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            for i in range(6):
+                package_dir = tmp_path / f"pkg{i}" / "sub"
+                package_dir.mkdir(parents=True)
+                (package_dir.parent / f"mod{i}.py").write_text("pass")
+                (package_dir / f"deep{i}.js").write_text("// js")
+
+            serial = FileScanner().scan_directory(tmp_dir)
+            parallel = FileScanner(workers=4).scan_directory(tmp_dir)
+
+            assert parallel[0] == serial[0]
+            assert list(parallel[0]) == list(serial[0])
+            assert parallel[2] == serial[2]
+
+    def test_scan_directory_parallel_file_limit(self):
+        """Test that max_files is applied exactly across parallel workers."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            for i in range(8):
+                package_dir = tmp_path / f"pkg{i}"
+                package_dir.mkdir()
+                for j in range(5):
+                    (package_dir / f"mod{j}.py").write_text("pass")
+
+            serial = FileScanner(max_files=7).scan_directory(tmp_dir)
+            parallel = FileScanner(max_files=7, workers=4).scan_directory(tmp_dir)
+
+            assert parallel[2].total_files == 7
+            assert parallel[0] == serial[0]
+
+    def test_parallel_walk_stops_listing_at_file_limit(self):
+        """Test that workers list only a bounded number of directories ahead."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            for i in range(30):
+                for j in range(10):
+                    leaf = tmp_path / f"pkg{i}" / f"sub{j}"
+                    leaf.mkdir(parents=True)
+                    (leaf / "mod.py").write_text("pass")
+
+            def listings(scanner):
+                calls = []
+                read_directory = scanner._read_directory
+
+                def counting(directory, claim=True):
+                    calls.append(directory)
+                    return read_directory(directory, claim)
+
+                scanner._read_directory = counting
+                scanner.scan_directory(tmp_dir)
+                return len(calls)
+
+            serial = listings(FileScanner(max_files=10))
+            parallel_scanner = FileScanner(max_files=10, workers=4)
+            parallel = listings(parallel_scanner)
+
+            lookahead = parallel_scanner.LISTINGS_PER_WORKER * 4
+            assert serial < 50
+            assert parallel <= serial + lookahead
+
+    def _create_prioritized_project(self, tmp_path: Path):
+        for directory in ["vendor/lib/deep", "src/pkg", "tests", "docs", "misc/a/b"]:
+            (tmp_path / directory).mkdir(parents=True)
+        for i in range(5):
+            (tmp_path / "vendor" / "lib" / "deep" / f"dep{i}.js").write_text("")
+        (tmp_path / "src" / "pkg" / "core.py").write_text("")
+        (tmp_path / "tests" / "test_core.py").write_text("")
+        (tmp_path / "docs" / "guide.md").write_text("")
+        (tmp_path / "misc" / "a" / "b" / "note.txt").write_text("")
+        (tmp_path / "main.py").write_text("")
+        (tmp_path / "pyproject.toml").write_text("")
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_walk_visits_priority_directories_first(self, workers):
+        """Test that source and test roots come first and vendor trees last."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            self._create_prioritized_project(tmp_path)
+            root = str(tmp_path.resolve())
+
+            scanner = FileScanner(workers=workers)
+            order = [
+                os.path.relpath(directory, root)
+                for directory, _, _ in scanner._walk_directory(root)
+            ]
+
+            assert order[0] == "."
+            assert set(order[1:4]) == {"src", "tests", os.path.join("src", "pkg")}
+            assert order.index("misc") < order.index(os.path.join("misc", "a", "b"))
+            assert order[-3:] == [
+                "vendor",
+                os.path.join("vendor", "lib"),
+                os.path.join("vendor", "lib", "deep"),
+            ]
+
+    def test_capped_scan_keeps_informative_files(self):
+        """Test that max_files drops deferred files before authored ones."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_prioritized_project(Path(tmp_dir))
+
+            files_by_ext, _, stats = FileScanner(max_files=6).scan_directory(tmp_dir)
+
+            assert stats.total_files == 6
+            assert stats.config_files == 1
+            assert stats.test_files == 1
+            assert ".js" not in files_by_ext
+
+    def test_root_manifests_come_first(self):
+        """Test that even a one-file cap keeps a root manifest."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            for i in range(10):
+                (tmp_path / f"a{i}.py").write_text("")
+            (tmp_path / "package.json").write_text("{}")
+
+            records = list(FileScanner(max_files=1).iter_files(tmp_dir))
+
+            assert [record.name for record in records] == ["package.json"]
+
+    def test_scan_directory_prunes_gitignored_directories(self):
+        """Test that directories listed in .gitignore files are not walked."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / ".gitignore").write_text("coverage/\nbazel-*\n")
+            (tmp_path / "main.py").write_text("print('Hello')")
+            for generated in ["coverage", "bazel-out", "pkg/data"]:
+                (tmp_path / generated).mkdir(parents=True)
+                (tmp_path / generated / "generated.py").write_text("# generated")
+            (tmp_path / "pkg" / ".gitignore").write_text("data/\n")
+            (tmp_path / "pkg" / "module.py").write_text("pass")
+
+            files_by_ext, _, _ = self.scanner.scan_directory(tmp_dir)
+
+            py_files = sorted(Path(f).name for f in files_by_ext[".py"])
+            assert py_files == ["main.py", "module.py"]
+
+    def test_scan_directory_gitignore_negation(self):
+        """Test that negated patterns keep a directory in the scan."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / ".gitignore").write_text("gen*/\n!generators/\n")
+            for name in ["generated", "generators"]:
+                (tmp_path / name).mkdir()
+                (tmp_path / name / f"{name}.py").write_text("pass")
+
+            files_by_ext, _, _ = self.scanner.scan_directory(tmp_dir)
+            py_files = [Path(f).name for f in files_by_ext[".py"]]
+            assert py_files == ["generators.py"]
+
+            scanner = FileScanner(respect_gitignore=False)
+            files_by_ext, _, _ = scanner.scan_directory(tmp_dir)
+            assert len(files_by_ext[".py"]) == 2
+
+    def _create_mixed_project(self, tmp_path: Path):
+        for directory in ["src/core", "tests/unit", "docs"]:
+            (tmp_path / directory).mkdir(parents=True)
+        files = {
+            "main.py": "print('hi')",
+            "setup.py": "",
+            "README.md": "# Readme",
+            "LICENSE": "MIT",
+            "data.bin": "",
+            "src/app.js": "",
+            "src/core/engine.py": "",
+            "src/core/settings.yaml": "",
+            "tests/unit/test_engine.py": "",
+            "tests/unit/conftest.py": "",
+            "docs/guide.rst": "",
+            "debug.log": "",
+        }
+        for name, content in files.items():
+            (tmp_path / name).write_text(content)
+
+    def test_iter_files_records(self):
+        """Test that streamed records carry names, extensions and flags."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_mixed_project(Path(tmp_dir))
+
+            records = {r.name: r for r in self.scanner.iter_files(tmp_dir)}
+
+            assert "debug.log" not in records
+            engine = records["engine.py"]
+            assert engine.extension == ".py"
+            assert engine.path == str(
+                Path(tmp_dir).resolve() / "src" / "core" / "engine.py"
+            )
+            assert engine.flags & CODE and not engine.flags & TEST
+            # Files below a test directory are tests regardless of their name
+            assert records["conftest.py"].flags & TEST
+            assert records["setup.py"].flags & CONFIG
+            assert records["LICENSE"].extension == ""
+
+    def test_iter_files_invalid_path(self):
+        """Test that invalid paths are rejected before iteration starts."""
+        with pytest.raises(ValueError, match="Invalid project path"):
+            self.scanner.iter_files("/nonexistent/path")
+
+    def test_iter_files_respects_max_files(self):
+        """Test that streaming stops at max_files."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_mixed_project(Path(tmp_dir))
+
+            scanner = FileScanner(max_files=3)
+            assert len(list(scanner.iter_files(tmp_dir))) == 3
+
+    def test_summarize_matches_scan_directory(self):
+        """Test that the aggregate-only scan reports the same totals."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_mixed_project(Path(tmp_dir))
+
+            files_by_ext, structure, stats = self.scanner.scan_directory(tmp_dir)
+            summary, summary_structure, summary_stats = self.scanner.summarize(tmp_dir)
+
+            assert summary_stats == stats
+            assert summary.extension_counts == {
+                ext: len(files) for ext, files in files_by_ext.items()
+            }
+            assert summary.extension_samples == {
+                ext: files[: FileScanner.SAMPLES_PER_EXTENSION]
+                for ext, files in files_by_ext.items()
+            }
+            assert "readme.md" in summary.file_names
+            assert {"src", "core", "unit"} <= summary.directory_names
+            assert summary_structure.has_src_dir == structure.has_src_dir
+            assert summary_structure.has_docs_dir == structure.has_docs_dir
+            assert sorted(summary_structure.test_directories) == sorted(
+                structure.test_directories
+            )
+            assert sorted(summary_structure.source_directories) == sorted(
+                structure.source_directories
+            )
+            assert summary_structure.config_files == structure.config_files
+
+    def test_summaries_report_extension_bytes(self):
+        """Test that every scan mode sums the same sizes per extension."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_mixed_project(Path(tmp_dir))
+            (Path(tmp_dir) / "src" / "core" / "engine.py").write_text("x = 1\n" * 10)
+
+            table, _, _ = self.scanner.scan_table(tmp_dir)
+            summary, _, _ = self.scanner.summarize(tmp_dir)
+            sampled, _, _, _ = self.scanner.sample(tmp_dir, 60.0)
+
+            expected = table.extension_sizes(exclude=NOT_AUTHORED)
+            assert expected[".py"] == len("print('hi')") + len("x = 1\n") * 10
+            assert summary.extension_bytes == expected
+            assert sampled.extension_bytes == expected
+
+    def test_sample_with_ample_budget_is_exact(self):
+        """Test that a sample listing every directory matches a full scan."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_mixed_project(Path(tmp_dir))
+
+            files_by_ext, structure, stats = self.scanner.scan_directory(tmp_dir)
+            summary, sample_structure, sample_stats, sampling = self.scanner.sample(
+                tmp_dir, 60.0, extension_groups={".py": "Python"}
+            )
+
+            assert sampling.completeness == 1.0
+            assert sampling.directories_sampled == sampling.directories_found == 6
+            assert sampling.files_sampled == stats.total_files
+            assert sample_stats == stats
+            assert summary.extension_counts == {
+                ext: len(files) for ext, files in files_by_ext.items()
+            }
+            python = sampling.group_estimates["Python"]
+            assert python.low == python.value == python.high == 5
+            assert sample_structure.has_src_dir == structure.has_src_dir
+
+    def test_sample_stops_when_budget_runs_out(self):
+        """Test that an exhausted budget returns a partial, estimated result."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            for i in range(20):
+                (tmp_path / f"pkg{i}").mkdir()
+                for j in range(i % 4 + 1):
+                    (tmp_path / f"pkg{i}" / f"mod{j}.py").write_text("")
+
+            clock = iter(range(1000))
+            with patch(
+                "airules.analyzer.file_scanner.time.monotonic",
+                side_effect=lambda: next(clock),
+            ):
+                _, _, stats, sampling = self.scanner.sample(tmp_dir, 6)
+
+            # Root plus four subdirectories fit in the budget
+            assert sampling.directories_sampled == 5
+            assert sampling.directories_found == 21
+            assert sampling.completeness == pytest.approx(5 / 21)
+            code = sampling.file_estimates["code_files"]
+            assert sampling.files_sampled <= code.low <= code.value <= code.high
+            assert code.high > code.low
+            assert stats.code_files == round(code.value)
+
+    def test_sample_estimates_cover_skewed_tree(self):
+        """Test that partial samples of an uneven tree bracket its file count."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            total = 0
+            for i in range(8):
+                package = tmp_path / f"pkg{i}"
+                # Only some packages have deep, file-heavy subtrees
+                for j in range(i % 3 * 4):
+                    module_dir = package / f"sub{j}" / "impl"
+                    module_dir.mkdir(parents=True)
+                    for k in range(i + j):
+                        (module_dir / f"mod{k}.py").write_text("")
+                        total += 1
+                package.mkdir(exist_ok=True)
+                (package / "main.py").write_text("")
+                total += 1
+
+            covered = 0
+            for seed in range(20):
+                _, _, stats, sampling = self.scanner.sample(
+                    tmp_dir, 60.0, seed=seed, max_files=60
+                )
+                code = sampling.file_estimates["code_files"]
+                assert sampling.completeness < 1.0
+                covered += code.low <= total <= code.high
+
+            assert covered >= 15
+
+    def test_sample_is_reproducible(self):
+        """Test that the same seed samples the same directories."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_mixed_project(Path(tmp_dir))
+            first = self.scanner.sample(tmp_dir, 60.0, seed=7, max_files=4)
+            second = self.scanner.sample(tmp_dir, 60.0, seed=7, max_files=4)
+
+            assert first[0] == second[0]
+            assert first[3].files_sampled >= 4
+            assert first[3].completeness < 1.0
+
+    def test_sample_budget_outlasts_scanner_file_limit(self):
+        """Test that the scanner's max_files does not cut a budgeted sample short."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            for i in range(10):
+                (tmp_path / f"pkg{i}").mkdir()
+                for j in range(5):
+                    (tmp_path / f"pkg{i}" / f"mod{j}.py").write_text("")
+
+            _, _, stats, sampling = FileScanner(max_files=10).sample(tmp_dir, 60.0)
+
+            assert sampling.files_sampled == 50
+            assert sampling.completeness == 1.0
+            assert stats.code_files == 50
+
+    def test_sample_invalid_budget(self):
+        """Test that a non-positive time budget is rejected."""
+        with pytest.raises(ValueError, match="time_budget"):
+            self.scanner.sample(".", 0)
+        with pytest.raises(ValueError, match="max_files"):
+            self.scanner.sample(".", 1.0, max_files=0)
+
+    def _create_vendored_project(self, tmp_path: Path):
+        for directory in ["src", "vendor/lib", "proto"]:
+            (tmp_path / directory).mkdir(parents=True)
+        (tmp_path / "src" / "app.go").write_text("package main\n")
+        (tmp_path / "vendor" / "lib" / "dep.go").write_text("package lib\n")
+        (tmp_path / "vendor" / "lib" / "dep.js").write_text("")
+        (tmp_path / "proto" / "api.pb.go").write_text("package proto\n")
+
+    def test_vendored_and_generated_files_are_flagged(self):
+        """Test that non-authored files are counted but left out of views."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_vendored_project(Path(tmp_dir))
+
+            files_by_ext, _, stats = self.scanner.scan_directory(tmp_dir)
+            records = {r.name: r for r in self.scanner.iter_files(tmp_dir)}
+
+            assert stats.total_files == 4
+            assert stats.vendored_files == 2
+            assert stats.generated_files == 1
+            assert [Path(f).name for f in files_by_ext[".go"]] == ["app.go"]
+            assert ".js" not in files_by_ext
+            assert records["dep.js"].flags & VENDORED
+            assert records["api.pb.go"].flags & GENERATED
+
+    def test_summarize_skips_vendored_and_generated_files(self):
+        """Test that the aggregate views leave out non-authored files too."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_vendored_project(Path(tmp_dir))
+
+            files_by_ext, _, stats = self.scanner.scan_directory(tmp_dir)
+            summary, _, summary_stats = self.scanner.summarize(tmp_dir)
+
+            assert summary_stats == stats
+            assert summary.extension_counts == {".go": 1}
+            assert summary.file_names == {"app.go"}
+            assert "vendor" not in summary.directory_names
+
+    def test_vendored_root_is_not_vendored(self):
+        """Test that only directories below the project root are checked."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project = Path(tmp_dir) / "vendor"
+            project.mkdir()
+            (project / "main.py").write_text("")
+
+            _, _, stats = self.scanner.scan_directory(str(project))
+
+            assert stats.vendored_files == 0
+
+    def test_get_file_content_sample_skips_generated_files(self):
+        """Test that generated files are not read for content analysis."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            marked = tmp_path / "schema.go"
+            marked.write_text("// Code generated by sqlc. DO NOT EDIT.\npackage db\n")
+            named = tmp_path / "api_pb2.py"
+            named.write_text("import sys\n")
+            authored = tmp_path / "main.go"
+            authored.write_text("package main\n")
+
+            assert self.scanner.get_file_content_sample(str(marked)) is None
+            assert self.scanner.get_file_content_sample(str(named)) is None
+            assert self.scanner.get_file_content_sample(str(authored)) == (
+                "package main"
+            )
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_symlink_cycle_is_walked_once(self, workers):
+        """Test that a link back to an ancestor does not multiply the scan."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / "src").mkdir()
+            (tmp_path / "src" / "app.py").write_text("")
+            (tmp_path / "src" / "loop").symlink_to(tmp_path, target_is_directory=True)
+            (tmp_path / "lib").symlink_to(tmp_path / "src", target_is_directory=True)
+
+            scanner = FileScanner(workers=workers)
+            files_by_ext, _, stats = scanner.scan_directory(tmp_dir)
+
+            assert len(files_by_ext[".py"]) == 1
+            assert stats.total_files == 1
+            assert stats.duplicate_directories == 2
+
+    @pytest.mark.skipif(not hasattr(os, "link"), reason="needs hard links")
+    def test_hard_links_and_file_symlinks_are_counted_once(self):
+        """Test that files reachable under several names are counted once."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / "main.py").write_text("")
+            os.link(tmp_path / "main.py", tmp_path / "copy.py")
+            (tmp_path / "alias.py").symlink_to(tmp_path / "main.py")
+
+            _, _, stats = self.scanner.scan_directory(tmp_dir)
+            _, _, summary_stats = self.scanner.summarize(tmp_dir)
+
+            assert stats.total_files == 1
+            assert stats.duplicate_files == 2
+            assert summary_stats == stats
+
+    @pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+    def test_no_follow_symlinks(self):
+        """Test that symlinked files and directories can be left out."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / "src").mkdir()
+            (tmp_path / "src" / "app.py").write_text("")
+            (tmp_path / "lib").symlink_to(tmp_path / "src", target_is_directory=True)
+            (tmp_path / "alias.py").symlink_to(tmp_path / "src" / "app.py")
+
+            scanner = FileScanner(follow_symlinks=False)
+            files_by_ext, _, stats = scanner.scan_directory(tmp_dir)
+
+            assert files_by_ext[".py"] == [str(tmp_path.resolve() / "src" / "app.py")]
+            assert stats.duplicate_files == stats.duplicate_directories == 0
+
+    @pytest.mark.skipif(not hasattr(os, "link"), reason="needs hard links")
+    def test_cached_listings_keep_duplicates_out(self):
+        """Test that listings reused from the scan index are deduplicated too."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / "a").mkdir()
+            (tmp_path / "b").mkdir()
+            (tmp_path / "a" / "x.py").write_text("")
+            os.link(tmp_path / "a" / "x.py", tmp_path / "b" / "y.py")
+            old = time.time() - 60
+            for directory in (tmp_path / "a", tmp_path / "b", tmp_path):
+                os.utime(directory, (old, old))
+
+            scanner = FileScanner(use_index=True)
+            first = scanner.scan_directory(tmp_dir)[2]
+            second = scanner.scan_directory(tmp_dir)[2]
+
+            assert first.total_files == second.total_files == 1
+            assert second.duplicate_files == 1
+
+    def _create_script_project(self, tmp_path):
+        (tmp_path / "bin").mkdir()
+        (tmp_path / "bin" / "deploy").write_text("#!/usr/bin/env bash\necho\n")
+        (tmp_path / "bin" / "notes").write_text("plain text\n")
+        tool = tmp_path / "manage"
+        tool.write_text("#!/usr/bin/env -S python3 -u\nimport sys\n")
+        tool.chmod(0o755)
+        # Neither executable nor in a script directory, so never read
+        (tmp_path / "helper").write_text("#!/usr/bin/env node\n")
+        (tmp_path / "app.py").write_text("")
+
+    def test_extensionless_scripts_are_detected(self):
+        """Test that shebangs give extensionless scripts a language."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_script_project(Path(tmp_dir))
+
+            files_by_ext, _, stats = self.scanner.scan_directory(tmp_dir)
+            summary, _, summary_stats = self.scanner.summarize(tmp_dir)
+
+            assert sorted(Path(f).name for f in files_by_ext[".py"]) == [
+                "app.py",
+                "manage",
+            ]
+            assert [Path(f).name for f in files_by_ext[".bash"]] == ["deploy"]
+            assert ".js" not in files_by_ext
+            assert stats.code_files == 3
+            assert summary.extension_counts == {".py": 2, ".bash": 1}
+            assert summary_stats == stats
+
+    def test_script_detection_reads_short_heads(self):
+        """Test that shebang checks do not fill the content cache."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_script_project(Path(tmp_dir))
+            # No line counts of the largest files, which go through the cache
+            scanner = FileScanner(largest_files_count=0)
+
+            summary, _, _ = scanner.summarize(tmp_dir)
+
+            assert summary.extension_counts == {".py": 2, ".bash": 1}
+            assert len(scanner.content_cache) == 0
+
+    def test_script_detection_is_capped(self):
+        """Test that no more than script_read_limit files are checked."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._create_script_project(Path(tmp_dir))
+
+            disabled = FileScanner(script_read_limit=0)
+            files_by_ext, _, _ = disabled.scan_directory(tmp_dir)
+            capped = FileScanner(script_read_limit=1)
+            capped_by_ext, _, _ = capped.scan_directory(tmp_dir)
+
+            assert set(files_by_ext) == {".py"}
+            assert len(files_by_ext[".py"]) == 1
+            assert sum(len(files) for files in capped_by_ext.values()) == 2
+            with pytest.raises(ValueError, match="script_read_limit"):
+                FileScanner(script_read_limit=-1)
+
     def test_is_test_file(self):
         """Test test file detection."""
         test_cases = [
@@ -379,6 +937,22 @@ class TestFileScanner:
             finally:
                 os.unlink(tmp_file.name)
 
+    def test_content_reads_share_the_cache(self):
+        """Test that content samples and line counts read each file once."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "app.py"
+            content = "import os\n" * 20
+            path.write_text(content)
+
+            assert self.scanner.get_file_content_sample(str(path), max_lines=3) == (
+                "import os\nimport os\nimport os"
+            )
+            assert self.scanner.get_file_content_sample(str(path)) is not None
+            assert self.scanner._count_lines(str(path), len(content)) == 20
+
+            cache = self.scanner.content_cache
+            assert (cache.hits, cache.misses) == (2, 1)
+
     def test_get_file_content_sample_nonexistent(self):
         """Test file content sampling with non-existent file."""
         content = self.scanner.get_file_content_sample("/nonexistent/file.py")
@@ -497,7 +1071,81 @@ class TestFileScanner:
             assert stats.config_files == 1
             assert stats.documentation_files == 1
             assert stats.other_files == 0  # All files are categorized
-            assert len(stats.largest_files) <= 5
+            assert stats.largest_files == []
+
+    def test_largest_files_considers_every_file(self):
+        """Test that the largest files are found beyond the first files walked."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            for i in range(150):
+                (tmp_path / f"small_{i:03d}.py").write_text("x = 1\n")
+            (tmp_path / "zz_big.py").write_text("x = 1\n" * 500)
+            (tmp_path / "zz_bigger.py").write_text("x = 1\n" * 900)
+            (tmp_path / "archive.bin").write_bytes(b"\0" * 20000)
+
+            scanner = FileScanner(largest_files_count=2)
+            _, _, stats = scanner.scan_directory(tmp_dir)
+
+            assert [Path(p).name for p in stats.largest_files] == [
+                "archive.bin",
+                "zz_bigger.py",
+            ]
+            _, _, summary_stats = scanner.summarize(tmp_dir)
+            assert summary_stats.largest_files == stats.largest_files
+
+    def test_sizes_come_from_listing(self, monkeypatch):
+        """Test that file sizes are taken during the walk, not stat'ed per file."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir).resolve()
+            (tmp_path / "src").mkdir()
+            (tmp_path / "main.py").write_text("x = 1\n")
+            (tmp_path / "src" / "module.py").write_text("x = 1\n" * 10)
+
+            stat_paths = []
+            original_stat = os.stat
+
+            def counting_stat(path, *args, **kwargs):
+                stat_paths.append(os.fspath(path))
+                return original_stat(path, *args, **kwargs)
+
+            monkeypatch.setattr(os, "stat", counting_stat)
+            sizes = {
+                record.name: record.size
+                for record in FileScanner().iter_files(str(tmp_path))
+            }
+
+            assert sizes == {"main.py": 6, "module.py": 60}
+            assert not any(path.endswith(".py") for path in stat_paths)
+
+    def test_count_lines(self):
+        """Test newline counting on binary reads."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cases = {"empty": b"", "one": b"a\n", "unterminated": b"a\nb"}
+            expected = {"empty": 0, "one": 1, "unterminated": 2}
+            for name, content in cases.items():
+                path = Path(tmp_dir) / name
+                path.write_bytes(content)
+                assert self.scanner._count_lines(str(path), len(content)) == (
+                    expected[name]
+                )
+
+    def test_count_lines_byte_cap(self):
+        """Test that long files are extrapolated from the capped read."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "long.txt"
+            content = b"123456789\n" * 1000
+            path.write_bytes(content)
+
+            scanner = FileScanner(line_count_max_bytes=100)
+            assert scanner._count_lines(str(path), len(content)) == 1000
+            assert scanner._count_lines(str(path / "missing"), 0) is None
+
+    def test_init_invalid_largest_files_options(self):
+        """Test validation of the largest-file options."""
+        with pytest.raises(ValueError, match="largest_files_count"):
+            FileScanner(largest_files_count=-1)
+        with pytest.raises(ValueError, match="line_count_max_bytes"):
+            FileScanner(line_count_max_bytes=0)
 
     def test_walk_directory_permission_error(self):
         """Test directory walking with permission errors."""
@@ -508,14 +1156,14 @@ class TestFileScanner:
             (tmp_path / "accessible.py").write_text("print('hello')")
 
             # Mock a permission error for directory traversal
-            original_iterdir = Path.iterdir
+            original_scandir = os.scandir
 
-            def mock_iterdir(self):
-                if "inaccessible" in str(self):
+            def mock_scandir(path):
+                if "inaccessible" in str(path):
                     raise PermissionError("Access denied")
-                return original_iterdir(self)
+                return original_scandir(path)
 
-            with patch.object(Path, "iterdir", mock_iterdir):
+            with patch("airules.analyzer.file_scanner.os.scandir", mock_scandir):
                 # Create inaccessible directory
                 inaccessible_dir = tmp_path / "inaccessible"
                 inaccessible_dir.mkdir()
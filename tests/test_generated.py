@@ -0,0 +1,47 @@
+"""Tests for vendored and generated file detection."""
+
+import os
+
+import pytest
+
+from airules.analyzer.generated import (
+    HEADER_BYTES,
+    is_generated_header,
+    is_vendored_dir,
+)
+
+
+class TestGeneratedDetection:
+    """Test cases for the vendored and generated file rules."""
+
+    def test_vendored_dirs(self):
+        """Test that every part of the directory path is checked."""
+        assert is_vendored_dir(os.path.join("vendor", "github.com"))
+        assert is_vendored_dir("web/Third_Party")
+        assert not is_vendored_dir("")
+        assert not is_vendored_dir(os.path.join("src", "vendors.d"))
+
+    def test_custom_vendored_dirs(self):
+        """Test checking against another set of directory names."""
+        assert is_vendored_dir(os.path.join("src", "External"), {"external"})
+        assert not is_vendored_dir("vendor", {"external"})
+
+    @pytest.mark.parametrize(
+        "header",
+        [
+            b"// Code generated by protoc-gen-go. DO NOT EDIT.\n",
+            b"/**\n * @generated SignedSource<<abc>>\n */\n",
+            b"// <auto-generated>\n//     This code was generated.\n",
+            "# Generated by the protocol buffer compiler.  DO NOT EDIT!\n",
+        ],
+    )
+    def test_generated_headers(self, header):
+        """Test generator markers in bytes and text headers."""
+        assert is_generated_header(header)
+
+    def test_marker_past_header_is_ignored(self):
+        """Test that only the first HEADER_BYTES are inspected."""
+        head = b"x" * HEADER_BYTES + b"// Code generated by tool. DO NOT EDIT.\n"
+
+        assert not is_generated_header(head)
+        assert not is_generated_header(b"def main():\n    pass\n")
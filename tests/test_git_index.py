@@ -0,0 +1,227 @@
+"""Tests for the git index reader and the git scan backend."""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from airules.analyzer.file_scanner import FileScanner
+from airules.analyzer.git_index import GitIndexError, find_repository, read_index
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not found")
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "core.autocrlf=false", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def _init_repo(path: Path) -> Path:
+    _git(path, "init", "-q")
+    (path / "src" / "pkg").mkdir(parents=True)
+    (path / "tests").mkdir()
+    (path / "node_modules" / "dep").mkdir(parents=True)
+    (path / "main.py").write_text("print('hi')\n")
+    (path / "README.md").write_text("# Project\n")
+    (path / "src" / "app.js").write_text("console.log(1)\n")
+    (path / "src" / "pkg" / "module.py").write_text("pass\n")
+    (path / "tests" / "test_module.py").write_text("def test(): pass\n")
+    (path / "node_modules" / "dep" / "index.js").write_text("module.exports = 1\n")
+    _git(path, "add", "-A")
+    return path
+
+
+class TestReadIndex:
+    """Test cases for read_index."""
+
+    @pytest.mark.parametrize("version", [2, 3, 4])
+    def test_matches_git_ls_files(self, tmp_path, version):
+        """Test that every index version lists the same files as git."""
+        repo = _init_repo(tmp_path)
+        _git(repo, "update-index", "--index-version", str(version))
+
+        entries = read_index(str(repo / ".git"))
+
+        expected = _git(repo, "ls-files").splitlines()
+        assert [entry.path for entry in entries] == expected
+        sizes = {entry.path: entry.size for entry in entries}
+        assert sizes["main.py"] == (repo / "main.py").stat().st_size
+        mtimes = {entry.path: entry.mtime_ns for entry in entries}
+        assert mtimes["main.py"] // 1_000_000_000 == int(
+            (repo / "main.py").stat().st_mtime
+        )
+
+    def test_intent_to_add_uses_extended_flags(self, tmp_path):
+        """Test that version 3 extended flags are parsed."""
+        repo = _init_repo(tmp_path)
+        (repo / "later.py").write_text("pass\n")
+        _git(repo, "add", "-N", "later.py")
+
+        paths = [entry.path for entry in read_index(str(repo / ".git"))]
+
+        assert "later.py" in paths
+        assert "src/pkg/module.py" in paths
+
+    def test_skips_symlinks_and_submodules(self, tmp_path):
+        """Test that only regular files are returned."""
+        repo = _init_repo(tmp_path)
+        blob = _git(repo, "hash-object", "-w", "main.py").strip()
+        _git(repo, "update-index", "--add", "--cacheinfo", f"120000,{blob},link")
+        _git(repo, "update-index", "--add", "--cacheinfo", f"160000,{blob},vendor/sub")
+
+        paths = [entry.path for entry in read_index(str(repo / ".git"))]
+
+        assert "link" not in paths
+        assert "vendor/sub" not in paths
+        assert "main.py" in paths
+
+    def test_split_index_is_rejected(self, tmp_path):
+        """Test that a split index is reported as unsupported."""
+        repo = _init_repo(tmp_path)
+        _git(repo, "update-index", "--split-index")
+
+        with pytest.raises(GitIndexError):
+            read_index(str(repo / ".git"))
+
+    def test_missing_or_corrupt_index(self, tmp_path):
+        """Test errors for unreadable index files."""
+        git_dir = tmp_path / ".git"
+        git_dir.mkdir()
+        with pytest.raises(GitIndexError):
+            read_index(str(git_dir))
+
+        (git_dir / "index").write_bytes(b"DIRC\x00\x00\x00\x02\x00\x00\x00\x05")
+        with pytest.raises(GitIndexError):
+            read_index(str(git_dir))
+
+
+class TestFindRepository:
+    """Test cases for find_repository."""
+
+    def test_finds_enclosing_work_tree(self, tmp_path):
+        """Test searching upwards for the .git directory."""
+        (tmp_path / ".git").mkdir()
+        nested = tmp_path / "a" / "b"
+        nested.mkdir(parents=True)
+
+        assert find_repository(str(nested)) == (
+            str(tmp_path),
+            str(tmp_path / ".git"),
+        )
+
+    def test_follows_gitdir_file(self, tmp_path):
+        """Test linked worktrees whose .git is a file."""
+        worktree = tmp_path / "worktree"
+        worktree.mkdir()
+        (worktree / ".git").write_text("gitdir: ../main/.git/worktrees/wt\n")
+
+        assert find_repository(str(worktree)) == (
+            str(worktree),
+            os.path.normpath(str(tmp_path / "main" / ".git" / "worktrees" / "wt")),
+        )
+
+
+class TestGitBackend:
+    """Test FileScanner with the git backend."""
+
+    def test_invalid_backend(self):
+        """Test that unknown backends are rejected."""
+        with pytest.raises(ValueError):
+            FileScanner(backend="svn")
+
+    def test_matches_walk_for_tracked_tree(self, tmp_path):
+        """Test that the git backend reports the same files as the walk."""
+        repo = _init_repo(tmp_path)
+
+        walk_ext, walk_structure, walk_stats = FileScanner().scan_directory(str(repo))
+        git_ext, git_structure, git_stats = FileScanner(backend="git").scan_directory(
+            str(repo)
+        )
+
+        assert {k: sorted(v) for k, v in git_ext.items()} == {
+            k: sorted(v) for k, v in walk_ext.items()
+        }
+        assert git_stats.total_files == walk_stats.total_files
+        assert git_stats.test_files == walk_stats.test_files
+        assert git_stats.code_files == walk_stats.code_files
+        assert sorted(git_structure.source_directories) == sorted(
+            walk_structure.source_directories
+        )
+
+    def test_sizes_match_walk(self, tmp_path):
+        """Test that file sizes are taken from the index entries."""
+        repo = _init_repo(tmp_path)
+
+        walk = {r.path: r.size for r in FileScanner().iter_files(str(repo))}
+        git = {r.path: r.size for r in FileScanner(backend="git").iter_files(str(repo))}
+
+        assert git == walk
+
+    def test_untracked_files_are_skipped(self, tmp_path):
+        """Test that only tracked files are reported."""
+        repo = _init_repo(tmp_path)
+        (repo / "scratch.py").write_text("pass\n")
+
+        files_by_ext, _, _ = FileScanner(backend="git").scan_directory(str(repo))
+
+        names = {Path(f).name for f in files_by_ext[".py"]}
+        assert "scratch.py" not in names
+        assert "module.py" in names
+
+    def test_subdirectory_of_work_tree(self, tmp_path):
+        """Test scanning a project nested inside the repository."""
+        repo = _init_repo(tmp_path)
+
+        files_by_ext, _, _ = FileScanner(backend="git").scan_directory(
+            str(repo / "src")
+        )
+
+        assert sorted(files_by_ext) == [".js", ".py"]
+        assert files_by_ext[".py"] == [str(repo / "src" / "pkg" / "module.py")]
+
+    def test_max_depth(self, tmp_path):
+        """Test that files below max_depth are skipped."""
+        repo = _init_repo(tmp_path)
+
+        files_by_ext, _, _ = FileScanner(max_depth=1, backend="git").scan_directory(
+            str(repo)
+        )
+
+        assert str(repo / "src" / "pkg" / "module.py") not in files_by_ext[".py"]
+        assert str(repo / "main.py") in files_by_ext[".py"]
+
+    def test_directories_in_priority_order(self, tmp_path):
+        """Test that index batches follow the walk's traversal priority."""
+        repo = _init_repo(tmp_path)
+        (repo / "vendor").mkdir()
+        (repo / "vendor" / "dep.py").write_text("pass\n")
+        (repo / "docs").mkdir()
+        (repo / "docs" / "guide.md").write_text("# Guide\n")
+        _git(repo, "add", "-A")
+
+        batches = FileScanner(backend="git")._read_git_index(str(repo))
+
+        assert [os.path.relpath(directory, repo) for directory, _, _ in batches] == [
+            ".",
+            "src",
+            "tests",
+            os.path.join("src", "pkg"),
+            "docs",
+            "vendor",
+        ]
+
+    def test_falls_back_to_walk(self, tmp_path):
+        """Test that projects outside a work tree are walked."""
+        (tmp_path / "main.py").write_text("pass\n")
+
+        files_by_ext, _, _ = FileScanner(backend="git").scan_directory(str(tmp_path))
+
+        assert files_by_ext[".py"] == [str(tmp_path / "main.py")]
@@ -0,0 +1,85 @@
+"""Tests for .gitignore rule compilation and matching."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from airules.analyzer.gitignore import GitIgnore, is_ignored, load_parent_rules
+
+BASE = os.path.join(os.sep, "repo")
+
+
+def _path(*parts):
+    return os.path.join(BASE, *parts)
+
+
+class TestGitIgnore:
+    """Test cases for GitIgnore matching."""
+
+    @pytest.mark.parametrize(
+        "pattern,path,is_dir,expected",
+        [
+            ("coverage/", ("coverage",), True, True),
+            ("coverage/", ("pkg", "coverage"), True, True),
+            ("coverage/", ("coverage",), False, None),
+            ("/build", ("build",), True, True),
+            ("/build", ("pkg", "build"), True, None),
+            ("docs/generated", ("docs", "generated"), True, True),
+            ("docs/generated", ("pkg", "docs", "generated"), True, None),
+            ("bazel-*", ("bazel-out",), True, True),
+            ("**/fixtures", ("a", "b", "fixtures"), True, True),
+            ("data/**", ("data", "raw"), True, True),
+            ("a/**/z", ("a", "z"), True, True),
+            ("a/**/z", ("a", "b", "c", "z"), True, True),
+            ("*.egg-info", ("pkg.egg-info",), True, True),
+            ("?ache", ("cache",), True, True),
+            ("[Tt]mp", ("Tmp",), True, True),
+            ("[!T]mp", ("Tmp",), True, None),
+            ("\\#notes", ("#notes",), True, True),
+            ("src", ("lib",), True, None),
+        ],
+    )
+    def test_pattern_matching(self, pattern, path, is_dir, expected):
+        """Test individual pattern semantics."""
+        ignore = GitIgnore(BASE, [pattern])
+        assert ignore.match(_path(*path), is_dir) is expected
+
+    def test_comments_and_blank_lines(self):
+        """Test that comments and blank lines produce no rules."""
+        ignore = GitIgnore(BASE, ["# comment", "", "   ", "/"])
+        assert ignore.match(_path("anything"), True) is None
+
+    def test_negation_last_rule_wins(self):
+        """Test that a later negation re-includes a path."""
+        ignore = GitIgnore(BASE, ["out*/", "!output/", "outlier/"])
+        assert ignore.match(_path("out"), True) is True
+        assert ignore.match(_path("output"), True) is False
+        assert ignore.match(_path("outlier"), True) is True
+
+    def test_nested_rules_override_parent(self):
+        """Test that deeper .gitignore files take precedence."""
+        parent = GitIgnore(BASE, ["generated/"])
+        child = GitIgnore(_path("pkg"), ["!generated/"])
+        rules = (parent, child)
+
+        assert is_ignored(rules, _path("generated"), True)
+        assert not is_ignored(rules, _path("pkg", "generated"), True)
+
+    def test_load_parent_rules(self, tmp_path):
+        """Test loading rules from the enclosing work tree."""
+        (tmp_path / ".git" / "info").mkdir(parents=True)
+        (tmp_path / ".git" / "info" / "exclude").write_text("scratch/\n")
+        (tmp_path / ".gitignore").write_text("coverage/\n")
+        project = tmp_path / "packages" / "app"
+        project.mkdir(parents=True)
+
+        rules = load_parent_rules(str(project))
+
+        assert is_ignored(rules, str(project / "coverage"), True)
+        assert is_ignored(rules, str(project / "scratch"), True)
+        assert not is_ignored(rules, str(project / "src"), True)
+
+    def test_load_parent_rules_outside_work_tree(self, tmp_path):
+        """Test that no rules are loaded outside a git work tree."""
+        assert load_parent_rules(str(Path(tmp_path))) == ()
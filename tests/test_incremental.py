@@ -0,0 +1,151 @@
+"""Tests for incremental scans and analysis."""
+
+import os
+
+from airules.analyzer import CodebaseAnalyzer, FileScanner
+from airules.analyzer.incremental import IncrementalAnalyzer, IncrementalScan
+
+
+def _project(tmp_path):
+    (tmp_path / "main.py").write_text("print('hi')")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_app.py").write_text("")
+    return tmp_path
+
+
+def _summaries_match(scan, tmp_path):
+    summary, structure, stats = scan.summarize()
+    expected_summary, expected_structure, expected_stats = FileScanner().summarize(
+        str(tmp_path)
+    )
+    assert summary.extension_counts == expected_summary.extension_counts
+    assert summary.file_names == expected_summary.file_names
+    assert summary.directory_names == expected_summary.directory_names
+    assert stats == expected_stats
+    assert sorted(structure.source_directories) == sorted(
+        expected_structure.source_directories
+    )
+    assert sorted(structure.test_directories) == sorted(
+        expected_structure.test_directories
+    )
+
+
+class TestIncrementalScan:
+    """Test cases for IncrementalScan."""
+
+    def test_initial_scan_matches_summarize(self, tmp_path):
+        """Test that the listings aggregate to the same summary as a walk."""
+        scan = IncrementalScan(str(_project(tmp_path)))
+        scan.scan()
+
+        assert set(scan.directories) == {
+            str(tmp_path),
+            str(tmp_path / "src"),
+            str(tmp_path / "tests"),
+        }
+        _summaries_match(scan, tmp_path)
+
+    def test_refresh_only_changed_directories(self, tmp_path):
+        """Test that only reported directories are listed again."""
+        scan = IncrementalScan(str(_project(tmp_path)))
+        scan.scan()
+        (tmp_path / "src" / "lib.js").write_text("")
+        (tmp_path / "tests" / "test_lib.py").write_text("")
+
+        assert scan.refresh([str(tmp_path / "src")]) == {str(tmp_path / "src")}
+        summary, _, stats = scan.summarize()
+
+        # The unreported change in tests/ is not seen yet
+        assert summary.extension_counts == {".py": 3, ".js": 1}
+        assert stats.total_files == 4
+
+    def test_refresh_walks_new_and_drops_removed_directories(self, tmp_path):
+        """Test that subtrees appearing or vanishing are followed."""
+        scan = IncrementalScan(str(_project(tmp_path)))
+        scan.scan()
+        (tmp_path / "docs" / "guide").mkdir(parents=True)
+        (tmp_path / "docs" / "guide" / "index.md").write_text("")
+        (tmp_path / "tests" / "test_app.py").unlink()
+        (tmp_path / "tests").rmdir()
+
+        refreshed = scan.refresh([str(tmp_path), str(tmp_path / "tests")])
+
+        # tests/ went away with the root's re-listing, before its own turn
+        assert refreshed == {str(tmp_path)}
+        assert str(tmp_path / "tests") not in scan.directories
+        assert str(tmp_path / "docs" / "guide") in scan.directories
+        _summaries_match(scan, tmp_path)
+
+    def test_refresh_follows_gitignore_changes(self, tmp_path):
+        """Test that editing a .gitignore re-applies it to the subtree."""
+        scan = IncrementalScan(str(_project(tmp_path)))
+        scan.scan()
+        (tmp_path / ".gitignore").write_text("src/\n")
+
+        scan.refresh([str(tmp_path)])
+
+        assert str(tmp_path / "src") not in scan.directories
+        _summaries_match(scan, tmp_path)
+
+    def test_refresh_keeps_link_to_tracked_directory_a_duplicate(self, tmp_path):
+        """Test that a new link to a tracked directory is not walked again."""
+        scan = IncrementalScan(
+            str(_project(tmp_path)), FileScanner(follow_symlinks=True)
+        )
+        scan.scan()
+        (tmp_path / "lib").symlink_to(tmp_path / "src", target_is_directory=True)
+
+        scan.refresh([str(tmp_path)])
+        summary, _, stats = scan.summarize()
+
+        assert summary.extension_counts == {".py": 3}
+        assert stats.total_files == 3
+        assert stats.duplicate_directories == 1
+
+    def test_refresh_walks_moved_directory(self, tmp_path):
+        """Test that a renamed directory is listed under its new path."""
+        scan = IncrementalScan(str(_project(tmp_path)))
+        scan.scan()
+        (tmp_path / "src").rename(tmp_path / "lib")
+
+        scan.refresh([str(tmp_path)])
+
+        assert str(tmp_path / "lib") in scan.directories
+        _summaries_match(scan, tmp_path)
+
+    def test_refresh_ignores_untracked_directories(self, tmp_path):
+        """Test that paths outside the scan are skipped."""
+        scan = IncrementalScan(str(_project(tmp_path)))
+        scan.scan()
+
+        assert scan.refresh([os.path.join(str(tmp_path), "missing")]) == set()
+
+
+class TestIncrementalAnalyzer:
+    """Test cases for IncrementalAnalyzer."""
+
+    def test_update_matches_full_analysis(self, tmp_path):
+        """Test that an updated analysis equals analyzing from scratch."""
+        analyzer = CodebaseAnalyzer()
+        incremental = IncrementalAnalyzer(analyzer, str(_project(tmp_path)))
+        assert incremental.analyze().primary_language.name == "Python"
+
+        for index in range(5):
+            (tmp_path / "src" / f"module{index}.ts").write_text("")
+        result = incremental.update([str(tmp_path / "src")])
+        expected = analyzer.analyze(str(tmp_path))
+
+        assert result.primary_language.name == "TypeScript"
+        assert [
+            (language.name, language.file_count) for language in result.languages
+        ] == [(language.name, language.file_count) for language in expected.languages]
+        assert result.framework_hints == expected.framework_hints
+
+    def test_update_without_tracked_changes(self, tmp_path):
+        """Test that changes outside the scan produce no new analysis."""
+        incremental = IncrementalAnalyzer(CodebaseAnalyzer(), str(_project(tmp_path)))
+        incremental.analyze()
+
+        assert incremental.update([]) is None
@@ -0,0 +1,165 @@
+"""Tests for the compact scan path table."""
+
+import os
+
+from airules.analyzer.file_classifier import CODE, CONFIG, DOC, TEST
+from airules.analyzer.path_table import PathTable
+
+ROOT = os.path.join(os.sep, "project")
+SRC = os.path.join(ROOT, "src")
+TESTS = os.path.join(ROOT, "tests")
+
+
+def _table():
+    table = PathTable()
+    table.add(ROOT, "setup.py", ".py", CODE | CONFIG)
+    table.add(ROOT, "README.md", ".md", DOC)
+    table.add(SRC, "app.py", ".py", CODE)
+    table.add(SRC, "Makefile", "", CONFIG)
+    table.add(TESTS, "test_app.py", ".py", CODE | TEST)
+    table.add(SRC, "données.bin", ".bin", 0)
+    return table
+
+
+class TestPathTable:
+    """Test cases for PathTable."""
+
+    def test_interns_directories_and_extensions(self):
+        """Test that directories and extensions are stored once."""
+        table = _table()
+
+        assert len(table) == 6
+        assert table.directories == [ROOT, SRC, TESTS]
+        assert table.extensions == ["", ".py", ".md", ".bin"]
+
+    def test_row_accessors(self):
+        """Test reading individual files back."""
+        table = _table()
+
+        assert table.name(0) == "setup.py"
+        assert table.path(2) == os.path.join(SRC, "app.py")
+        assert table.path(5) == os.path.join(SRC, "données.bin")
+        assert table.flags(4) == CODE | TEST
+        assert table.extension(3) == ""
+
+    def test_paths_filtered_by_flags(self):
+        """Test materializing filtered path views."""
+        table = _table()
+
+        assert table.paths(CONFIG, exclude=TEST) == [
+            os.path.join(ROOT, "setup.py"),
+            os.path.join(SRC, "Makefile"),
+        ]
+        assert table.paths(exclude=CODE | CONFIG | DOC | TEST) == [
+            os.path.join(SRC, "données.bin")
+        ]
+        assert len(table.paths()) == 6
+
+    def test_count(self):
+        """Test counting files by flags."""
+        table = _table()
+
+        assert table.count() == 6
+        assert table.count(CODE) == 3
+        assert table.count(DOC, exclude=TEST | CONFIG) == 1
+        assert table.count(TEST | DOC) == 2
+
+    def test_extension_views(self):
+        """Test the legacy extension mapping and per-extension counts."""
+        table = _table()
+
+        assert table.files_by_extension() == {
+            ".py": [
+                os.path.join(ROOT, "setup.py"),
+                os.path.join(SRC, "app.py"),
+                os.path.join(TESTS, "test_app.py"),
+            ],
+            ".md": [os.path.join(ROOT, "README.md")],
+            ".bin": [os.path.join(SRC, "données.bin")],
+        }
+        assert table.extension_counts() == {".py": 3, ".md": 1, ".bin": 1}
+
+    def test_extension_column_widens(self):
+        """Test that more extensions than the narrow column holds are kept."""
+        table = PathTable()
+        for i in range(70000):
+            table.add(ROOT, f"f.e{i}", f".e{i}", 0)
+
+        assert table.extension(69999) == ".e69999"
+        assert table.name(69999) == "f.e69999"
+
+    def test_size_column_widens(self):
+        """Test that sizes past the narrow column are kept."""
+        table = PathTable()
+        table.add(ROOT, "a.py", ".py", 0, -1)
+        table.add(ROOT, "big.bin", ".bin", 0, 5 * 2**30)
+
+        assert table.size(0) == -1
+        assert table.size(1) == 5 * 2**30
+        assert table.extension_sizes() == {".bin": 5 * 2**30}
+
+    def test_empty_table(self):
+        """Test views of an empty table."""
+        table = PathTable()
+
+        assert len(table) == 0
+        assert table.paths() == []
+        assert table.count(CODE) == 0
+        assert table.files_by_extension() == {}
+        assert table.extension_sizes() == {}
+        assert table.largest(3) == []
+
+    def test_existing_files(self):
+        """Test finding given files without touching the filesystem."""
+        table = _table()
+
+        found = table.existing_files(
+            [
+                os.path.join(SRC, "app.py"),
+                os.path.join(SRC, "setup.py"),
+                os.path.join(ROOT, "lib", "app.py"),
+                os.path.join(ROOT, "setup.py"),
+            ]
+        )
+
+        assert found == {os.path.join(SRC, "app.py"), os.path.join(ROOT, "setup.py")}
+        assert PathTable().existing_files([os.path.join(SRC, "app.py")]) == set()
+
+    def test_directory_paths(self):
+        """Test that ancestors of the file directories are included."""
+        table = PathTable()
+        table.add(os.path.join(SRC, "app", "views"), "index.py", ".py", CODE)
+
+        directories = table.directory_paths()
+
+        assert {SRC, os.path.join(SRC, "app"), ROOT, os.sep} <= directories
+        assert TESTS not in directories
+
+    def test_extension_sizes(self):
+        """Test summing file sizes per extension."""
+        table = PathTable()
+        table.add(ROOT, "setup.py", ".py", CODE | CONFIG, 100)
+        table.add(SRC, "app.py", ".py", CODE, 2500)
+        table.add(SRC, "gone.py", ".py", CODE, -1)
+        table.add(TESTS, "test_app.py", ".py", CODE | TEST, 400)
+        table.add(ROOT, "README.md", ".md", DOC, 0)
+        table.add(SRC, "Makefile", "", CONFIG, 50)
+
+        assert [table.size(index) for index in range(3)] == [100, 2500, -1]
+        assert table.extension_sizes() == {".py": 3000}
+        assert table.extension_sizes(exclude=TEST) == {".py": 2600}
+        assert table.extension_sizes(exclude=CODE) == {}
+
+    def test_largest(self):
+        """Test finding the largest files without unknown sizes."""
+        table = PathTable()
+        for index, size in enumerate([30, -1, 10, 50, 20]):
+            table.add(SRC, f"f{index}.py", ".py", CODE, size)
+
+        assert sorted(table.largest(3), reverse=True) == [
+            (50, os.path.join(SRC, "f3.py")),
+            (30, os.path.join(SRC, "f0.py")),
+            (20, os.path.join(SRC, "f4.py")),
+        ]
+        assert len(table.largest(10)) == 4
+        assert table.largest(0) == []
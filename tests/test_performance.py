@@ -1,5 +1,6 @@
 """Performance benchmarking tests for airules auto feature."""
 
+import os
 import time
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -7,6 +8,11 @@ from unittest.mock import Mock, patch
 import pytest
 from typer.testing import CliRunner
 
+from airules.analyzer.file_classifier import CODE, CONFIG, DOC, IGNORED, TEST
+from airules.analyzer.file_scanner import FileScanner
+from airules.analyzer.framework_detector import FrameworkDetector
+from airules.analyzer.language_detector import LanguageDetector
+from airules.analyzer.path_table import PathTable
 from airules.cli import app
 from tests.fixtures import (
     create_python_project,
@@ -23,6 +29,119 @@ def mock_venv_check(monkeypatch):
     monkeypatch.setattr("airules.venv_check.in_virtualenv", lambda: True)
 
 
+def _count_fs_calls(monkeypatch):
+    """Wrap stat/listing functions in ``os`` and count how often they are called."""
+    counts = {"stat": 0, "list": 0}
+
+    def counting(func, key):
+        def wrapper(*args, **kwargs):
+            counts[key] += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    for name in ("stat", "lstat"):
+        monkeypatch.setattr(os, name, counting(getattr(os, name), "stat"))
+    for name in ("scandir", "listdir"):
+        monkeypatch.setattr(os, name, counting(getattr(os, name), "list"))
+    return counts
+
+
+def _legacy_walk(scanner, directory, depth=0):
+    """Reference walker using ``Path.iterdir`` plus ``is_file``/``is_dir`` per entry."""
+    if depth > scanner.max_depth:
+        return
+    try:
+        for item in directory.iterdir():
+            if item.is_file():
+                yield item
+            elif item.is_dir() and not scanner._should_ignore_dir(item):
+                yield from _legacy_walk(scanner, item, depth + 1)
+    except OSError:
+        pass
+
+
+def _legacy_classify(scanner, name):
+    """Reference classification looping fnmatch over every pattern set."""
+    import fnmatch
+
+    flags = 0
+    if any(fnmatch.fnmatch(name, p) for p in scanner.IGNORE_PATTERNS):
+        flags |= IGNORED
+    lower_name = name.lower()
+    if any(lower_name.endswith(ext) for ext in scanner.TEST_EXTENSIONS) or any(
+        fnmatch.fnmatch(lower_name, p) for p in scanner.TEST_PATTERNS
+    ):
+        flags |= TEST
+    if any(fnmatch.fnmatch(name, p) for p in scanner.CONFIG_PATTERNS):
+        flags |= CONFIG
+    if any(fnmatch.fnmatch(name, p) for p in scanner.DOC_PATTERNS):
+        flags |= DOC
+    return flags
+
+
+def _legacy_detect_from_content(detector, content, candidates):
+    """Reference scoring running findall once per pattern."""
+    scores = {
+        lang: sum(
+            len(pattern.findall(content))
+            for pattern in detector._compiled_patterns[lang]
+        )
+        for lang in candidates
+    }
+    best = max(scores, key=scores.get)
+    return best if scores[best] else None
+
+
+def _legacy_framework_source_files(project_path):
+    """Reference source listing: one unpruned rglob per extension."""
+    import fnmatch
+
+    from airules.analyzer.generated import GENERATED_PATTERNS, VENDORED_DIRS
+
+    source_files = []
+    for ext in FrameworkDetector.SOURCE_EXTENSIONS:
+        source_files.extend(project_path.rglob(f"*{ext}"))
+    return [
+        source_file
+        for source_file in source_files
+        if not any(
+            fnmatch.fnmatch(source_file.name.lower(), pattern)
+            for pattern in GENERATED_PATTERNS
+        )
+        and not any(
+            part.lower() in VENDORED_DIRS
+            for part in source_file.relative_to(project_path).parts[:-1]
+        )
+    ][:100]
+
+
+def _legacy_match_file_patterns(content):
+    """Reference matching running every framework's patterns in turn."""
+    import re
+
+    matches = []
+    for key, patterns in FrameworkDetector.FILE_PATTERN_MATCHER.patterns.items():
+        for index, pattern in enumerate(patterns):
+            if re.search(pattern, content, re.IGNORECASE):
+                matches.append((key, index))
+                break
+    return tuple(matches)
+
+
+def _legacy_dependency_frameworks(package_info):
+    """Reference matching: substring tests of every framework against every dep."""
+    detected = []
+    deps = package_info.dependencies + package_info.dev_dependencies
+    for key, definition in FrameworkDetector.FRAMEWORK_DEFINITIONS.items():
+        framework_deps = definition.get("dependencies", [])
+        for dep in deps:
+            if any(fw_dep.lower() in dep.name.lower() for fw_dep in framework_deps):
+                detected.append(key)
+                break
+    return detected
+
+
 @pytest.mark.performance
 class TestPerformanceBenchmarks:
     """Performance benchmarking tests."""
@@ -86,6 +205,213 @@ class TestPerformanceBenchmarks:
         # Large projects should complete within reasonable time
         assert benchmark.stats["mean"] < 5.0  # Less than 5 seconds
 
+    def test_file_scanner_syscalls_per_file(self, tmp_path, benchmark, monkeypatch):
+        """Benchmark filesystem calls per file for the legacy and scandir walkers."""
+        for i in range(20):
+            package_dir = tmp_path / "src" / f"package_{i}"
+            package_dir.mkdir(parents=True)
+            for j in range(25):
+                (package_dir / f"module_{j}.py").write_text("pass\n")
+
+        scanner = FileScanner()
+        # Finding the repository's ignore files happens once per walk, not per
+        # directory or file, so keep it out of the measured region
+        root_rules = scanner._root_gitignore_rules(str(tmp_path))
+        monkeypatch.setattr(scanner, "_root_gitignore_rules", lambda root: root_rules)
+        counts = _count_fs_calls(monkeypatch)
+
+        legacy_files = len(list(_legacy_walk(scanner, tmp_path)))
+        legacy_calls = counts["stat"] + counts["list"]
+
+        def walk():
+            return sum(
+                len(names) for _, names, _ in scanner._walk_directory(str(tmp_path))
+            )
+
+        counts["stat"] = counts["list"] = 0
+        file_count = walk()
+        scandir_calls = counts["stat"] + counts["list"]
+        stat_calls = counts["stat"]
+        list_calls = counts["list"]
+
+        benchmark(walk)
+
+        legacy_per_file = legacy_calls / legacy_files
+        scandir_per_file = scandir_calls / file_count
+        benchmark.extra_info["legacy_calls_per_file"] = legacy_per_file
+        benchmark.extra_info["scandir_calls_per_file"] = scandir_per_file
+
+        assert file_count == legacy_files == 500
+        # Entry types and sizes come from the listing's entries, so no path is
+        # stat'ed per file. Each directory is stat'ed once before it is listed:
+        # its device and inode detect symlink loops and its mtime keys the
+        # scan index.
+        assert stat_calls == list_calls == 22
+        assert scandir_per_file < legacy_per_file
+
+    def test_file_classifier_ns_per_file(self, benchmark):
+        """Benchmark compiled classification against per-pattern fnmatch loops."""
+        scanner = FileScanner()
+        names = [
+            f"{stem}_{i}{ext}"
+            for i in range(200)
+            for stem, ext in [
+                ("module", ".py"),
+                ("component", ".test.tsx"),
+                ("README", ".md"),
+                ("settings", ".yaml"),
+                ("bundle", ".min.js"),
+            ]
+        ]
+        classifier = scanner._classifier
+        classify = classifier.classify
+
+        start = time.perf_counter()
+        for name in names:
+            _legacy_classify(scanner, name)
+        legacy_ns = (time.perf_counter() - start) * 1e9 / len(names)
+
+        def classify_all():
+            # Measure the compiled tables rather than the memo of seen names
+            classifier._cache.clear()
+            return [classify(name) for name in names]
+
+        benchmark(classify_all)
+        compiled_ns = benchmark.stats["mean"] * 1e9 / len(names)
+        benchmark.extra_info["legacy_ns_per_file"] = legacy_ns
+        benchmark.extra_info["compiled_ns_per_file"] = compiled_ns
+
+        assert compiled_ns < legacy_ns
+
+    def test_content_classification_single_pass(self, benchmark):
+        """Benchmark one combined scan against a findall per pattern."""
+        detector = LanguageDetector()
+        candidates = list(detector.CONTENT_PATTERNS)
+        contents = [
+            "\n".join(
+                [
+                    "#include <vector>",
+                    "namespace app {",
+                    "template <typename T> class Box {",
+                    "public:",
+                    "  std::vector<T> items;",
+                    "};",
+                    "}",
+                ]
+                * 15
+            ),
+            "\n".join(["import os", "def main():", "    print(os.name)"] * 30),
+        ] * 20
+
+        start = time.perf_counter()
+        for content in contents:
+            _legacy_detect_from_content(detector, content, candidates)
+        legacy_ns = (time.perf_counter() - start) * 1e9 / len(contents)
+
+        def classify_all():
+            return [
+                detector._detect_language_from_content(content, candidates)
+                for content in contents
+            ]
+
+        result = benchmark(classify_all)
+        combined_ns = benchmark.stats["mean"] * 1e9 / len(contents)
+        benchmark.extra_info["legacy_ns_per_sample"] = legacy_ns
+        benchmark.extra_info["combined_ns_per_sample"] = combined_ns
+
+        assert result[:2] == ["C++", "Python"]
+        assert combined_ns < legacy_ns
+
+    def test_path_table_bytes_per_file(self, benchmark):
+        """Benchmark scan result memory: PathTable against per-file path lists."""
+        import tracemalloc
+
+        directories = [
+            os.path.join(
+                os.sep, "home", "dev", "project", "src", f"package_{i}", "core"
+            )
+            for i in range(500)
+        ]
+        rows = [
+            (directory, f"file_{j}{ext}", ext, flags)
+            for directory in directories
+            for j in range(40)
+            for ext, flags in [(".py", CODE), (".md", DOC), (".yaml", CONFIG)]
+        ]
+
+        def build_legacy():
+            # What scan_directory used to keep: joined paths in all_files, per
+            # extension and per category lists, plus the categorized set
+            files_by_extension = {}
+            all_files, test_files, config_files, doc_files = [], [], [], []
+            for directory, name, ext, flags in rows:
+                path = os.path.join(directory, name)
+                all_files.append(path)
+                files_by_extension.setdefault(ext, []).append(path)
+                if flags & TEST:
+                    test_files.append(path)
+                elif flags & CONFIG:
+                    config_files.append(path)
+                elif flags & DOC:
+                    doc_files.append(path)
+            code_files = [p for p, row in zip(all_files, rows) if row[3] & CODE]
+            categorized = set(test_files + config_files + doc_files + code_files)
+            return all_files, files_by_extension, categorized
+
+        def build_table():
+            table = PathTable()
+            for row in rows:
+                table.add(*row)
+            return table
+
+        def traced_bytes(build):
+            tracemalloc.start()
+            try:
+                result = build()  # noqa: F841 - kept alive until measured
+                return tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+
+        legacy_bytes = traced_bytes(build_legacy) / len(rows)
+        table_bytes = traced_bytes(build_table) / len(rows)
+
+        table = benchmark(build_table)
+        benchmark.extra_info["legacy_bytes_per_file"] = legacy_bytes
+        benchmark.extra_info["table_bytes_per_file"] = table_bytes
+
+        assert len(table) == len(rows)
+        assert table_bytes * 5 < legacy_bytes
+
+    def test_byte_weighted_extension_sizes(self, tmp_path, benchmark):
+        """Benchmark byte totals from walk sizes against stat-ing paths again."""
+        for i in range(20):
+            package = tmp_path / f"package_{i}"
+            package.mkdir()
+            for j in range(50):
+                (package / f"module_{j}.py").write_text("x = 1\n" * j)
+                (package / f"notes_{j}.md").write_text("# Notes\n")
+        scanner = FileScanner(max_files=100000)
+        table, _, _ = scanner.scan_table(str(tmp_path))
+        files_by_extension = table.files_by_extension()
+
+        def legacy_sizes():
+            return {
+                ext: sum(os.stat(path).st_size for path in paths)
+                for ext, paths in files_by_extension.items()
+            }
+
+        start = time.perf_counter()
+        expected = legacy_sizes()
+        legacy_ns = (time.perf_counter() - start) * 1e9 / len(table)
+
+        result = benchmark(table.extension_sizes)
+        table_ns = benchmark.stats["mean"] * 1e9 / len(table)
+        benchmark.extra_info["legacy_ns_per_file"] = legacy_ns
+        benchmark.extra_info["table_ns_per_file"] = table_ns
+
+        assert result == expected
+        assert table_ns < legacy_ns
+
     def test_package_parsing_performance(self, tmp_path, benchmark):
         """Benchmark package file parsing performance."""
         project_path = create_python_project(tmp_path, "package_test")
@@ -130,6 +456,98 @@ class TestPerformanceBenchmarks:
         # Framework detection should be fast
         assert benchmark.stats["mean"] < 0.2  # Less than 200ms
 
+    def test_framework_files_from_inventory(self, tmp_path, benchmark):
+        """Benchmark file-pattern detection on a shared inventory against rglob."""
+        for i in range(30):
+            package = tmp_path / "node_modules" / f"package_{i}" / "lib"
+            package.mkdir(parents=True)
+            for j in range(40):
+                (package / f"module_{j}.js").write_text("module.exports = 1;\n")
+        (tmp_path / "dist").mkdir()
+        for j in range(200):
+            (tmp_path / "dist" / f"chunk_{j}.js").write_text("var a = 1;\n")
+        (tmp_path / "src").mkdir()
+        for j in range(20):
+            (tmp_path / "src" / f"App{j}.jsx").write_text(
+                "import React from 'react';\n"
+            )
+
+        detector = FrameworkDetector()
+        inventory, _, _ = FileScanner().scan_table(str(tmp_path))
+
+        start = time.perf_counter()
+        for _ in range(5):
+            _legacy_framework_source_files(tmp_path)
+        legacy_seconds = (time.perf_counter() - start) / 5
+
+        result = benchmark(detector._detect_from_files, tmp_path, inventory)
+        benchmark.extra_info["legacy_listing_seconds"] = legacy_seconds
+
+        assert "React" in [framework.name for framework in result]
+        assert benchmark.stats["mean"] < legacy_seconds
+
+    def test_framework_pattern_matcher(self, benchmark):
+        """Benchmark literal-prefiltered pattern matching against re.search."""
+        lines = [f"const value{i} = compute(value{i - 1}, {i});" for i in range(300)]
+        lines.insert(150, "import { Component } from '@angular/core';")
+        content = "\n".join(lines)[: FrameworkDetector.PATTERN_SCAN_BYTES]
+        matcher = FrameworkDetector.FILE_PATTERN_MATCHER
+
+        start = time.perf_counter()
+        for _ in range(20):
+            expected = _legacy_match_file_patterns(content)
+        legacy_seconds = (time.perf_counter() - start) / 20
+
+        result = benchmark(matcher.match, content)
+        benchmark.extra_info["legacy_seconds"] = legacy_seconds
+
+        assert result == expected
+        assert benchmark.stats["mean"] < legacy_seconds
+
+    def test_dependency_index_on_lockfile(self, tmp_path, benchmark):
+        """Benchmark dependency lookups on a large lockfile against substrings."""
+        import json
+
+        from airules.analyzer.package_parser import PackageParser
+
+        packages = {"": {"name": "app"}}
+        for i in range(3000):
+            packages[f"node_modules/lib-{i}"] = {"version": "1.0.0"}
+        packages["node_modules/react"] = {"version": "18.2.0"}
+        packages["node_modules/@angular/router"] = {"version": "17.0.0"}
+        lockfile = tmp_path / "package-lock.json"
+        lockfile.write_text(json.dumps({"lockfileVersion": 3, "packages": packages}))
+        package_info = PackageParser().parse_package_file(str(lockfile))
+        detector = FrameworkDetector()
+
+        start = time.perf_counter()
+        for _ in range(3):
+            _legacy_dependency_frameworks(package_info)
+        legacy_seconds = (time.perf_counter() - start) / 3
+
+        result = benchmark(detector._detect_from_dependencies, package_info)
+        benchmark.extra_info["legacy_seconds"] = legacy_seconds
+
+        assert [framework.name for framework in result] == ["React", "Angular"]
+        assert benchmark.stats["mean"] < legacy_seconds
+
+    def test_remembered_framework_detection(self, tmp_path, benchmark):
+        """Benchmark repeated detection of an unchanged project."""
+        project_path = create_python_project(tmp_path, "memo_test")
+        detector = FrameworkDetector()
+
+        start = time.perf_counter()
+        for _ in range(3):
+            FrameworkDetector.invalidate()
+            expected = detector.detect_frameworks(str(project_path))
+        fresh_seconds = (time.perf_counter() - start) / 3
+
+        result = benchmark(detector.detect_frameworks, str(project_path))
+        benchmark.extra_info["fresh_seconds"] = fresh_seconds
+
+        assert [f.name for f in result] == [f.name for f in expected]
+        assert benchmark.stats["mean"] < fresh_seconds / 10
+
     def test_dependency_analysis_performance(self, tmp_path, benchmark):
         """Benchmark dependency analysis performance."""
         project_path = create_python_project(tmp_path, "dep_test")
@@ -0,0 +1,143 @@
+"""Tests for stratified estimates from partial scans."""
+
+import random
+
+import pytest
+
+from airules.analyzer.sampling import StratifiedSample
+
+
+def _sample():
+    sample = StratifiedSample()
+    sample.discover(0)
+    root = sample.observe(0, {".py": 2}, 4)
+    sample.observe(1, {".py": 1, ".js": 1}, parent=root)
+    sample.observe(1, {".py": 3}, parent=root)
+    return sample
+
+
+def _tree(rng, depth=0):
+    """Build a skewed tree of (file count, subdirectories) nodes."""
+    if depth == 4:
+        return rng.randint(0, 30), []
+    fanout = rng.choice([0, 0, 1, 2, 3, 8, 15]) if depth else 12
+    children = [_tree(rng, depth + 1) for _ in range(fanout)]
+    return rng.randint(0, 20) * (depth + 1), children
+
+
+def _size(node):
+    """Count the directories and files of a tree."""
+    directories, total = 1, node[0]
+    for child in node[1]:
+        child_directories, child_files = _size(child)
+        directories += child_directories
+        total += child_files
+    return directories, total
+
+
+def _list(tree, listings, seed):
+    """List directories the way FileScanner.sample picks them."""
+    rng = random.Random(seed)
+    sample = StratifiedSample()
+    sample.discover(0)
+    frontier = {0: [(tree, None)]}
+    for _ in range(listings):
+        if not frontier:
+            break
+        depth = rng.choice(sorted(frontier))
+        pending = frontier[depth]
+        (files, children), parent = pending.pop(rng.randrange(len(pending)))
+        if not pending:
+            del frontier[depth]
+        number = sample.observe(depth, {"files": files}, len(children), parent)
+        if children:
+            frontier.setdefault(depth + 1, []).extend(
+                (child, number) for child in children
+            )
+    return sample
+
+
+class TestStratifiedSample:
+    """Test cases for StratifiedSample."""
+
+    def test_completeness(self):
+        """Test counting found and sampled directories."""
+        sample = _sample()
+
+        assert sample.directories_found == 5
+        assert sample.directories_sampled == 3
+        assert sample.completeness == pytest.approx(0.6)
+
+    def test_estimate_scales_each_stratum(self):
+        """Test that sampled means are scaled to the directories found."""
+        estimates = _sample().estimate()
+
+        # Root counted exactly, depth 1 scaled from 2 of 4 directories
+        assert estimates[".py"].value == pytest.approx(2 + 4 * 2)
+        assert estimates[".js"].value == pytest.approx(4 * 0.5)
+        python = estimates[".py"]
+        assert 6 <= python.low < python.value < python.high
+
+    def test_estimate_groups_keys(self):
+        """Test totalling keys under group names and dropping others."""
+        estimates = _sample().estimate(lambda key: "Python" if key == ".py" else None)
+
+        assert set(estimates) == {"Python"}
+
+    def test_fully_listed_strata_are_exact(self):
+        """Test that listing every directory leaves no uncertainty."""
+        sample = StratifiedSample()
+        sample.discover(0)
+        sample.observe(0, {".py": 3})
+
+        assert tuple(sample.estimate()[".py"]) == (3, 3, 3)
+        assert sample.completeness == 1.0
+
+    def test_deeper_strata_scale_by_parent_fraction(self):
+        """Test that strata found below a partial level are scaled up by it."""
+        sample = StratifiedSample()
+        sample.discover(0)
+        root = sample.observe(0, {".py": 0}, 4)
+        # Two of four directories listed, each with three subdirectories
+        for _ in range(2):
+            parent = sample.observe(1, {".py": 1}, 3, root)
+            for _ in range(3):
+                sample.observe(2, {".py": 2}, parent=parent)
+
+        # 4 directories at depth 1 and an estimated 12 at depth 2
+        assert sample.estimate()[".py"].value == pytest.approx(4 * 1 + 12 * 2)
+        assert sample.completeness == pytest.approx(9 / 17)
+
+    def test_estimate_covers_true_total_of_skewed_tree(self):
+        """Test the estimate and interval against a tree of known size."""
+        tree = _tree(random.Random(1))
+        directories, files = _size(tree)
+
+        for listings in (50, 200):
+            ratios = []
+            completeness = []
+            covered = 0
+            for seed in range(100):
+                sample = _list(tree, listings, seed)
+                estimate = sample.estimate()["files"]
+                ratios.append(estimate.value / files)
+                completeness.append(sample.completeness)
+                covered += estimate.low <= files <= estimate.high
+
+            # Unbiased on average, with close to nominal 95% coverage
+            assert sum(ratios) / len(ratios) == pytest.approx(1.0, abs=0.08)
+            assert covered >= 85
+            assert sum(completeness) / len(completeness) == pytest.approx(
+                listings / directories, rel=0.2
+            )
+
+        sample = _list(tree, directories, 0)
+        assert sample.completeness == 1.0
+        assert tuple(sample.estimate()["files"]) == (files, files, files)
+
+    def test_empty_sample(self):
+        """Test estimates before anything is listed."""
+        sample = StratifiedSample()
+
+        assert sample.estimate() == {}
+        assert sample.completeness == 1.0
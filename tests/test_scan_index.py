@@ -0,0 +1,168 @@
+"""Tests for the persistent scan index."""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from airules.analyzer.file_scanner import FileScanner
+from airules.analyzer.scan_index import INDEX_DIR, INDEX_FILE, ScanIndex
+
+OLD_MTIME = time.time() - 3600
+
+
+def _age(*paths):
+    """Move directory mtimes into the past so listings are not racy."""
+    for path in paths:
+        os.utime(path, (OLD_MTIME, OLD_MTIME))
+
+
+class TestScanIndex:
+    """Test cases for ScanIndex."""
+
+    def test_store_and_lookup(self, tmp_path):
+        """Test that a stored listing is returned for the same mtime."""
+        root = str(tmp_path)
+        index = ScanIndex(root)
+        directory = os.path.join(root, "src")
+
+        index.store(directory, 1000, ["a.py"], ["pkg"])
+
+        assert index.lookup(directory, 1000) == (["a.py"], ["pkg"])
+        assert index.lookup(directory, 2000) is None
+        assert (index.hits, index.misses) == (1, 1)
+
+    def test_racy_listing_not_stored(self, tmp_path):
+        """Test that directories modified just before the scan are not cached."""
+        root = str(tmp_path)
+        index = ScanIndex(root)
+
+        index.store(root, time.time_ns(), ["a.py"], [])
+
+        assert index.lookup(root, time.time_ns()) is None
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test persisting the index to disk."""
+        root = str(tmp_path)
+        index = ScanIndex(root)
+        index.store(os.path.join(root, "src"), 1000, ["a.py"], [])
+        index.save()
+
+        assert (tmp_path / INDEX_DIR / INDEX_FILE).exists()
+        loaded = ScanIndex.load(root)
+        assert loaded.lookup(os.path.join(root, "src"), 1000) == (["a.py"], [])
+
+    def test_save_prunes_unvisited_directories(self, tmp_path):
+        """Test that directories not seen in the last scan are dropped."""
+        root = str(tmp_path)
+        index = ScanIndex(root)
+        index.store(os.path.join(root, "gone"), 1000, [], [])
+        index.save()
+
+        reloaded = ScanIndex.load(root)
+        reloaded.save()
+
+        assert ScanIndex.load(root).lookup(os.path.join(root, "gone"), 1000) is None
+
+    def test_load_ignores_invalid_index(self, tmp_path):
+        """Test that corrupt or foreign index files are ignored."""
+        index_path = tmp_path / INDEX_DIR / INDEX_FILE
+        index_path.parent.mkdir(parents=True)
+
+        index_path.write_text("not json")
+        assert ScanIndex.load(str(tmp_path)).lookup(str(tmp_path), 0) is None
+
+        index_path.write_text(
+            json.dumps({"version": 1, "root": "/elsewhere", "directories": {"": []}})
+        )
+        assert ScanIndex.load(str(tmp_path)).lookup(str(tmp_path), 0) is None
+
+
+class TestIndexedScan:
+    """Test FileScanner with the scan index enabled."""
+
+    def _create_project(self, tmp_path: Path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "main.py").write_text("print('hi')")
+        (tmp_path / "src" / "module.py").write_text("pass")
+        (tmp_path / "tests" / "test_module.py").write_text("def test(): pass")
+        _age(tmp_path, tmp_path / "src", tmp_path / "tests")
+
+    def test_warm_scan_matches_cold_scan(self, tmp_path, monkeypatch):
+        """Test that cached listings give identical results without relisting."""
+        self._create_project(tmp_path)
+        cold = FileScanner().scan_directory(str(tmp_path))
+
+        FileScanner(use_index=True).scan_directory(str(tmp_path))
+        # Creating the index changed the root directory, so age it again
+        _age(tmp_path)
+        FileScanner(use_index=True).scan_directory(str(tmp_path))
+
+        scandir_calls = []
+        original_scandir = os.scandir
+
+        def counting_scandir(path):
+            scandir_calls.append(path)
+            return original_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", counting_scandir)
+        warm = FileScanner(use_index=True).scan_directory(str(tmp_path))
+
+        assert warm == cold
+        assert scandir_calls == []
+
+    def test_warm_scan_keeps_file_sizes(self, tmp_path):
+        """Test that cached listings carry the sizes of their files."""
+        self._create_project(tmp_path)
+        cold = {r.path: r.size for r in FileScanner().iter_files(str(tmp_path))}
+
+        FileScanner(use_index=True).scan_directory(str(tmp_path))
+        _age(tmp_path)
+        scanner = FileScanner(use_index=True)
+        warm = {r.path: r.size for r in scanner.iter_files(str(tmp_path))}
+
+        assert warm == cold
+        assert cold[str(tmp_path / "src" / "module.py")] == len("pass")
+
+    def test_changed_directory_is_relisted(self, tmp_path):
+        """Test that adding a file invalidates the directory's entry."""
+        self._create_project(tmp_path)
+        FileScanner(use_index=True).scan_directory(str(tmp_path))
+
+        (tmp_path / "src" / "new_module.py").write_text("pass")
+        files_by_ext, _, _ = FileScanner(use_index=True).scan_directory(str(tmp_path))
+
+        names = {Path(f).name for f in files_by_ext[".py"]}
+        assert "new_module.py" in names
+
+    def test_stopped_stream_keeps_index_entries(self, tmp_path):
+        """Test that abandoning iter_files early does not prune the index."""
+        self._create_project(tmp_path)
+        FileScanner(use_index=True).scan_directory(str(tmp_path))
+        _age(tmp_path)
+
+        records = FileScanner(use_index=True).iter_files(str(tmp_path))
+        next(records)
+        records.close()
+
+        index = ScanIndex.load(str(tmp_path))
+        mtime_ns = os.stat(tmp_path / "tests").st_mtime_ns
+        assert index.lookup(str(tmp_path / "tests"), mtime_ns) is not None
+
+    def test_unsaved_index_leaves_project_untouched(self, tmp_path):
+        """Test that save_index=False reads the index without writing it."""
+        self._create_project(tmp_path)
+        index_path = tmp_path / INDEX_DIR / INDEX_FILE
+
+        scanner = FileScanner(use_index=True, save_index=False)
+        scanner.scan_directory(str(tmp_path))
+        assert not index_path.exists()
+
+        FileScanner(use_index=True).scan_directory(str(tmp_path))
+        saved = index_path.read_bytes()
+        (tmp_path / "src" / "new_module.py").write_text("pass")
+        files_by_ext, _, _ = scanner.scan_directory(str(tmp_path))
+
+        assert str(tmp_path / "src" / "new_module.py") in files_by_ext[".py"]
+        assert index_path.read_bytes() == saved
@@ -0,0 +1,70 @@
+"""Tests for shebang and modeline detection of extensionless scripts."""
+
+import pytest
+
+from airules.analyzer.shebang import (
+    HEAD_BYTES,
+    interpreter_extension,
+    script_extension,
+)
+
+
+class TestScriptExtension:
+    """Test cases for script_extension."""
+
+    @pytest.mark.parametrize(
+        "head, expected",
+        [
+            (b"#!/usr/bin/python3\nimport os\n", ".py"),
+            (b"#!/usr/local/bin/python3.11 -u\n", ".py"),
+            (b"#! /bin/bash\nset -e\n", ".bash"),
+            (b"#!/bin/sh\n", ".sh"),
+            (b"#!/usr/bin/env node\n", ".js"),
+            (b"#!/usr/bin/env -S deno run --allow-net\n", ".ts"),
+            (b"#!/usr/bin/env -S NODE_OPTIONS=--max-old-space-size=4096 node\n", ".js"),
+            (b"#!/usr/bin/env -Sruby -w\n", ".rb"),
+            (b"#!/usr/bin/env -i -u HOME PATH=/bin perl\n", ".pl"),
+            (b"#!/usr/bin/env\n", None),
+            (b"#!/opt/custom/interpreter\n", None),
+        ],
+    )
+    def test_shebangs(self, head, expected):
+        """Test interpreters named by shebang lines."""
+        assert script_extension(head) == expected
+
+    @pytest.mark.parametrize(
+        "head, expected",
+        [
+            (b"# -*- mode: python; coding: utf-8 -*-\n", ".py"),
+            (b"# -*- ruby -*-\n", ".rb"),
+            (b"# vim: set ft=sh :\necho hi\n", ".sh"),
+            (b"# vi: filetype=perl\n", ".pl"),
+            (b"# -*- coding: utf-8 -*-\n", None),
+            (b"echo hello\n", None),
+        ],
+    )
+    def test_modelines(self, head, expected):
+        """Test vim and emacs modelines."""
+        assert script_extension(head) == expected
+
+    def test_shebang_wins_over_modeline(self):
+        """Test that the shebang decides when both are present."""
+        assert script_extension(b"#!/bin/bash\n# vim: ft=python\n") == ".bash"
+
+    def test_only_head_is_inspected(self):
+        """Test that modelines past HEAD_BYTES are ignored."""
+        head = b"\n" * HEAD_BYTES + b"# vim: ft=python\n"
+
+        assert script_extension(head) is None
+
+
+class TestInterpreterExtension:
+    """Test cases for interpreter_extension."""
+
+    def test_strips_versions_and_paths(self):
+        """Test that version suffixes and directories are ignored."""
+        assert interpreter_extension("/usr/bin/python2.7") == ".py"
+        assert interpreter_extension("pypy3") == ".py"
+        assert interpreter_extension("C:/Python/python.exe") == ".py"
+        assert interpreter_extension("Rscript") == ".r"
+        assert interpreter_extension("cobol") is None
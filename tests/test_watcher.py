@@ -0,0 +1,141 @@
+"""Tests for directory change watching."""
+
+import os
+import sys
+import time
+
+import pytest
+
+from airules.watcher import (
+    InotifyWatcher,
+    PollingWatcher,
+    create_watcher,
+    wait_for_changes,
+)
+
+
+class _ScriptedWatcher:
+    """Watcher returning a fixed sequence of change sets."""
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+        self.timeouts = []
+
+    def watch(self, directories):
+        pass
+
+    def read_changes(self, timeout):
+        self.timeouts.append(timeout)
+        return self.batches.pop(0) if self.batches else set()
+
+    def close(self):
+        pass
+
+
+def _touch_directory(path, offset):
+    """Move a directory's mtime so coarse timestamps still differ."""
+    mtime = os.stat(path).st_mtime_ns + offset
+    os.utime(path, ns=(mtime, mtime))
+
+
+class TestPollingWatcher:
+    """Test cases for PollingWatcher."""
+
+    def test_reports_changed_directories(self, tmp_path):
+        """Test that entries added to a watched directory are reported."""
+        (tmp_path / "src").mkdir()
+        watcher = PollingWatcher(interval=0.01)
+        watcher.watch([str(tmp_path), str(tmp_path / "src")])
+
+        (tmp_path / "src" / "app.py").write_text("")
+        _touch_directory(tmp_path / "src", 10**9)
+
+        assert watcher.read_changes(1.0) == {str(tmp_path / "src")}
+        assert watcher.read_changes(0.05) == set()
+
+    def test_reports_deleted_directories(self, tmp_path):
+        """Test that a watched directory going away is reported."""
+        (tmp_path / "old").mkdir()
+        watcher = PollingWatcher(interval=0.01)
+        watcher.watch([str(tmp_path / "old")])
+
+        (tmp_path / "old").rmdir()
+
+        assert watcher.read_changes(1.0) == {str(tmp_path / "old")}
+
+    def test_timeout_without_changes(self, tmp_path):
+        """Test that read_changes returns after the timeout."""
+        watcher = PollingWatcher(interval=0.01)
+        watcher.watch([str(tmp_path)])
+
+        start = time.monotonic()
+        assert watcher.read_changes(0.05) == set()
+        assert time.monotonic() - start < 1.0
+
+    def test_invalid_interval(self):
+        """Test that a non-positive interval is rejected."""
+        with pytest.raises(ValueError):
+            PollingWatcher(interval=0)
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux only"
+)
+class TestInotifyWatcher:
+    """Test cases for InotifyWatcher."""
+
+    def test_reports_changed_directories(self, tmp_path):
+        """Test that events are reported per watched directory."""
+        (tmp_path / "src").mkdir()
+        watcher = InotifyWatcher()
+        try:
+            watcher.watch([str(tmp_path), str(tmp_path / "src")])
+
+            (tmp_path / "src" / "app.py").write_text("")
+
+            assert wait_for_changes(watcher, 0.05, timeout=1.0) == {
+                str(tmp_path / "src")
+            }
+            assert watcher.read_changes(0.01) == set()
+        finally:
+            watcher.close()
+
+    def test_unwatched_directories_are_silent(self, tmp_path):
+        """Test that watch() drops directories no longer listed."""
+        (tmp_path / "src").mkdir()
+        watcher = InotifyWatcher()
+        try:
+            watcher.watch([str(tmp_path), str(tmp_path / "src")])
+            watcher.watch([str(tmp_path)])
+
+            (tmp_path / "src" / "app.py").write_text("")
+
+            assert watcher.read_changes(0.05) == set()
+        finally:
+            watcher.close()
+
+    def test_create_watcher_prefers_inotify(self):
+        """Test that create_watcher uses inotify where available."""
+        watcher = create_watcher()
+        try:
+            assert isinstance(watcher, InotifyWatcher)
+        finally:
+            watcher.close()
+
+
+class TestWaitForChanges:
+    """Test cases for wait_for_changes."""
+
+    def test_collects_burst(self):
+        """Test that changes arriving within the debounce interval are merged."""
+        watcher = _ScriptedWatcher({"a"}, {"b"}, {"a", "c"})
+
+        assert wait_for_changes(watcher, 0.5) == {"a", "b", "c"}
+        assert watcher.timeouts == [None, 0.5, 0.5, 0.5]
+
+    def test_timeout_without_changes(self):
+        """Test that nothing is returned when the first wait times out."""
+        watcher = _ScriptedWatcher()
+
+        assert wait_for_changes(watcher, 0.5, timeout=1.0) == set()
+        assert watcher.timeouts == [1.0]